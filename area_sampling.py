@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+区域与点击位置采样
+点击计划按块批量生成事件时使用：按权重选择区域（别名表，每次 O(1)），
+以及区域内点击位置的分布（均匀、截断高斯、热力图），全部按数组批量采样
+"""
+
+import numpy as np
+
+# 热力图缩小到的最大边长（像素），更大的图像对分布几乎没有影响
+HEATMAP_MAX_SIZE = 256
+
+
+class AliasTable:
+    """别名表（Vose 方法）：按权重采样下标，构建 O(n)，每次采样 O(1)
+
+    每个下标 i 对应一个桶：以 prob[i] 的概率取 i，否则取 alias[i]。
+    """
+
+    def __init__(self, weights):
+        weights = np.asarray(weights, dtype=np.float64)
+        count = len(weights)
+        total = weights.sum()
+        if count == 0 or total <= 0 or (weights < 0).any():
+            raise ValueError("权重必须非负且总和大于0")
+
+        scaled = weights * (count / total)
+        prob = np.ones(count)
+        alias = np.arange(count)
+        small = [i for i in range(count) if scaled[i] < 1.0]
+        large = [i for i in range(count) if scaled[i] >= 1.0]
+        scaled = scaled.tolist()
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            prob[less] = scaled[less]
+            alias[less] = more
+            # 大桶补给小桶后剩余的部分
+            scaled[more] = scaled[more] + scaled[less] - 1.0
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+        # 剩下的桶（含浮点误差造成的）概率为1
+        self.prob = prob
+        self.alias = alias
+
+    def sample(self, rng, size):
+        """采样 size 个下标"""
+        index = rng.integers(0, len(self.prob), size=size)
+        keep = rng.random(size) < self.prob[index]
+        return np.where(keep, index, self.alias[index])
+
+
+def truncated_normal(rng, center, sigma, low, high):
+    """截断正态分布：在 [low, high] 之外的样本重新采样（各参数为同样长度的数组）"""
+    values = rng.normal(center, sigma)
+    outside = (values < low) | (values > high)
+    while outside.any():
+        values[outside] = rng.normal(center[outside], sigma[outside])
+        outside = (values < low) | (values > high)
+    return values
+
+
+def load_heatmap(path):
+    """读取热力图（亮度越高点击越多），返回归一化的累积分布和网格形状 (cdf, 高, 宽)"""
+    from PIL import Image
+
+    with Image.open(path) as image:
+        image = image.convert("L")
+        image.thumbnail((HEATMAP_MAX_SIZE, HEATMAP_MAX_SIZE))
+        weights = np.asarray(image, dtype=np.float64)
+    total = weights.sum()
+    if total <= 0:
+        raise ValueError("热力图不能全黑")
+    cdf = np.cumsum(weights.ravel()) / total
+    return cdf, weights.shape[0], weights.shape[1]
+
+
+def sample_points(rng, x1, y1, x2, y2, distribution="uniform", sigma=0.33, heatmap=None):
+    """在各区域 (x1, y1, x2, y2)（数组，含边界）内各采样一个整数点，返回 (x, y)
+
+    - uniform: 均匀分布
+    - gaussian: 以区域中心为均值的截断正态分布，标准差为半宽/半高乘以 sigma
+    - heatmap: 按热力图亮度分布（热力图拉伸到区域大小），heatmap 为 load_heatmap 的结果
+    """
+    if distribution == "gaussian":
+        points = []
+        for low, high in ((x1, x2), (y1, y2)):
+            # 在 [low - 0.5, high + 0.5] 上采样再取整，两端像素与中间像素的宽度相同
+            center = (low + high) / 2
+            spread = (high - low + 1) / 2 * sigma
+            value = truncated_normal(rng, center, spread, low - 0.5, high + 0.5)
+            points.append(np.clip(np.rint(value).astype(np.int64), low, high))
+        return points[0], points[1]
+
+    if distribution == "heatmap":
+        cdf, rows, columns = heatmap
+        cell = np.searchsorted(cdf, rng.random(len(x1)), side="right")
+        cell = np.minimum(cell, len(cdf) - 1)
+        row, column = np.divmod(cell, columns)
+        # 网格单元内均匀分布，再按比例映射到区域
+        fx = (column + rng.random(len(x1))) / columns
+        fy = (row + rng.random(len(x1))) / rows
+        x = x1 + np.floor(fx * (x2 - x1 + 1)).astype(np.int64)
+        y = y1 + np.floor(fy * (y2 - y1 + 1)).astype(np.int64)
+        return np.minimum(x, x2), np.minimum(y, y2)
+
+    return rng.integers(x1, x2 + 1), rng.integers(y1, y2 + 1)
+
+
+def bounded_offsets(rng, base, low, high, limit):
+    """在 [-limit, limit] 与 [low - base, high - base] 的交集内均匀采样偏移
+
+    直接在区域内的范围采样，而不是采样后截断到边界（截断会让点击堆积在区域边缘）。
+    """
+    lower = np.maximum(-limit, low - base)
+    upper = np.minimum(limit, high - base)
+    return rng.integers(lower, upper + 1)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+点击区域集合
+区域统一保存为 numpy int32 数组（形状 (N, 4)，每行 x1, y1, x2, y2，含边界），
+提供网格生成、CSV/JSON 批量导入导出和整体校验，上万个区域也不需要逐个创建 Python 对象
+"""
+
+import json
+import os
+
+import numpy as np
+
+
+def as_area_array(areas):
+    """把区域列表/数组转换为只读的 int32 (N, 4) 数组，并保证 x1 <= x2、y1 <= y2
+
+    格式不对时抛出 ValueError。
+    """
+    try:
+        array = np.asarray(areas, dtype=np.int64)
+    except (TypeError, ValueError):
+        raise ValueError("区域格式错误（每个区域应为 x1,y1,x2,y2 四个整数）")
+    if array.size == 0:
+        array = array.reshape(0, 4)
+    if array.ndim != 2 or array.shape[1] != 4:
+        raise ValueError("区域格式错误（每个区域应为 x1,y1,x2,y2 四个整数）")
+    info = np.iinfo(np.int32)
+    if array.size and (array.min() < info.min or array.max() > info.max):
+        raise ValueError("区域坐标超出范围")
+
+    # 确保坐标正确（左上角和右下角）
+    result = np.empty(array.shape, dtype=np.int32)
+    result[:, 0] = np.minimum(array[:, 0], array[:, 2])
+    result[:, 1] = np.minimum(array[:, 1], array[:, 3])
+    result[:, 2] = np.maximum(array[:, 0], array[:, 2])
+    result[:, 3] = np.maximum(array[:, 1], array[:, 3])
+    result.flags.writeable = False
+    return result
+
+
+def grid_areas(bounds, rows, columns, padding=0):
+    """把外框 bounds (x1, y1, x2, y2) 均分为 rows 行 columns 列的网格区域
+
+    每个单元格四周各留出 padding 像素（避免点到格子边线），按行优先顺序返回。
+    外框不能整除时，多出的像素分给前面的行/列。
+    """
+    x1, y1, x2, y2 = (int(v) for v in as_area_array([bounds])[0])
+    rows = int(rows)
+    columns = int(columns)
+    padding = int(padding)
+    if rows < 1 or columns < 1:
+        raise ValueError("网格的行数和列数必须大于0")
+    if padding < 0:
+        raise ValueError("网格间距不能为负数")
+    width = x2 - x1 + 1
+    height = y2 - y1 + 1
+    if width < columns or height < rows:
+        raise ValueError("网格单元格小于1像素")
+
+    # 各列/各行的起点（整数均分）
+    left = x1 + np.arange(columns + 1) * width // columns
+    top = y1 + np.arange(rows + 1) * height // rows
+    cell_left = left[:-1] + padding
+    cell_right = left[1:] - 1 - padding
+    cell_top = top[:-1] + padding
+    cell_bottom = top[1:] - 1 - padding
+    if (cell_right < cell_left).any() or (cell_bottom < cell_top).any():
+        raise ValueError("网格间距太大，单元格没有可点击的范围")
+
+    areas = np.empty((rows, columns, 4), dtype=np.int32)
+    areas[:, :, 0] = cell_left[None, :]
+    areas[:, :, 1] = cell_top[:, None]
+    areas[:, :, 2] = cell_right[None, :]
+    areas[:, :, 3] = cell_bottom[:, None]
+    areas = areas.reshape(-1, 4)
+    areas.flags.writeable = False
+    return areas
+
+
+def load_areas(path):
+    """从 CSV（每行 x1,y1,x2,y2，可以有标题行）或 JSON（[[x1,y1,x2,y2], ...]）读取区域"""
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix == ".json":
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        # 也接受 {"areas": [...]}
+        if isinstance(data, dict):
+            data = data.get("areas", [])
+        return as_area_array(data)
+
+    with open(path, 'r', encoding='utf-8') as f:
+        first = f.readline()
+        # 第一行不是数字时视为标题行
+        skip = 0 if first.split(",")[0].strip().lstrip("-").isdigit() else 1
+    try:
+        data = np.loadtxt(path, delimiter=",", dtype=np.int64, skiprows=skip, ndmin=2, encoding="utf-8")
+    except ValueError as e:
+        raise ValueError(f"区域文件格式错误: {e}")
+    return as_area_array(data)
+
+
+def save_areas(path, areas):
+    """把区域保存为 CSV 或 JSON（按扩展名，其他扩展名按 CSV 保存）"""
+    areas = as_area_array(areas)
+    rows = areas.tolist()
+    if os.path.splitext(path)[1].lower() == ".json":
+        # json.dumps 整体编码比 json.dump 逐块写入快得多
+        text = json.dumps({"areas": rows})
+    else:
+        text = "x1,y1,x2,y2\n" + "".join(f"{x1},{y1},{x2},{y2}\n" for x1, y1, x2, y2 in rows)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
@@ -5,19 +5,54 @@
 支持Windows和Mac系统的自动鼠标点击工具
 """
 
-import tkinter as tk
-from tkinter import ttk, messagebox
-import pyautogui
-import threading
+import sys
 import time
-import random
+
+# 模块开始加载的时间（用于启动耗时分析）
+STARTUP_BEGIN = time.perf_counter()
+
+# 命令行模式（如 "auto_clicker.py run --config ..."）不需要图形界面，
+# 在导入 tkinter/PIL 之前直接转交给命令行入口
+if __name__ == "__main__" and len(sys.argv) > 1 and not sys.argv[1].startswith("-"):
+    from clicker_cli import main as cli_main
+    sys.exit(cli_main(sys.argv[1:]))
+
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog, simpledialog
 import platform
-import sys
-from PIL import Image, ImageTk, ImageDraw
-import numpy as np
 import json
 import os
+import queue
 from datetime import datetime
+from click_engine import RunPlan, ClickEngine, TRAVERSALS, DISTRIBUTIONS
+from input_backends import BACKENDS, DEFAULT_BACKEND, create_backend
+from job_scheduler import JobScheduler
+from config_store import ConfigStore, ConfigWorker, CONFIG_DIR, check_name
+from startup_profile import StartupMarks, is_profiling, profile_startup
+
+# 状态显示的刷新间隔（毫秒），与点击频率无关
+STATUS_REFRESH_MS = 50
+
+# 配置下拉列表最多显示的配置数（输入名称开头可以筛选）
+CONFIG_LIST_LIMIT = 200
+
+# 检查后台配置读写结果的间隔（毫秒，只在有未完成的请求时运行）
+CONFIG_POLL_INTERVAL_MS = 100
+
+# 退出时等待未完成的配置写入的最长时间（秒）
+CONFIG_FLUSH_TIMEOUT = 5.0
+
+# 重新开始点击前等待上一次点击线程结束的最长时间（秒）
+ENGINE_JOIN_TIMEOUT = 2.0
+
+# 界面线程处理全局快捷键动作的间隔（毫秒；紧急停止由监听线程直接通知点击引擎，不受它影响）
+HOTKEY_POLL_INTERVAL_MS = 50
+
+# 区域选择时选择框的最短重绘间隔（毫秒，约60帧/秒）
+SELECTION_FRAME_MS = 16
+
+# 区域选择遮罩的变暗查找表：等同于在截图上叠加 alpha=100 的黑色半透明层
+OVERLAY_DIM_TABLE = [value * (255 - 100) // 255 for value in range(256)]
 
 class AreaSelector:
     """屏幕区域选择器"""
@@ -32,11 +67,22 @@ class AreaSelector:
         self.end_x = None
         self.end_y = None
         self.selecting = False
+        self.motion_pos = None  # 最新的鼠标拖动位置（等待下一帧绘制）
+        self.render_after_id = None  # 待执行的绘制定时器
+        self.bg_image = None  # 变暗后的屏幕截图
+        self.overlay_timings = {}  # 遮罩各步骤耗时（毫秒）
         
     def select_area(self):
         """开始选择屏幕区域"""
+        import pyautogui
+        from PIL import Image, ImageTk
+        
+        timings = {}
+        begin = time.perf_counter()
+        
         # 先截取当前屏幕
         screenshot = pyautogui.screenshot()
+        timings["截图"] = time.perf_counter() - begin
         
         # 创建全屏窗口
         self.root = tk.Toplevel()
@@ -47,19 +93,54 @@ class AreaSelector:
         screen_width = self.root.winfo_screenwidth()
         screen_height = self.root.winfo_screenheight()
         
-        # 调整截图大小以匹配屏幕
-        screenshot = screenshot.resize((screen_width, screen_height), Image.Resampling.LANCZOS)
+        # 调整截图大小以匹配屏幕（尺寸一致时跳过；HiDPI 整数倍时用快速的整数缩小）
+        step_begin = time.perf_counter()
+        if screenshot.size != (screen_width, screen_height):
+            factor_x, rest_x = divmod(screenshot.width, screen_width)
+            factor_y, rest_y = divmod(screenshot.height, screen_height)
+            if rest_x == 0 and rest_y == 0 and factor_x >= 1 and factor_y >= 1:
+                screenshot = screenshot.reduce((factor_x, factor_y))
+            else:
+                screenshot = screenshot.resize(
+                    (screen_width, screen_height), Image.Resampling.BILINEAR, reducing_gap=2.0
+                )
+        timings["缩放"] = time.perf_counter() - step_begin
         
-        # 创建半透明遮罩
-        overlay = Image.new('RGBA', (screen_width, screen_height), (0, 0, 0, 100))
+        # 变暗：相当于叠加 alpha=100 的黑色遮罩，用查找表一次处理所有像素，不再额外创建遮罩图像
+        step_begin = time.perf_counter()
+        if screenshot.mode != 'RGB':
+            screenshot = screenshot.convert('RGB')
+        screenshot = screenshot.point(OVERLAY_DIM_TABLE * 3)
+        timings["变暗"] = time.perf_counter() - step_begin
         
-        # 合成图像：截图 + 半透明遮罩
-        combined = Image.alpha_composite(screenshot.convert('RGBA'), overlay)
+        # 转换为tkinter可用的图像，之后不再需要PIL图像
+        step_begin = time.perf_counter()
+        self.bg_image = ImageTk.PhotoImage(screenshot)
+        del screenshot
+        timings["转换"] = time.perf_counter() - step_begin
         
-        # 转换为tkinter可用的图像
-        self.bg_image = ImageTk.PhotoImage(combined)
+        # 创建画布和所有覆盖层元素
+        self.create_canvas(screen_width, screen_height, self.bg_image)
         
-        # 创建画布
+        # 绑定键盘事件
+        self.root.bind("<Escape>", self.cancel_selection)
+        self.root.focus_set()
+        
+        self.selecting = True
+        
+        # 遮罩显示后报告耗时
+        self.root.update_idletasks()
+        timings["显示总耗时"] = time.perf_counter() - begin
+        self.overlay_timings = {name: round(value * 1000, 1) for name, value in timings.items()}
+        print("区域选择遮罩耗时: " + ", ".join(
+            f"{name} {value}ms" for name, value in self.overlay_timings.items()
+        ))
+        
+    def create_canvas(self, screen_width, screen_height, bg_image=None):
+        """创建画布和覆盖层元素
+        
+        提示文字和选择框只在这里创建一次，之后拖动时只更新坐标和文字，不再删除重建。
+        """
         self.canvas = tk.Canvas(
             self.root, 
             width=screen_width, 
@@ -69,7 +150,8 @@ class AreaSelector:
         self.canvas.pack()
         
         # 设置背景图像
-        self.canvas.create_image(0, 0, anchor="nw", image=self.bg_image)
+        if bg_image is not None:
+            self.canvas.create_image(0, 0, anchor="nw", image=bg_image)
         
         # 添加提示文字（带背景框）
         text_x = screen_width // 2
@@ -84,29 +166,38 @@ class AreaSelector:
         )
         
         # 添加提示文字
-        if self.area_count > 1:
-            tip_text = f"选择第 {self.current_area + 1}/{self.area_count} 个区域，拖拽鼠标选择，按ESC键取消"
-        else:
-            tip_text = "拖拽鼠标选择点击区域，按ESC键取消"
-            
-        self.canvas.create_text(
+        self.tip_text_item = self.canvas.create_text(
             text_x, text_y,
-            text=tip_text,
+            text=self.get_tip_text(),
             fill="white",
             font=("Arial", 16, "bold"),
             tags="tip_text"
         )
         
+        # 选择框边框（双层边框，更醒目）、尺寸信息背景和文字，初始隐藏
+        self.selection_outer = self.canvas.create_rectangle(
+            0, 0, 0, 0, outline="red", width=4, state=tk.HIDDEN, tags="selection"
+        )
+        self.selection_inner = self.canvas.create_rectangle(
+            0, 0, 0, 0, outline="white", width=2, state=tk.HIDDEN, tags="selection"
+        )
+        self.info_box = self.canvas.create_rectangle(
+            0, 0, 0, 0, fill="black", outline="yellow", width=1, state=tk.HIDDEN, tags="selection"
+        )
+        self.info_text = self.canvas.create_text(
+            0, 0, text="", fill="yellow", font=("Arial", 10, "bold"), state=tk.HIDDEN, tags="selection"
+        )
+        
         # 绑定鼠标事件
         self.canvas.bind("<Button-1>", self.start_selection)
         self.canvas.bind("<B1-Motion>", self.update_selection)
         self.canvas.bind("<ButtonRelease-1>", self.end_selection)
         
-        # 绑定键盘事件
-        self.root.bind("<Escape>", self.cancel_selection)
-        self.root.focus_set()
-        
-        self.selecting = True
+    def get_tip_text(self):
+        """当前的提示文字"""
+        if self.area_count > 1:
+            return f"选择第 {self.current_area + 1}/{self.area_count} 个区域，拖拽鼠标选择，按ESC键取消"
+        return "拖拽鼠标选择点击区域，按ESC键取消"
         
     def start_selection(self, event):
         """开始选择"""
@@ -114,48 +205,52 @@ class AreaSelector:
         self.start_y = event.y
         
     def update_selection(self, event):
-        """更新选择区域"""
+        """更新选择区域
+        
+        鼠标移动事件可能远多于屏幕刷新次数，这里只记录最新位置，
+        每帧最多绘制一次。
+        """
         if self.start_x is not None and self.start_y is not None:
-            # 清除之前的选择框
-            self.canvas.delete("selection")
-            
-            # 绘制选择框边框（双层边框，更醒目）
-            self.canvas.create_rectangle(
-                self.start_x, self.start_y, event.x, event.y,
-                outline="red", width=4, tags="selection"
-            )
-            self.canvas.create_rectangle(
-                self.start_x, self.start_y, event.x, event.y,
-                outline="white", width=2, tags="selection"
-            )
-            
-            # 显示选择区域的尺寸信息
-            width = abs(event.x - self.start_x)
-            height = abs(event.y - self.start_y)
-            info_text = f"区域大小: {width} × {height} 像素"
-            
-            # 计算信息文字位置
-            info_x = (self.start_x + event.x) // 2
-            info_y = min(self.start_y, event.y) - 10
-            if info_y < 20:
-                info_y = max(self.start_y, event.y) + 20
+            self.motion_pos = (event.x, event.y)
+            if self.render_after_id is None:
+                self.render_after_id = self.canvas.after(SELECTION_FRAME_MS, self.render_selection)
                 
-            # 创建信息文字背景
-            self.canvas.create_rectangle(
-                info_x - 80, info_y - 10,
-                info_x + 80, info_y + 10,
-                fill="black", outline="yellow", width=1,
-                tags="selection"
-            )
+    def render_selection(self):
+        """按最新的鼠标位置更新选择框"""
+        self.render_after_id = None
+        if self.motion_pos is None or self.start_x is None or self.start_y is None:
+            return
+        x, y = self.motion_pos
+        self.motion_pos = None
+        canvas = self.canvas
+        
+        # 更新选择框边框
+        canvas.coords(self.selection_outer, self.start_x, self.start_y, x, y)
+        canvas.coords(self.selection_inner, self.start_x, self.start_y, x, y)
+        
+        # 显示选择区域的尺寸信息
+        width = abs(x - self.start_x)
+        height = abs(y - self.start_y)
+        info_text = f"区域大小: {width} × {height} 像素"
+        
+        # 计算信息文字位置
+        info_x = (self.start_x + x) // 2
+        info_y = min(self.start_y, y) - 10
+        if info_y < 20:
+            info_y = max(self.start_y, y) + 20
             
-            # 显示信息文字
-            self.canvas.create_text(
-                info_x, info_y,
-                text=info_text,
-                fill="yellow",
-                font=("Arial", 10, "bold"),
-                tags="selection"
-            )
+        canvas.coords(self.info_box, info_x - 80, info_y - 10, info_x + 80, info_y + 10)
+        canvas.coords(self.info_text, info_x, info_y)
+        canvas.itemconfig(self.info_text, text=info_text)
+        canvas.itemconfig("selection", state=tk.NORMAL)
+        
+    def hide_selection(self):
+        """隐藏选择框，取消待绘制的帧"""
+        if self.render_after_id is not None:
+            self.canvas.after_cancel(self.render_after_id)
+            self.render_after_id = None
+        self.motion_pos = None
+        self.canvas.itemconfig("selection", state=tk.HIDDEN)
             
     def end_selection(self, event):
         """结束选择"""
@@ -183,8 +278,8 @@ class AreaSelector:
                     self.end_x = None
                     self.end_y = None
                     
-                    # 清除当前选择框
-                    self.canvas.delete("selection")
+                    # 隐藏当前选择框
+                    self.hide_selection()
                     
                     # 更新提示文字
                     self.update_tip_text()
@@ -198,36 +293,7 @@ class AreaSelector:
                 
     def update_tip_text(self):
         """更新提示文字"""
-        # 删除旧的提示文字
-        self.canvas.delete("tip_text")
-        
-        # 获取屏幕尺寸
-        screen_width = self.root.winfo_screenwidth()
-        text_x = screen_width // 2
-        text_y = 50
-        
-        # 创建新的提示文字
-        if self.area_count > 1:
-            tip_text = f"选择第 {self.current_area + 1}/{self.area_count} 个区域，拖拽鼠标选择，按ESC键取消"
-        else:
-            tip_text = "拖拽鼠标选择点击区域，按ESC键取消"
-            
-        # 创建文字背景
-        self.canvas.create_rectangle(
-            text_x - 200, text_y - 20,
-            text_x + 200, text_y + 20,
-            fill="black", outline="red", width=2,
-            stipple="gray50", tags="tip_text"
-        )
-        
-        # 添加提示文字
-        self.canvas.create_text(
-            text_x, text_y,
-            text=tip_text,
-            fill="white",
-            font=("Arial", 16, "bold"),
-            tags="tip_text"
-        )
+        self.canvas.itemconfig(self.tip_text_item, text=self.get_tip_text())
         
     def cancel_selection(self, event):
         """取消选择"""
@@ -235,6 +301,13 @@ class AreaSelector:
         
     def close_selector(self):
         """关闭选择器"""
+        if self.render_after_id is not None:
+            self.canvas.after_cancel(self.render_after_id)
+            self.render_after_id = None
+        # 释放全屏截图占用的内存
+        if hasattr(self, 'canvas'):
+            self.canvas.delete("all")
+        self.bg_image = None
         if hasattr(self, 'root'):
             self.root.destroy()
         self.selecting = False
@@ -243,7 +316,10 @@ class AreaSelector:
 class AutoClicker:
     """自动点击器主类"""
     
-    def __init__(self):
+    def __init__(self, startup_marks=None):
+        # 启动耗时分析（--profile-startup）时记录各阶段时间点
+        self.startup_marks = startup_marks
+        
         self.root = tk.Tk()
         self.root.title("自动点击器 - 支持Windows/Mac")
         self.root.geometry("700x700")
@@ -253,34 +329,41 @@ class AutoClicker:
         # 设置程序图标和样式
         self.setup_style()
         
+        self.mark_startup("tk_root")
+        
         # 初始化变量
-        self.click_areas = []  # 多个区域列表 [(x1, y1, x2, y2), ...]
-        self.current_area_index = 0  # 当前点击区域索引
+        self.click_areas = []  # 点击区域：选择得到的列表 [(x1, y1, x2, y2), ...]，或网格/导入得到的 (N, 4) 数组
+        self.area_templates = []  # 每个区域的模板图像路径（None 表示固定区域）
         self.is_running = False
-        self.click_thread = None
-        self.start_time = None  # 开始时间
-        self.total_click_count = 0  # 总点击次数
-        
-        # 创建GUI界面
+        self.engine = None  # 当前运行的点击引擎
+        self.status_after_id = None  # 状态刷新定时器
+        self.status_texts = {}  # 各状态标签当前显示的文字
+        self.job_scheduler = JobScheduler()  # 并行任务调度器
+        self.jobs_after_id = None  # 任务列表刷新定时器
+        self.run_plan = None  # 本次运行的参数快照（点击线程只读取它）
+        self.hotkey_listener = None  # 全局快捷键监听器（不支持时为 None）
+        self.hotkey_actions = queue.Queue()  # 监听线程交给界面线程处理的快捷键动作
+        
+        # 创建GUI界面（首屏以外的部分在首帧显示后再创建）
         self.create_widgets()
-        
-        # 配置文件目录（在绑定快捷键之前初始化）
-        self.config_dir = "configs"
-        if not os.path.exists(self.config_dir):
-            os.makedirs(self.config_dir)
-        
-        # 最后使用的配置文件
-        self.last_config_file = os.path.join(self.config_dir, "last_used.txt")
-        
-        # 绑定快捷键
-        self.bind_hotkeys()
-        
-        # 禁用pyautogui的安全机制（小心使用）
-        pyautogui.FAILSAFE = False
-        
-        # 延迟自动加载最后使用的配置
-        self.root.after(200, self.load_last_used_config_on_startup)
-        
+        self.mark_startup("widgets")
+        
+        # 配置文件目录（配置存储维护名称索引和解析缓存）
+        self.config_dir = CONFIG_DIR
+        self.config_store = ConfigStore(self.config_dir)
+        # 配置写入和启动时的读取在后台线程中进行，完成后由定时器通知界面
+        self.config_worker = ConfigWorker(self.config_store)
+        self.config_after_id = None  # 后台读写结果检查定时器
+        self.last_used_config = None  # 最后使用的配置名称（内存中的副本）
+        
+        # 运行统计导出目录
+        self.stats_dir = "stats"
+        
+    def mark_startup(self, name):
+        """记录启动时间点（仅在启动耗时分析时）"""
+        if self.startup_marks is not None:
+            self.startup_marks.mark(name)
+            
     def setup_style(self):
         """设置界面样式"""
         style = ttk.Style()
@@ -396,18 +479,29 @@ class AutoClicker:
         # 4. 位置偏差设置部分
         self.create_offset_section(self.scrollable_frame)
         
+    def create_deferred_widgets(self):
+        """创建首屏以外的GUI组件（首帧显示后调用）"""
         # 5. 时长和次数限制设置部分
         self.create_limit_section(self.scrollable_frame)
         
         # 6. 配置管理部分
         self.create_config_section(self.scrollable_frame)
         
-        # 7. 控制按钮部分
+        # 7. 多任务并行部分
+        self.create_jobs_section(self.scrollable_frame)
+        
+        # 8. 控制按钮部分
         self.create_control_section(self.scrollable_frame)
         
-        # 8. 状态显示部分
+        # 9. 状态显示部分
         self.create_status_section(self.scrollable_frame)
         
+        # 绑定快捷键（依赖上面创建的按钮和设置）
+        self.bind_hotkeys()
+        
+        # 延迟自动加载最后使用的配置
+        self.root.after(200, self.load_last_used_config_on_startup)
+        
     def create_area_section(self, parent):
         """创建区域选择部分"""
         area_frame = ttk.LabelFrame(parent, text="📍 多区域点击设置", padding="10")
@@ -459,6 +553,118 @@ class AutoClicker:
             fg="#e74c3c"
         )
         self.area_label.pack(side=tk.LEFT, padx=(10, 0))
+
+        # 批量区域：把一个区域均分为网格，或从 CSV/JSON 文件导入导出
+        bulk_frame = ttk.Frame(area_frame)
+        bulk_frame.pack(fill=tk.X, pady=(5, 0))
+
+        ttk.Button(
+            bulk_frame,
+            text="生成网格...",
+            command=self.generate_grid_areas,
+            width=12
+        ).pack(side=tk.LEFT)
+
+        ttk.Button(
+            bulk_frame,
+            text="导入区域...",
+            command=self.import_click_areas,
+            width=12
+        ).pack(side=tk.LEFT, padx=(5, 0))
+
+        ttk.Button(
+            bulk_frame,
+            text="导出区域...",
+            command=self.export_click_areas,
+            width=12
+        ).pack(side=tk.LEFT, padx=(5, 0))
+
+        # 模板图像：区域作为搜索范围，每轮循环前查找模板并点击找到的位置
+        template_frame = ttk.Frame(area_frame)
+        template_frame.pack(fill=tk.X, pady=(5, 0))
+        
+        self.template_button = ttk.Button(
+            template_frame,
+            text="设置模板图像...",
+            command=self.select_area_template,
+            width=16
+        )
+        self.template_button.pack(side=tk.LEFT)
+        
+        ttk.Button(
+            template_frame,
+            text="清除模板",
+            command=self.clear_area_templates,
+            width=10
+        ).pack(side=tk.LEFT, padx=(5, 0))
+        
+        ttk.Label(template_frame, text="匹配阈值:").pack(side=tk.LEFT, padx=(10, 0))
+        self.template_threshold_var = tk.StringVar(value="0.8")
+        template_threshold_entry = ttk.Entry(template_frame, textvariable=self.template_threshold_var, width=6)
+        template_threshold_entry.pack(side=tk.LEFT, padx=(5, 0))
+        
+        self.template_label = tk.Label(
+            area_frame,
+            text="模板图像：设置后该区域作为搜索范围，每轮循环前查找图像并点击找到的位置",
+            fg="#7f8c8d",
+            font=("Arial", 9)
+        )
+        self.template_label.pack(anchor="w", pady=(5, 0))
+        
+        # 等待变化：区域内容变化（如按钮变为可用）后才点击该区域
+        change_frame = ttk.Frame(area_frame)
+        change_frame.pack(fill=tk.X, pady=(5, 0))
+        
+        ttk.Label(change_frame, text="等待变化的区域:").pack(side=tk.LEFT)
+        self.change_areas_var = tk.StringVar(value="")
+        change_areas_entry = ttk.Entry(change_frame, textvariable=self.change_areas_var, width=8)
+        change_areas_entry.pack(side=tk.LEFT, padx=(5, 10))
+        
+        ttk.Label(change_frame, text="检测间隔(秒):").pack(side=tk.LEFT)
+        self.change_poll_interval_var = tk.StringVar(value="0.01")
+        change_poll_entry = ttk.Entry(change_frame, textvariable=self.change_poll_interval_var, width=6)
+        change_poll_entry.pack(side=tk.LEFT, padx=(5, 10))
+        
+        ttk.Label(change_frame, text="变化阈值:").pack(side=tk.LEFT)
+        self.change_threshold_var = tk.StringVar(value="0.05")
+        change_threshold_entry = ttk.Entry(change_frame, textvariable=self.change_threshold_var, width=6)
+        change_threshold_entry.pack(side=tk.LEFT, padx=(5, 0))
+        
+        change_desc_label = tk.Label(
+            area_frame,
+            text="等待变化：填写区域编号（如 1,3），这些区域等区域内画面变化后才点击；变化阈值为变化部分所占比例",
+            fg="#7f8c8d",
+            font=("Arial", 9)
+        )
+        change_desc_label.pack(anchor="w", pady=(5, 0))
+        
+        # 点击顺序：依次、每轮随机顺序、按权重随机选择区域
+        order_frame = ttk.Frame(area_frame)
+        order_frame.pack(fill=tk.X, pady=(5, 0))
+        
+        ttk.Label(order_frame, text="点击顺序:").pack(side=tk.LEFT)
+        self.area_order_var = tk.StringVar(value="sequential")
+        order_combobox = ttk.Combobox(
+            order_frame,
+            textvariable=self.area_order_var,
+            values=list(TRAVERSALS),
+            width=10,
+            state="readonly"
+        )
+        order_combobox.pack(side=tk.LEFT, padx=(5, 10))
+        
+        ttk.Label(order_frame, text="区域权重:").pack(side=tk.LEFT)
+        self.area_weights_var = tk.StringVar(value="")
+        area_weights_entry = ttk.Entry(order_frame, textvariable=self.area_weights_var, width=12)
+        area_weights_entry.pack(side=tk.LEFT, padx=(5, 0))
+        
+        order_desc_label = tk.Label(
+            area_frame,
+            text="点击顺序：sequential 依次，shuffled 每轮随机顺序，weighted 按权重（如 3,1,1，留空为相同权重）随机选择",
+            fg="#7f8c8d",
+            font=("Arial", 9)
+        )
+        order_desc_label.pack(anchor="w", pady=(5, 0))
         
     def create_time_section(self, parent):
         """创建时间设置部分"""
@@ -542,6 +748,26 @@ class AutoClicker:
         max_interval_entry = ttk.Entry(max_interval_frame, textvariable=self.max_click_interval_var, width=10)
         max_interval_entry.pack(side=tk.LEFT, padx=(10, 0))
         
+        # 点击后端选择
+        backend_frame = ttk.Frame(click_frame)
+        backend_frame.pack(fill=tk.X, pady=(5, 0))
+        
+        ttk.Label(backend_frame, text="点击后端:").pack(side=tk.LEFT)
+        self.input_backend_var = tk.StringVar(value=DEFAULT_BACKEND)
+        backend_combobox = ttk.Combobox(
+            backend_frame,
+            textvariable=self.input_backend_var,
+            values=list(BACKENDS),
+            width=10,
+            state="readonly"
+        )
+        backend_combobox.pack(side=tk.LEFT, padx=(10, 10))
+        
+        ttk.Label(
+            backend_frame,
+            text="(xtest: Linux低延迟直连X11；null: 不实际点击)"
+        ).pack(side=tk.LEFT)
+        
     def create_offset_section(self, parent):
         """创建位置偏差设置部分"""
         offset_frame = ttk.LabelFrame(parent, text="📐 点击位置偏差设置", padding="10")
@@ -585,6 +811,42 @@ class AutoClicker:
         y_offset_entry = ttk.Entry(y_offset_frame, textvariable=self.y_offset_var, width=10)
         y_offset_entry.pack(side=tk.LEFT, padx=(10, 0))
         
+        # 区域内点击位置的分布（每次区域点击的第一击）
+        distribution_frame = ttk.Frame(offset_frame)
+        distribution_frame.pack(fill=tk.X, pady=(5, 0))
+        
+        ttk.Label(distribution_frame, text="位置分布:").pack(side=tk.LEFT)
+        self.click_distribution_var = tk.StringVar(value="uniform")
+        distribution_combobox = ttk.Combobox(
+            distribution_frame,
+            textvariable=self.click_distribution_var,
+            values=list(DISTRIBUTIONS),
+            width=10,
+            state="readonly"
+        )
+        distribution_combobox.pack(side=tk.LEFT, padx=(10, 10))
+        
+        ttk.Label(distribution_frame, text="高斯标准差:").pack(side=tk.LEFT)
+        self.gaussian_sigma_var = tk.StringVar(value="0.33")
+        gaussian_sigma_entry = ttk.Entry(distribution_frame, textvariable=self.gaussian_sigma_var, width=6)
+        gaussian_sigma_entry.pack(side=tk.LEFT, padx=(5, 10))
+        
+        self.heatmap_image_var = tk.StringVar(value="")
+        ttk.Button(
+            distribution_frame,
+            text="热力图...",
+            command=self.select_heatmap_image,
+            width=10
+        ).pack(side=tk.LEFT)
+        
+        self.heatmap_label = tk.Label(
+            offset_frame,
+            text="位置分布：uniform 均匀，gaussian 集中在区域中心（标准差相对半宽），heatmap 按热力图亮度",
+            fg="#7f8c8d",
+            font=("Arial", 9)
+        )
+        self.heatmap_label.pack(anchor="w", pady=(5, 0))
+        
     def create_limit_section(self, parent):
         """创建时长和次数限制设置部分"""
         limit_frame = ttk.LabelFrame(parent, text="⏱️ 运行限制设置", padding="10")
@@ -730,10 +992,11 @@ class AutoClicker:
         self.config_combobox = ttk.Combobox(
             load_frame,
             textvariable=self.config_list_var,
-            width=18,
-            state="readonly"
+            width=18
         )
         self.config_combobox.pack(side=tk.LEFT, padx=(5, 10))
+        # 输入配置名称的开头筛选下拉列表
+        self.config_combobox.bind('<KeyRelease>', self.filter_config_list)
         
         # 加载配置按钮
         load_config_btn = ttk.Button(
@@ -753,9 +1016,90 @@ class AutoClicker:
         )
         delete_config_btn.pack(side=tk.LEFT, padx=(0, 0))
         
+        # 导入/导出配置文件
+        transfer_frame = ttk.Frame(config_frame)
+        transfer_frame.pack(fill=tk.X, pady=(5, 0))
+        
+        ttk.Button(
+            transfer_frame,
+            text="导入配置...",
+            command=self.import_configs,
+            width=12
+        ).pack(side=tk.LEFT, padx=(0, 5))
+        
+        ttk.Button(
+            transfer_frame,
+            text="导出配置...",
+            command=self.export_config,
+            width=12
+        ).pack(side=tk.LEFT, padx=(0, 5))
+        
+        self.config_count_label = tk.Label(transfer_frame, text="", fg="#7f8c8d")
+        self.config_count_label.pack(side=tk.LEFT, padx=(10, 0))
+        
         # 延迟刷新配置列表，确保config_dir已经初始化
         self.root.after(100, self.refresh_config_list)
         
+    def create_jobs_section(self, parent):
+        """创建多任务并行部分"""
+        jobs_frame = ttk.LabelFrame(parent, text="🧩 多任务并行", padding="10")
+        jobs_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        # 说明文字
+        desc_label = tk.Label(
+            jobs_frame,
+            text="多任务：用当前选择的区域和上方选中的配置添加任务，所有任务共用一个调度线程，点击不会重叠",
+            fg="#7f8c8d",
+            font=("Arial", 9),
+            wraplength=560,
+            justify=tk.LEFT
+        )
+        desc_label.pack(anchor="w", pady=(0, 5))
+        
+        # 添加/移除/暂停按钮
+        button_frame = ttk.Frame(jobs_frame)
+        button_frame.pack(fill=tk.X, pady=(0, 5))
+        
+        add_job_btn = ttk.Button(
+            button_frame,
+            text="添加任务",
+            command=self.add_job,
+            width=12
+        )
+        add_job_btn.pack(side=tk.LEFT, padx=(0, 5))
+        
+        remove_job_btn = ttk.Button(
+            button_frame,
+            text="移除任务",
+            command=self.remove_job,
+            width=12
+        )
+        remove_job_btn.pack(side=tk.LEFT, padx=(0, 5))
+        
+        pause_job_btn = ttk.Button(
+            button_frame,
+            text="暂停/继续任务",
+            command=self.toggle_job_pause,
+            width=14
+        )
+        pause_job_btn.pack(side=tk.LEFT)
+        
+        # 任务列表（每个任务各自的计数）
+        self.jobs_tree = ttk.Treeview(
+            jobs_frame,
+            columns=("name", "areas", "clicks", "state"),
+            show="headings",
+            height=4
+        )
+        self.jobs_tree.heading("name", text="任务")
+        self.jobs_tree.heading("areas", text="区域数")
+        self.jobs_tree.heading("clicks", text="点击次数")
+        self.jobs_tree.heading("state", text="状态")
+        self.jobs_tree.column("areas", width=60, anchor="center")
+        self.jobs_tree.column("clicks", width=80, anchor="center")
+        self.jobs_tree.column("state", width=80, anchor="center")
+        self.jobs_tree.pack(fill=tk.X)
+        
     def create_control_section(self, parent):
         """创建控制按钮部分"""
         control_frame = ttk.Frame(parent)
@@ -777,6 +1121,14 @@ class AutoClicker:
         )
         self.stop_button.pack(side=tk.LEFT)
         
+        self.pause_button = ttk.Button(
+            control_frame,
+            text="⏸️ 暂停",
+            command=self.toggle_pause,
+            state=tk.DISABLED
+        )
+        self.pause_button.pack(side=tk.LEFT, padx=(10, 0))
+        
         # 紧急停止提示
         emergency_label = tk.Label(
             control_frame,
@@ -830,6 +1182,37 @@ class AutoClicker:
         )
         self.current_area_label.pack()
         
+        # 点击耗时、定时延迟和循环时长（p50/p95/p99）
+        self.click_time_label = tk.Label(
+            status_frame,
+            text="点击耗时: --",
+            fg="#16a085"
+        )
+        self.click_time_label.pack()
+        
+        self.timing_label = tk.Label(
+            status_frame,
+            text="定时延迟: --",
+            fg="#16a085"
+        )
+        self.timing_label.pack()
+        
+        self.cycle_time_label = tk.Label(
+            status_frame,
+            text="循环时长: --",
+            fg="#16a085"
+        )
+        self.cycle_time_label.pack()
+        
+        # 导出统计按钮
+        self.export_stats_button = ttk.Button(
+            status_frame,
+            text="导出统计",
+            command=self.export_stats,
+            state=tk.DISABLED
+        )
+        self.export_stats_button.pack(pady=(5, 0))
+        
         # 快捷键提示
         hotkey_frame = ttk.LabelFrame(status_frame, text="⌨️ 快捷键", padding="5")
         hotkey_frame.pack(fill=tk.X, pady=(10, 0))
@@ -850,8 +1233,98 @@ class AutoClicker:
         )
         hotkey_label.pack(anchor="w")
         
-        self.click_count = 0
+    def add_job(self):
+        """用当前区域和选中的配置添加并行任务"""
+        config_name = self.config_list_var.get()
+        if not config_name:
+            messagebox.showwarning("警告", "请先在配置管理中选择任务使用的配置")
+            return
+            
+        try:
+            config = self.config_store.load(config_name)
+            plan = RunPlan.from_config(config, self.click_areas, self.area_templates)
+            backend = create_backend(plan.input_backend)
+            try:
+                job = self.job_scheduler.add_job(config_name, plan, backend)
+            except Exception:
+                # 没有交给任务的点击后端在这里关闭
+                backend.close()
+                raise
+        except ValueError as e:
+            messagebox.showerror("设置错误", f"参数设置有误: {str(e)}")
+            return
+        except Exception as e:
+            messagebox.showerror("错误", f"添加任务失败: {str(e)}")
+            return
+            
+        self.jobs_tree.insert("", tk.END, iid=str(job.job_id), values=(
+            f"#{job.job_id} {job.name}", len(plan.areas), 0, "运行中"
+        ))
         
+        # 启动任务列表刷新定时器
+        if self.jobs_after_id is None:
+            self.refresh_jobs()
+            
+    def remove_job(self):
+        """移除选中的并行任务"""
+        selection = self.jobs_tree.selection()
+        if not selection:
+            messagebox.showwarning("警告", "请选择要移除的任务")
+            return
+            
+        for iid in selection:
+            self.job_scheduler.remove_job(int(iid))
+            self.jobs_tree.delete(iid)
+            
+    def toggle_job_pause(self):
+        """暂停运行中的选中任务，继续已暂停的选中任务"""
+        selection = self.jobs_tree.selection()
+        if not selection:
+            messagebox.showwarning("警告", "请选择要暂停或继续的任务")
+            return
+            
+        jobs = {str(job.job_id): job for job in self.job_scheduler.job_list()}
+        for iid in selection:
+            job = jobs.get(iid)
+            if job is None:
+                continue
+            try:
+                if job.state == "running":
+                    self.job_scheduler.pause_job(job.job_id)
+                elif job.state == "paused":
+                    self.job_scheduler.resume_job(job.job_id)
+            except RuntimeError:
+                # 任务恰好在这时达到限制结束
+                continue
+                
+        # 暂停的任务也保持刷新，继续后计数照常更新
+        if self.jobs_after_id is None:
+            self.refresh_jobs()
+            
+    def refresh_jobs(self):
+        """定时刷新任务列表中各任务的计数和状态（主线程）"""
+        jobs = self.job_scheduler.job_list()
+        for job in jobs:
+            iid = str(job.job_id)
+            if not self.jobs_tree.exists(iid):
+                continue
+            if job.status.finished:
+                state = "已结束"
+            elif job.state == "paused":
+                state = "已暂停"
+            else:
+                state = "运行中"
+            values = (f"#{job.job_id} {job.name}", len(job.plan.areas), job.status.click_count, state)
+            if self.status_texts.get(iid) != values:
+                self.status_texts[iid] = values
+                self.jobs_tree.item(iid, values=values)
+                
+        # 还有任务在运行时继续刷新
+        if any(not job.status.finished for job in jobs):
+            self.jobs_after_id = self.root.after(STATUS_REFRESH_MS * 4, self.refresh_jobs)
+        else:
+            self.jobs_after_id = None
+            
     def select_click_areas(self):
         """选择多个点击区域"""
         if self.is_running:
@@ -867,90 +1340,172 @@ class AutoClicker:
             messagebox.showerror("错误", "请输入有效的区域数量")
             return
             
-        def areas_callback(areas):
-            self.click_areas = areas
-            self.current_area_index = 0
-            if len(areas) == 1:
-                area = areas[0]
-                self.area_label.config(
-                    text=f"区域: ({area[0]}, {area[1]}) - ({area[2]}, {area[3]})",
-                    fg="#27ae60"
-                )
-            else:
-                self.area_label.config(
-                    text=f"已选择 {len(areas)} 个区域",
-                    fg="#27ae60"
-                )
-            
-        selector = AreaSelector(areas_callback, area_count)
+        selector = AreaSelector(self.set_click_areas, area_count)
         selector.select_area()
-        
+
+    def set_click_areas(self, areas):
+        """设置点击区域（列表或 (N, 4) 数组），并清除各区域的模板图像"""
+        self.click_areas = areas
+        self.area_templates = [None] * len(areas)
+        self.update_template_label()
+        if len(areas) == 1:
+            area = areas[0]
+            self.area_label.config(
+                text=f"区域: ({area[0]}, {area[1]}) - ({area[2]}, {area[3]})",
+                fg="#27ae60"
+            )
+        else:
+            self.area_label.config(
+                text=f"已选择 {len(areas)} 个区域",
+                fg="#27ae60"
+            )
+
+    def generate_grid_areas(self):
+        """把第一个已选择的区域均分为网格，每个格子作为一个点击区域"""
+        if self.is_running:
+            messagebox.showwarning("警告", "请先停止自动点击")
+            return
+        if len(self.click_areas) == 0:
+            messagebox.showwarning("警告", "请先选择一个区域作为网格的外框")
+            return
+
+        text = simpledialog.askstring(
+            "生成网格",
+            "输入 行数,列数,间距（间距为每个格子四周留出的像素，可省略）：",
+            initialvalue="5,5,2",
+            parent=self.root
+        )
+        if not text:
+            return
+
+        from area_sets import grid_areas
+        try:
+            values = [int(value) for value in text.replace("，", ",").split(",")]
+            if len(values) not in (2, 3):
+                raise ValueError("格式应为 行数,列数,间距")
+            areas = grid_areas(self.click_areas[0], *values)
+        except ValueError as e:
+            messagebox.showerror("错误", f"生成网格失败: {str(e)}")
+            return
+        self.set_click_areas(areas)
+
+    def import_click_areas(self):
+        """从 CSV 或 JSON 文件导入点击区域"""
+        if self.is_running:
+            messagebox.showwarning("警告", "请先停止自动点击")
+            return
+        path = filedialog.askopenfilename(
+            title="导入区域",
+            filetypes=[("区域文件", "*.csv *.json"), ("所有文件", "*.*")],
+            parent=self.root
+        )
+        if not path:
+            return
+
+        from area_sets import load_areas
+        try:
+            areas = load_areas(path)
+            if len(areas) == 0:
+                raise ValueError("文件中没有区域")
+        except (OSError, ValueError) as e:
+            messagebox.showerror("错误", f"导入区域失败: {str(e)}")
+            return
+        self.set_click_areas(areas)
+
+    def export_click_areas(self):
+        """把当前的点击区域导出为 CSV 或 JSON 文件"""
+        if len(self.click_areas) == 0:
+            messagebox.showwarning("警告", "没有可导出的区域")
+            return
+        path = filedialog.asksaveasfilename(
+            title="导出区域",
+            defaultextension=".csv",
+            filetypes=[("CSV 文件", "*.csv"), ("JSON 文件", "*.json")],
+            parent=self.root
+        )
+        if not path:
+            return
+
+        from area_sets import save_areas
+        try:
+            save_areas(path, self.click_areas)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("错误", f"导出区域失败: {str(e)}")
+            return
+        messagebox.showinfo("成功", f"已导出 {len(self.click_areas)} 个区域")
+
+    def select_area_template(self):
+        """为一个已选择的区域设置模板图像"""
+        if self.is_running:
+            messagebox.showwarning("警告", "请先停止自动点击")
+            return
+        if len(self.click_areas) == 0:
+            messagebox.showwarning("警告", "请先选择点击区域（区域即模板的搜索范围）")
+            return
+            
+        # 多个区域时选择区域编号
+        area_index = 0
+        if len(self.click_areas) > 1:
+            number = simpledialog.askinteger(
+                "设置模板图像",
+                f"为第几个区域设置模板图像？(1-{len(self.click_areas)})",
+                minvalue=1,
+                maxvalue=len(self.click_areas),
+                parent=self.root
+            )
+            if number is None:
+                return
+            area_index = number - 1
+            
+        path = filedialog.askopenfilename(
+            title="选择模板图像",
+            filetypes=[("图像文件", "*.png *.jpg *.jpeg *.bmp"), ("所有文件", "*.*")],
+            parent=self.root
+        )
+        if not path:
+            return
+            
+        self.area_templates[area_index] = path
+        self.update_template_label()
+        
+    def select_heatmap_image(self):
+        """选择热力图图像（亮度越高的位置点击越多，拉伸到每个区域）"""
+        path = filedialog.askopenfilename(
+            title="选择热力图图像",
+            filetypes=[("图像文件", "*.png *.jpg *.jpeg *.bmp"), ("所有文件", "*.*")],
+            parent=self.root
+        )
+        if not path:
+            return
+        self.heatmap_image_var.set(path)
+        self.click_distribution_var.set("heatmap")
+        self.heatmap_label.config(text=f"热力图: {os.path.basename(path)}")
+        
+    def clear_area_templates(self):
+        """清除所有区域的模板图像"""
+        self.area_templates = [None] * len(self.click_areas)
+        self.update_template_label()
+        
+    def update_template_label(self):
+        """显示各区域设置的模板图像"""
+        names = [
+            f"区域{index + 1}: {os.path.basename(path)}"
+            for index, path in enumerate(self.area_templates) if path
+        ]
+        if names:
+            self.template_label.config(text="模板图像 - " + ", ".join(names), fg="#27ae60")
+        else:
+            self.template_label.config(
+                text="模板图像：设置后该区域作为搜索范围，每轮循环前查找图像并点击找到的位置",
+                fg="#7f8c8d"
+            )
+            
     def validate_settings(self):
-        """验证设置参数"""
+        """验证设置参数，并编译为运行参数快照"""
         try:
-            # 验证时间间隔
-            min_time = float(self.min_time_var.get())
-            max_time = float(self.max_time_var.get())
-            if min_time <= 0 or max_time <= 0 or min_time > max_time:
-                raise ValueError("时间间隔设置无效")
-                
-            # 验证点击次数
-            min_clicks = int(self.min_clicks_var.get())
-            max_clicks = int(self.max_clicks_var.get())
-            if min_clicks <= 0 or max_clicks <= 0 or min_clicks > max_clicks:
-                raise ValueError("点击次数设置无效")
-                
-            # 验证连续点击间隔
-            min_click_interval = float(self.min_click_interval_var.get())
-            max_click_interval = float(self.max_click_interval_var.get())
-            if min_click_interval < 0.05:
-                raise ValueError("连续点击最小间隔不能小于0.05秒(50ms)")
-            if max_click_interval > 0.5:
-                raise ValueError("连续点击最大间隔不能大于0.5秒(500ms)")
-            if min_click_interval > max_click_interval:
-                raise ValueError("连续点击最小间隔不能大于最大间隔")
-                
-            # 验证位置偏差
-            x_offset = int(self.x_offset_var.get())
-            y_offset = int(self.y_offset_var.get())
-            if x_offset < 0 or y_offset < 0:
-                raise ValueError("位置偏差不能为负数")
-                
-            # 验证无偏差概率设置
-            no_offset_prob = float(self.no_offset_probability_var.get())
-            if no_offset_prob < 0 or no_offset_prob > 1:
-                raise ValueError("无偏差概率必须在0.0-1.0之间")
-                
-            # 验证点击区域
-            if not self.click_areas:
-                raise ValueError("请先选择点击区域")
-                
-            # 验证区域间隔
-            if len(self.click_areas) > 1:
-                min_area_interval = float(self.min_area_interval_var.get())
-                max_area_interval = float(self.max_area_interval_var.get())
-                if min_area_interval < 0 or max_area_interval < 0:
-                    raise ValueError("区域间隔不能为负数")
-                if min_area_interval > max_area_interval:
-                    raise ValueError("区域间隔最小值不能大于最大值")
-                
-            # 验证时长限制设置
-            if self.duration_limit_var.get():
-                duration = float(self.duration_var.get())
-                if duration <= 0:
-                    raise ValueError("运行时长必须大于0")
-                    
-            # 验证次数限制设置
-            if self.count_limit_var.get():
-                max_total_clicks = int(self.max_total_clicks_var.get())
-                if max_total_clicks <= 0:
-                    raise ValueError("总点击次数必须大于0")
-                    
-            # 确保至少有一个限制条件或者选择了无限选项
-            if not self.unlimited_duration_var.get() and not self.duration_limit_var.get() and \
-               not self.unlimited_count_var.get() and not self.count_limit_var.get():
-                raise ValueError("请至少选择一种运行模式（时长限制、次数限制或无限模式）")
-                
+            self.run_plan = RunPlan.from_config(
+                self.get_current_config(), self.click_areas, self.area_templates
+            )
             return True
             
         except ValueError as e:
@@ -961,220 +1516,207 @@ class AutoClicker:
         """开始自动点击"""
         if not self.validate_settings():
             return
+
+        # 等上一次的点击线程结束，避免新旧线程同时点击
+        if self.engine is not None:
+            self.engine.stop()
+            if not self.engine.join(ENGINE_JOIN_TIMEOUT):
+                messagebox.showerror("错误", "上一次的点击线程还没有结束，请稍后再试")
+                return
+            
+        # 创建点击后端
+        try:
+            backend = create_backend(self.run_plan.input_backend)
+        except RuntimeError as e:
+            messagebox.showerror("错误", f"点击后端初始化失败: {str(e)}")
+            return
+            
+        # 创建点击引擎（加载模板图像）
+        try:
+            engine = ClickEngine(self.run_plan, backend)
+        except (OSError, ValueError, RuntimeError) as e:
+            backend.close()
+            messagebox.showerror("设置错误", f"截屏或模板图像初始化失败: {str(e)}")
+            return
             
         self.is_running = True
         self.start_button.config(state=tk.DISABLED)
         self.stop_button.config(state=tk.NORMAL)
+        self.pause_button.config(state=tk.NORMAL, text="⏸️ 暂停")
         self.area_button.config(state=tk.DISABLED)
+        self.template_button.config(state=tk.DISABLED)
+        self.export_stats_button.config(state=tk.DISABLED)
         
-        # 初始化运行状态
-        self.start_time = time.time()
-        self.total_click_count = 0
-        self.click_count = 0  # 重置总点击次数显示
-        
-        # 立即更新显示
-        self.update_click_count()
-        
-        # 启动点击线程
-        self.click_thread = threading.Thread(target=self.clicking_loop, daemon=True)
-        self.click_thread.start()
+        # 在后台线程中启动点击引擎
+        self.engine = engine
+        self.engine.start()
         
-        # 启动状态更新线程
-        self.status_thread = threading.Thread(target=self.update_status_loop, daemon=True)
-        self.status_thread.start()
+        # 启动状态刷新定时器（立即更新一次显示）
+        if self.status_after_id is not None:
+            self.root.after_cancel(self.status_after_id)
+        self.refresh_status()
         
         self.status_label.config(text="运行中...", fg="#f39c12")
         
     def stop_clicking(self):
         """停止自动点击"""
         self.is_running = False
+        if self.engine is not None:
+            self.engine.stop()
         self.start_button.config(state=tk.NORMAL)
         self.stop_button.config(state=tk.DISABLED)
+        self.pause_button.config(state=tk.DISABLED, text="⏸️ 暂停")
         self.area_button.config(state=tk.NORMAL)
+        self.template_button.config(state=tk.NORMAL)
+        self.export_stats_button.config(state=tk.NORMAL)
         
         self.status_label.config(text="已停止", fg="#e74c3c")
         
-    def clicking_loop(self):
-        """点击循环"""
-        while self.is_running:
-            try:
-                # 检查时长限制
-                if self.duration_limit_var.get():
-                    duration_limit = float(self.duration_var.get()) * 60  # 转换为秒
-                    elapsed_time = time.time() - self.start_time
-                    if elapsed_time >= duration_limit:
-                        self.root.after(0, self.stop_clicking)
-                        break
-                        
-                # 检查次数限制
-                if self.count_limit_var.get():
-                    max_total_clicks = int(self.max_total_clicks_var.get())
-                    if self.total_click_count >= max_total_clicks:
-                        self.root.after(0, self.stop_clicking)
-                        break
-                
-                # 执行一轮完整的循环（所有区域）
-                self.execute_one_cycle()
-                
-                if not self.is_running:
-                    break
-                
-                # 循环间隔：完成所有区域一轮点击后的等待时间
-                min_time = float(self.min_time_var.get())
-                max_time = float(self.max_time_var.get())
-                cycle_wait_time = random.uniform(min_time, max_time)
-                time.sleep(cycle_wait_time)
-                        
-            except Exception as e:
-                print(f"点击过程中发生错误: {e}")
-                self.root.after(0, self.stop_clicking)
-                break
-                
-    def execute_one_cycle(self):
-        """执行一轮完整的循环（所有区域）"""
-        # 获取连续点击间隔范围
-        min_click_interval = float(self.min_click_interval_var.get())
-        max_click_interval = float(self.max_click_interval_var.get())
-        
-        # 获取位置偏差设置
-        x_offset = int(self.x_offset_var.get())
-        y_offset = int(self.y_offset_var.get())
-        
-        # 获取区域间隔范围
-        min_area_interval = float(self.min_area_interval_var.get())
-        max_area_interval = float(self.max_area_interval_var.get())
-        
-        # 遍历所有区域
-        for area_index in range(len(self.click_areas)):
-            if not self.is_running:
-                break
-                
-            # 更新当前区域索引
-            self.current_area_index = area_index
-            
-            # 获取当前区域
-            current_area = self.click_areas[area_index]
-            x1, y1, x2, y2 = current_area
+    def toggle_pause(self):
+        """暂停/继续点击（暂停时保留剩余的时长和次数）"""
+        engine = self.engine
+        if engine is None or not self.is_running:
+            return False
+        try:
+            if engine.state == "running":
+                engine.pause()
+                self.pause_button.config(text="▶️ 继续")
+                self.status_label.config(text="已暂停", fg="#3498db")
+            elif engine.state == "paused":
+                engine.resume()
+                self.pause_button.config(text="⏸️ 暂停")
+                self.status_label.config(text="运行中...", fg="#f39c12")
+            else:
+                return False
+        except RuntimeError:
+            # 点击线程刚好因达到限制而结束
+            return False
+        return True
+        
+    def refresh_status(self):
+        """以固定频率刷新所有状态显示（主线程）"""
+        engine = self.engine
+        plan = engine.plan
+        # 一次读取一致的快照（点击次数、剩余次数和当前区域来自同一时刻）
+        snapshot = engine.snapshot()
+        
+        # 点击线程因达到限制或出错而结束
+        if snapshot["state"] == "stopped" and self.is_running:
+            self.stop_clicking()
             
-            # 执行当前区域的点击事件
-            self.execute_area_clicks(x1, y1, x2, y2, x_offset, y_offset, min_click_interval, max_click_interval)
+        # 总点击次数
+        click_text = f"总点击次数: {snapshot['click_count']}"
+        
+        # 剩余时间（不含暂停的时间）
+        if plan.duration_limit is not None:
+            remaining_time = snapshot["remaining_duration"]
             
-            # 区域间隔：切换到下一个区域前的随机等待时间（最后一个区域不需要等待）
-            if area_index < len(self.click_areas) - 1 and max_area_interval > 0:
-                random_area_interval = random.uniform(min_area_interval, max_area_interval)
-                time.sleep(random_area_interval)
-                
-    def execute_area_clicks(self, x1, y1, x2, y2, x_offset, y_offset, min_click_interval, max_click_interval):
-        """执行单个区域的点击事件"""
-        # 获取随机点击次数
-        min_clicks = int(self.min_clicks_var.get())
-        max_clicks = int(self.max_clicks_var.get())
-        click_count = random.randint(min_clicks, max_clicks)
-        
-        # 在区域内随机选择基础点击位置
-        base_x = random.randint(x1, x2)
-        base_y = random.randint(y1, y2)
-        
-        # 执行连续点击
-        for i in range(click_count):
-            if not self.is_running:
-                break
-                
-            # 计算当前点击位置（带随机偏差概率）
-            if i == 0:
-                # 第一次点击总是在基础位置
-                click_x, click_y = base_x, base_y
+            if remaining_time > 0:
+                minutes = int(remaining_time // 60)
+                seconds = int(remaining_time % 60)
+                time_text = f"剩余时间: {minutes:02d}:{seconds:02d}"
             else:
-                # 根据用户设置的概率决定是否使用偏差
-                no_offset_prob = float(self.no_offset_probability_var.get())
-                use_offset = random.random() >= no_offset_prob  # 大于等于无偏差概率时使用偏差
-                
-                if use_offset:
-                    # 有偏差：在基础位置上添加随机偏差
-                    offset_x = random.randint(-x_offset, x_offset)
-                    offset_y = random.randint(-y_offset, y_offset)
-                    click_x = max(x1, min(x2, base_x + offset_x))
-                    click_y = max(y1, min(y2, base_y + offset_y))
-                else:
-                    # 无偏差：在基础位置点击
-                    click_x, click_y = base_x, base_y
-            
-            # 执行点击
-            pyautogui.click(click_x, click_y)
-            self.click_count += 1
-            self.total_click_count += 1
-            
-            # 更新UI（在主线程中）
-            self.root.after(0, self.update_click_count)
-            
-            # 检查次数限制（在每次点击后）
-            if self.count_limit_var.get():
-                max_total_clicks = int(self.max_total_clicks_var.get())
-                if self.total_click_count >= max_total_clicks:
-                    self.root.after(0, self.stop_clicking)
-                    return
+                time_text = "剩余时间: 00:00"
+        else:
+            time_text = "剩余时间: 无限"
             
-            # 连续点击间隔：同一区域内连续点击之间的快速间隔
-            if i < click_count - 1:
-                random_interval = random.uniform(min_click_interval, max_click_interval)
-                time.sleep(random_interval)
-                
-    def update_click_count(self):
-        """更新点击计数显示"""
-        self.click_count_label.config(text=f"总点击次数: {self.click_count}")
-        
-    def update_status_loop(self):
-        """状态更新循环"""
-        while self.is_running:
-            try:
-                # 更新剩余时间
-                if self.duration_limit_var.get():
-                    duration_limit = float(self.duration_var.get()) * 60  # 转换为秒
-                    elapsed_time = time.time() - self.start_time
-                    remaining_time = max(0, duration_limit - elapsed_time)
-                    
-                    if remaining_time > 0:
-                        minutes = int(remaining_time // 60)
-                        seconds = int(remaining_time % 60)
-                        time_text = f"剩余时间: {minutes:02d}:{seconds:02d}"
-                    else:
-                        time_text = "剩余时间: 00:00"
-                else:
-                    time_text = "剩余时间: 无限"
-                    
-                # 更新剩余次数
-                if self.count_limit_var.get():
-                    max_total_clicks = int(self.max_total_clicks_var.get())
-                    remaining_clicks = max(0, max_total_clicks - self.total_click_count)
-                    count_text = f"剩余次数: {remaining_clicks}"
-                else:
-                    count_text = "剩余次数: 无限"
-                    
-                # 更新当前区域信息
-                if len(self.click_areas) > 1:
-                    area_text = f"当前区域: {self.current_area_index + 1}/{len(self.click_areas)}"
-                else:
-                    area_text = "当前区域: 单区域"
-                
-                # 在主线程中更新UI
-                self.root.after(0, lambda: self.remaining_time_label.config(text=time_text))
-                self.root.after(0, lambda: self.remaining_count_label.config(text=count_text))
-                self.root.after(0, lambda: self.current_area_label.config(text=area_text))
-                
-                time.sleep(1)  # 每秒更新一次
-                
-            except Exception as e:
-                print(f"状态更新过程中发生错误: {e}")
-                break
+        # 剩余次数
+        if plan.max_total_clicks is not None:
+            count_text = f"剩余次数: {snapshot['remaining_clicks']}"
+        else:
+            count_text = "剩余次数: 无限"
+            
+        # 当前区域信息
+        if len(plan.areas) > 1:
+            area_text = f"当前区域: {snapshot['current_area_index'] + 1}/{len(plan.areas)}"
+        else:
+            area_text = "当前区域: 单区域"
+            
+        # 点击耗时、定时延迟（相对计划时间）和循环时长
+        metrics = engine.metrics
+        click_time_text = self.format_percentiles("点击耗时", metrics.click_time)
+        timing_text = self.format_percentiles("定时延迟", metrics.lateness)
+        cycle_time_text = self.format_percentiles("循环时长", metrics.cycle_time)
+        
+        self.set_status_text(self.click_count_label, click_text)
+        self.set_status_text(self.remaining_time_label, time_text)
+        self.set_status_text(self.remaining_count_label, count_text)
+        self.set_status_text(self.current_area_label, area_text)
+        self.set_status_text(self.click_time_label, click_time_text)
+        self.set_status_text(self.timing_label, timing_text)
+        self.set_status_text(self.cycle_time_label, cycle_time_text)
+        
+        # 运行中继续定时刷新；停止后已完成最后一次刷新
+        if self.is_running:
+            self.status_after_id = self.root.after(STATUS_REFRESH_MS, self.refresh_status)
+        else:
+            self.status_after_id = None
+            
+    def format_percentiles(self, name, histogram):
+        """格式化直方图的 p50/p95/p99"""
+        if histogram.count == 0:
+            return f"{name}: --"
+        p = histogram.percentiles_ms()
+        return f"{name}: p50 {p['p50']:.1f}ms / p95 {p['p95']:.1f}ms / p99 {p['p99']:.1f}ms"
+        
+    def export_stats(self):
+        """将上一次运行的统计直方图导出为 JSON 文件"""
+        if self.engine is None:
+            return
+            
+        try:
+            if not os.path.exists(self.stats_dir):
+                os.makedirs(self.stats_dir)
+            stats_file = os.path.join(
+                self.stats_dir,
+                f"stats_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            )
+            with open(stats_file, 'w', encoding='utf-8') as f:
+                json.dump(self.engine.stats_dict(), f, ensure_ascii=False, indent=2)
+            messagebox.showinfo("成功", f"统计已导出到 {stats_file}")
+            
+        except Exception as e:
+            messagebox.showerror("错误", f"导出统计失败: {str(e)}")
+            
+    def set_status_text(self, label, text):
+        """仅在文字变化时更新标签，避免无意义的重绘"""
+        if self.status_texts.get(label) != text:
+            self.status_texts[label] = text
+            label.config(text=text)
         
     def run(self):
         """运行程序"""
         # 设置窗口居中
         self.center_window()
         
+        # 首帧显示后再创建其余组件
+        self.root.after_idle(self.on_first_frame)
+        
         # 启动主循环
         self.root.mainloop()
         
+        if self.hotkey_listener is not None:
+            self.hotkey_listener.stop()
+            
+        # 退出前写完还没保存的配置
+        self.config_worker.close(CONFIG_FLUSH_TIMEOUT)
+        if self.config_worker.thread.is_alive():
+            print("警告: 退出时仍有配置没有写入完成")
+        
+    def on_first_frame(self):
+        """首帧显示后的初始化"""
+        self.mark_startup("first_frame")
+        self.create_deferred_widgets()
+        self.mark_startup("all_widgets")
+        
+        # 启动耗时分析：输出时间点后直接退出
+        if self.startup_marks is not None:
+            self.startup_marks.emit()
+            self.root.after(0, self.root.destroy)
+            return
+            
+        self.start_global_hotkeys()
+            
     def center_window(self):
         """窗口居中显示"""
         self.root.update_idletasks()
@@ -1216,6 +1758,67 @@ class AutoClicker:
             self.stop_clicking()
             self.show_hotkey_message("已通过快捷键停止点击")
             
+    def start_global_hotkeys(self):
+        """启动全局快捷键监听（不支持时只使用窗口内的快捷键）"""
+        from global_hotkeys import HotkeyListener, load_hotkeys
+        try:
+            hotkeys = load_hotkeys(self.config_dir)
+            self.hotkey_listener = HotkeyListener(hotkeys, self.on_global_hotkey)
+        except (RuntimeError, ValueError) as e:
+            print(f"全局快捷键不可用: {e}")
+            return
+        self.hotkey_listener.start()
+        print("全局快捷键: " + ", ".join(f"{action} = {key}" for action, key in hotkeys.items()))
+        self.poll_global_hotkeys()
+        
+    def on_global_hotkey(self, action):
+        """全局快捷键回调（监听线程）：紧急停止直接通知点击引擎，其余动作交给界面线程"""
+        if action == "stop":
+            engine = self.engine
+            if engine is not None:
+                engine.stop()
+        self.hotkey_actions.put(action)
+        
+    def poll_global_hotkeys(self):
+        """在界面线程中处理全局快捷键动作"""
+        from global_hotkeys import PROFILE_ACTION_PREFIX
+        while True:
+            try:
+                action = self.hotkey_actions.get_nowait()
+            except queue.Empty:
+                break
+            if action == "stop":
+                self.hotkey_stop()
+            elif action == "pause":
+                self.hotkey_pause_resume()
+            elif action.startswith(PROFILE_ACTION_PREFIX):
+                self.hotkey_switch_profile(action[len(PROFILE_ACTION_PREFIX):].strip())
+        self.root.after(HOTKEY_POLL_INTERVAL_MS, self.poll_global_hotkeys)
+        
+    def hotkey_pause_resume(self):
+        """快捷键：暂停/继续"""
+        if self.toggle_pause():
+            paused = self.engine.state == "paused"
+            self.show_hotkey_message("已暂停，再按一次暂停快捷键继续" if paused else "已继续点击")
+            
+    def hotkey_switch_profile(self, name):
+        """快捷键：切换到配置 name（运行中时用新配置重新开始）"""
+        try:
+            config = self.config_store.load(name)
+        except (OSError, ValueError) as e:
+            self.show_hotkey_message(f"无法加载配置 {name}: {e}")
+            return
+            
+        was_running = self.is_running
+        if was_running:
+            self.stop_clicking()
+        self.apply_config(config)
+        self.config_list_var.set(name)
+        self.save_last_used_config(name)
+        if was_running:
+            self.start_clicking()
+        self.show_hotkey_message(f"已切换到配置 {name}")
+        
     def show_hotkey_message(self, message):
         """显示快捷键操作提示消息"""
         # 创建一个临时的状态消息
@@ -1235,6 +1838,12 @@ class AutoClicker:
             "area_count": self.area_count_var.get(),
             "min_area_interval": self.min_area_interval_var.get(),
             "max_area_interval": self.max_area_interval_var.get(),
+            "template_threshold": self.template_threshold_var.get(),
+            "change_areas": self.change_areas_var.get(),
+            "change_poll_interval": self.change_poll_interval_var.get(),
+            "change_threshold": self.change_threshold_var.get(),
+            "area_order": self.area_order_var.get(),
+            "area_weights": self.area_weights_var.get(),
             
             # 时间设置
             "min_time": self.min_time_var.get(),
@@ -1250,6 +1859,12 @@ class AutoClicker:
             "no_offset_probability": self.no_offset_probability_var.get(),
             "x_offset": self.x_offset_var.get(),
             "y_offset": self.y_offset_var.get(),
+            "click_distribution": self.click_distribution_var.get(),
+            "gaussian_sigma": self.gaussian_sigma_var.get(),
+            "heatmap_image": self.heatmap_image_var.get(),
+            
+            # 点击后端
+            "input_backend": self.input_backend_var.get(),
             
             # 运行限制设置
             "duration_limit": self.duration_limit_var.get(),
@@ -1271,6 +1886,12 @@ class AutoClicker:
             self.area_count_var.set(config.get("area_count", "1"))
             self.min_area_interval_var.set(config.get("min_area_interval", "0.3"))
             self.max_area_interval_var.set(config.get("max_area_interval", "0.7"))
+            self.template_threshold_var.set(config.get("template_threshold", "0.8"))
+            self.change_areas_var.set(config.get("change_areas", ""))
+            self.change_poll_interval_var.set(config.get("change_poll_interval", "0.01"))
+            self.change_threshold_var.set(config.get("change_threshold", "0.05"))
+            self.area_order_var.set(config.get("area_order", "sequential"))
+            self.area_weights_var.set(config.get("area_weights", ""))
             
             # 时间设置
             self.min_time_var.set(config.get("min_time", "1.0"))
@@ -1286,6 +1907,14 @@ class AutoClicker:
             self.no_offset_probability_var.set(config.get("no_offset_probability", "0.67"))
             self.x_offset_var.set(config.get("x_offset", "10"))
             self.y_offset_var.set(config.get("y_offset", "10"))
+            self.click_distribution_var.set(config.get("click_distribution", "uniform"))
+            self.gaussian_sigma_var.set(config.get("gaussian_sigma", "0.33"))
+            self.heatmap_image_var.set(config.get("heatmap_image", ""))
+            if self.heatmap_image_var.get():
+                self.heatmap_label.config(text=f"热力图: {os.path.basename(self.heatmap_image_var.get())}")
+            
+            # 点击后端
+            self.input_backend_var.set(config.get("input_backend", DEFAULT_BACKEND))
             
             # 运行限制设置
             self.duration_limit_var.set(config.get("duration_limit", False))
@@ -1312,24 +1941,23 @@ class AutoClicker:
             return
             
         # 检查配置名称是否合法
-        if any(char in config_name for char in ['/', '\\', ':', '*', '?', '"', '<', '>', '|']):
-            messagebox.showerror("错误", "配置名称不能包含特殊字符")
+        try:
+            check_name(config_name)
+        except ValueError as e:
+            messagebox.showerror("错误", str(e))
             return
             
         try:
             config = self.get_current_config()
-            config_file = os.path.join(self.config_dir, f"{config_name}.json")
             
-            # 如果文件已存在，询问是否覆盖
-            if os.path.exists(config_file):
+            # 如果配置已存在，询问是否覆盖
+            if self.config_store.exists(config_name):
                 if not messagebox.askyesno("确认", f"配置 '{config_name}' 已存在，是否覆盖？"):
                     return
                     
-            with open(config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, ensure_ascii=False, indent=2)
-                
-            messagebox.showinfo("成功", f"配置 '{config_name}' 保存成功")
-            self.refresh_config_list()
+            # 在后台写入，完成后在 poll_config_worker 中提示
+            self.config_worker.save(config_name, config)
+            self.schedule_config_poll()
             self.config_name_var.set("")  # 清空输入框
             
         except Exception as e:
@@ -1343,22 +1971,19 @@ class AutoClicker:
             return
             
         try:
-            config_file = os.path.join(self.config_dir, f"{config_name}.json")
-            if not os.path.exists(config_file):
-                messagebox.showerror("错误", "配置文件不存在")
-                self.refresh_config_list()
-                return
-                
-            with open(config_file, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-                
-            self.apply_config(config)
-            # 保存最后使用的配置名称
-            self.save_last_used_config(config_name)
-            messagebox.showinfo("成功", f"配置 '{config_name}' 加载成功")
-            
+            config = self.config_store.load(config_name)
+        except FileNotFoundError:
+            messagebox.showerror("错误", "配置文件不存在")
+            self.refresh_config_list()
+            return
         except Exception as e:
             messagebox.showerror("错误", f"加载配置失败: {str(e)}")
+            return
+            
+        self.apply_config(config)
+        # 保存最后使用的配置名称
+        self.save_last_used_config(config_name)
+        messagebox.showinfo("成功", f"配置 '{config_name}' 加载成功")
             
     def delete_config(self):
         """删除选中的配置"""
@@ -1371,76 +1996,149 @@ class AutoClicker:
             return
             
         try:
-            config_file = os.path.join(self.config_dir, f"{config_name}.json")
-            if os.path.exists(config_file):
-                os.remove(config_file)
-                messagebox.showinfo("成功", f"配置 '{config_name}' 删除成功")
-                self.refresh_config_list()
-            else:
-                messagebox.showerror("错误", "配置文件不存在")
-                self.refresh_config_list()
-                
+            self.config_store.delete(config_name)
+            messagebox.showinfo("成功", f"配置 '{config_name}' 删除成功")
+            self.config_list_var.set("")
+            self.refresh_config_list()
+        except FileNotFoundError:
+            messagebox.showerror("错误", "配置文件不存在")
+            self.refresh_config_list()
         except Exception as e:
             messagebox.showerror("错误", f"删除配置失败: {str(e)}")
             
-    def refresh_config_list(self):
-        """刷新配置列表"""
+    def import_configs(self):
+        """导入配置文件（与 configs 目录中的 JSON 格式相同）"""
+        paths = filedialog.askopenfilenames(
+            title="导入配置",
+            filetypes=[("配置文件", "*.json"), ("所有文件", "*.*")],
+            parent=self.root
+        )
+        if not paths:
+            return
+            
         try:
-            if not os.path.exists(self.config_dir):
-                os.makedirs(self.config_dir)
-                
-            config_files = [f[:-5] for f in os.listdir(self.config_dir) if f.endswith('.json')]
-            config_files.sort()
+            imported = self.config_store.import_files(paths)
+        except Exception as e:
+            messagebox.showerror("错误", f"导入配置失败: {str(e)}")
+            return
+            
+        skipped = len(paths) - len(imported)
+        message = f"已导入 {len(imported)} 个配置"
+        if skipped:
+            message += f"，{skipped} 个同名配置已存在未导入"
+        messagebox.showinfo("成功", message)
+        self.refresh_config_list()
+        
+    def export_config(self):
+        """把选中的配置导出到目录"""
+        config_name = self.config_list_var.get()
+        if not config_name or not self.config_store.exists(config_name):
+            messagebox.showwarning("警告", "请选择要导出的配置")
+            return
+            
+        target_dir = filedialog.askdirectory(title="导出到目录", parent=self.root)
+        if not target_dir:
+            return
             
-            self.config_combobox['values'] = config_files
+        try:
+            exported = self.config_store.export_files([config_name], target_dir)
+            messagebox.showinfo("成功", f"配置已导出到 {exported[0]}")
+        except Exception as e:
+            messagebox.showerror("错误", f"导出配置失败: {str(e)}")
             
-            # 尝试加载最后使用的配置
-            last_used = self.get_last_used_config()
-            if last_used and last_used in config_files:
+    def refresh_config_list(self):
+        """刷新配置列表（只显示前 CONFIG_LIST_LIMIT 个，输入名称开头可以筛选）"""
+        try:
+            config_names = self.config_store.names(limit=CONFIG_LIST_LIMIT)
+            self.config_combobox['values'] = config_names
+            self.config_count_label.config(text=f"共 {self.config_store.count()} 个配置")
+            
+            # 尝试选中最后使用的配置
+            last_used = self.last_used_config
+            if last_used and self.config_store.exists(last_used):
                 self.config_list_var.set(last_used)
-            elif config_files and not self.config_list_var.get():
-                self.config_list_var.set(config_files[0])
+            elif config_names and not self.config_list_var.get():
+                self.config_list_var.set(config_names[0])
                 
         except Exception as e:
             print(f"刷新配置列表失败: {str(e)}")
             
+    def filter_config_list(self, event=None):
+        """按输入的名称开头筛选配置下拉列表"""
+        self.config_combobox['values'] = self.config_store.names(
+            self.config_list_var.get(), limit=CONFIG_LIST_LIMIT
+        )
+        
     def save_last_used_config(self, config_name):
-        """保存最后使用的配置名称"""
-        try:
-            with open(self.last_config_file, 'w', encoding='utf-8') as f:
-                f.write(config_name)
-        except Exception as e:
-            print(f"保存最后使用配置失败: {str(e)}")
-            
+        """保存最后使用的配置名称（后台写入，连续切换配置只写最后一次）"""
+        self.last_used_config = config_name
+        self.config_worker.set_last_used(config_name)
+        self.schedule_config_poll()
+        
     def get_last_used_config(self):
         """获取最后使用的配置名称"""
-        try:
-            if os.path.exists(self.last_config_file):
-                with open(self.last_config_file, 'r', encoding='utf-8') as f:
-                    return f.read().strip()
-        except Exception as e:
-            print(f"读取最后使用配置失败: {str(e)}")
-        return None
+        return self.last_used_config
         
     def load_last_used_config_on_startup(self):
-        """启动时自动加载最后使用的配置"""
-        last_used = self.get_last_used_config()
-        if last_used:
+        """启动时自动加载最后使用的配置（在后台读取，读完后在 poll_config_worker 中应用）"""
+        self.config_worker.load_last_used()
+        self.schedule_config_poll()
+        
+    def schedule_config_poll(self):
+        """启动后台读写结果检查定时器（已经在运行时不重复启动）"""
+        if self.config_after_id is None:
+            self.config_after_id = self.root.after(CONFIG_POLL_INTERVAL_MS, self.poll_config_worker)
+            
+    def poll_config_worker(self):
+        """处理后台读写完成的结果，还有未完成的请求时继续检查"""
+        self.config_after_id = None
+        while True:
             try:
-                config_file = os.path.join(self.config_dir, f"{last_used}.json")
-                if os.path.exists(config_file):
-                    with open(config_file, 'r', encoding='utf-8') as f:
-                        config = json.load(f)
-                    self.apply_config(config)
-                    print(f"自动加载配置: {last_used}")
-            except Exception as e:
-                print(f"自动加载配置失败: {str(e)}")
+                kind, name, result, error = self.config_worker.results.get_nowait()
+            except queue.Empty:
+                break
+            self.handle_config_result(kind, name, result, error)
+            
+        if not self.config_worker.idle() or not self.config_worker.results.empty():
+            self.schedule_config_poll()
+            
+    def handle_config_result(self, kind, name, result, error):
+        """在界面线程中处理一个后台读写结果"""
+        if kind == "save":
+            if error is not None:
+                messagebox.showerror("错误", f"保存配置失败: {str(error)}")
+                return
+            messagebox.showinfo("成功", f"配置 '{name}' 保存成功")
+            self.refresh_config_list()
+        elif kind == "last_used":
+            if error is not None:
+                print(f"保存最后使用配置失败: {str(error)}")
+        elif kind == "load_last_used":
+            if error is not None:
+                print(f"自动加载配置失败: {str(error)}")
+                return
+            if result is None:
+                return
+            last_used, config = result
+            self.last_used_config = last_used
+            if self.is_running:
+                return
+            self.apply_config(config)
+            self.config_list_var.set(last_used)
+            print(f"自动加载配置: {last_used}")
 
 
 def main():
     """主函数"""
+    # 启动耗时分析：以分析模式重新启动自身并输出报告
+    if len(sys.argv) > 1 and sys.argv[1] == "--profile-startup":
+        output = sys.argv[2] if len(sys.argv) > 2 else None
+        profile_startup(os.path.abspath(__file__), output)
+        return
+        
     try:
-        app = AutoClicker()
+        startup_marks = StartupMarks(STARTUP_BEGIN) if is_profiling() else None
+        app = AutoClicker(startup_marks)
         app.run()
     except KeyboardInterrupt:
         print("程序被用户中断")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+截屏基准测试
+连续截取指定区域，统计每帧耗时和可达到的帧率（需要显示器，Linux 上可在 Xvfb 中运行）
+
+用法: python bench_capture.py [--areas "100,100,400,300"] [--frames 300] [--capture xshm]
+"""
+
+import argparse
+import json
+import platform
+import sys
+from datetime import datetime
+
+from clicker_cli import parse_areas
+from screen_capture import CAPTURES, create_capture
+
+
+def run_capture(name, areas, frames):
+    """用一种截屏方式连续截取 frames 帧，返回统计结果"""
+    capture = create_capture(areas, name)
+    try:
+        for _ in range(frames):
+            capture.tick()
+            for area in areas:
+                capture.grab(area)
+        return capture.stats()
+    finally:
+        capture.close()
+
+
+def main(argv=None):
+    """基准测试入口"""
+    parser = argparse.ArgumentParser(description="截屏基准测试")
+    parser.add_argument("--areas", default="100,100,419,339",
+                        help='截取的区域，格式同命令行模式的 --areas（只截取它们的外接矩形）')
+    parser.add_argument("--frames", type=int, default=300, help="每种截屏方式截取的帧数")
+    parser.add_argument("--capture", choices=list(CAPTURES), action="append",
+                        help="只测试指定的截屏方式（可重复），默认测试全部")
+    parser.add_argument("--output", help="将结果保存为 JSON 文件")
+    args = parser.parse_args(argv)
+
+    areas, _ = parse_areas(args.areas)
+    results = {
+        "created_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "areas": areas,
+        "frames": args.frames,
+        "captures": {},
+    }
+    for name in args.capture or CAPTURES:
+        try:
+            result = run_capture(name, areas, args.frames)
+        except Exception as e:
+            print(f"{name:<10} 不可用: {e}", file=sys.stderr)
+            continue
+        results["captures"][name] = result
+        print(
+            f"{name:<10} 平均 {result['mean_capture_ms']:.2f}ms/帧 "
+            f"最大 {result['max_capture_ms']:.2f}ms  "
+            f"{result['achieved_rate']:.1f} 帧/秒",
+            file=sys.stderr,
+        )
+
+    output = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
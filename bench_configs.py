@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+配置存储基准测试
+在临时目录中生成不同数量的配置，统计首次扫描、列出（前缀筛选）和切换配置的耗时
+（切换分为冷加载：读取并解析没有缓存的配置，和缓存命中：配置文件未修改时直接返回缓存）
+
+用法: python bench_configs.py [--counts 10 1000 10000] [--output bench.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from config_store import ConfigStore
+
+# 生成的配置内容（与保存的配置文件格式相同）
+SAMPLE_CONFIG = {
+    "area_count": "1",
+    "min_area_interval": "0.3", "max_area_interval": "0.7",
+    "min_time": "1.0", "max_time": "3.0",
+    "min_clicks": "1", "max_clicks": "3",
+    "min_click_interval": "0.05", "max_click_interval": "0.2",
+    "no_offset_probability": "0.67", "x_offset": "10", "y_offset": "10",
+    "duration_limit": False, "duration": "60", "unlimited_duration": True,
+    "count_limit": False, "max_total_clicks": "100", "unlimited_count": False,
+}
+
+# 列出/切换的重复次数
+REPEAT = 200
+
+
+def make_configs(config_dir, count):
+    """生成 count 个配置文件，并把文件和目录的修改时间设为较早的时间"""
+    old = time.time_ns() - 60_000_000_000
+    for i in range(count):
+        path = os.path.join(config_dir, f"profile_{i:05d}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(SAMPLE_CONFIG, f)
+        os.utime(path, ns=(old, old))
+    os.utime(config_dir, ns=(old, old))
+
+
+def timed_ms(function, repeat=1):
+    """平均每次调用的耗时（毫秒）"""
+    begin = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - begin) / repeat * 1000
+
+
+def cold_load_ms(store, count):
+    """切换到没有缓存的配置的平均耗时（毫秒）：每次加载分布在目录中的不同配置"""
+    total = 0
+    for i in range(REPEAT):
+        name = f"profile_{i * count // REPEAT % count:05d}"
+        # 配置少于重复次数时会重复加载同一个配置，每次加载前清空缓存
+        store.cache.clear()
+        begin = time.perf_counter()
+        store.load(name)
+        total += time.perf_counter() - begin
+    return total / REPEAT * 1000
+
+
+def run_count(count):
+    """生成 count 个配置并返回各操作的耗时"""
+    with tempfile.TemporaryDirectory() as config_dir:
+        make_configs(config_dir, count)
+        store = ConfigStore(config_dir)
+        names = []
+
+        scan_ms = timed_ms(store.refresh)
+        list_ms = timed_ms(lambda: names.extend(store.names("profile_0", limit=200)), REPEAT)
+        switch_ms = cold_load_ms(store, count)
+        middle = f"profile_{count // 2:05d}"
+        store.load(middle)
+        cached_switch_ms = timed_ms(lambda: store.load(middle), REPEAT)
+
+        return {
+            "configs": count,
+            "first_scan_ms": round(scan_ms, 4),
+            "list_ms": round(list_ms, 4),
+            "switch_ms": round(switch_ms, 4),
+            "cached_switch_ms": round(cached_switch_ms, 4),
+        }
+
+
+def main(argv=None):
+    """基准测试入口"""
+    parser = argparse.ArgumentParser(description="配置存储基准测试")
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 1000, 10000], help="配置数量")
+    parser.add_argument("--output", help="将结果保存为 JSON 文件")
+    args = parser.parse_args(argv)
+
+    results = {
+        "created_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": [],
+    }
+    for count in args.counts:
+        result = run_count(count)
+        results["results"].append(result)
+        print(
+            f"{count:>6} 个配置  首次扫描 {result['first_scan_ms']:.2f}ms  "
+            f"列出 {result['list_ms']:.3f}ms  切换 {result['switch_ms']:.3f}ms "
+            f"(缓存命中 {result['cached_switch_ms']:.3f}ms)",
+            file=sys.stderr,
+        )
+
+    output = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
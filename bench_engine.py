@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+点击引擎基准测试
+使用记录后端（不实际点击）运行点击引擎，统计吞吐量、间隔误差和每次点击的CPU耗时，
+以及长间隔等待中请求停止到点击线程实际结束的延迟。
+--precise-wait-ms 可重复指定，对比截止时间前短等待窗口的大小对间隔误差和CPU耗时的影响
+
+用法: python bench_engine.py [--clicks 2000] [--scenario single] [--precise-wait-ms 0.5] [--stop-trials 20]
+                             [--output bench.json]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+from click_engine import RunPlan, ClickEngine, ClickSchedule, DeadlineScheduler, PRECISE_WAIT_NS
+from input_backends import RecordingBackend
+
+# 基准场景：与保存的配置文件格式相同（不含区域坐标）
+SCENARIOS = {
+    # 单区域，常规连续点击
+    "single": {
+        "areas": 1,
+        "min_area_interval": "0", "max_area_interval": "0",
+        "min_time": "0.005", "max_time": "0.015",
+        "min_clicks": "1", "max_clicks": "3",
+        "min_click_interval": "0.002", "max_click_interval": "0.01",
+    },
+    # 多区域轮流点击
+    "many_areas": {
+        "areas": 50,
+        "min_area_interval": "0.001", "max_area_interval": "0.003",
+        "min_time": "0.01", "max_time": "0.02",
+        "min_clicks": "1", "max_clicks": "2",
+        "min_click_interval": "0.002", "max_click_interval": "0.005",
+    },
+    # 大量区域按权重随机选择，位置按截断高斯分布（区域选择和位置采样都按块批量进行）
+    "weighted_1000": {
+        "areas": 1000,
+        "min_area_interval": "0.001", "max_area_interval": "0.003",
+        "min_time": "0.01", "max_time": "0.02",
+        "min_clicks": "1", "max_clicks": "2",
+        "min_click_interval": "0.002", "max_click_interval": "0.005",
+        "area_order": "weighted", "click_distribution": "gaussian",
+    },
+    # 高频连击
+    "burst": {
+        "areas": 2,
+        "min_area_interval": "0.005", "max_area_interval": "0.01",
+        "min_time": "0.05", "max_time": "0.05",
+        "min_clicks": "20", "max_clicks": "50",
+        "min_click_interval": "0.001", "max_click_interval": "0.002",
+    },
+}
+
+# 停止延迟测试：区域间隔和循环间隔都是数秒，停止请求几乎总是落在等待中
+STOP_SCENARIO = {
+    "min_area_interval": "1", "max_area_interval": "3",
+    "min_time": "5", "max_time": "8",
+    "min_clicks": "1", "max_clicks": "3",
+    "min_click_interval": "0.1", "max_click_interval": "0.3",
+}
+
+# 各场景共用的配置项
+BASE_CONFIG = {
+    "no_offset_probability": "0.67",
+    "x_offset": "10",
+    "y_offset": "10",
+    "duration_limit": False,
+    "unlimited_duration": False,
+    "count_limit": True,
+    "unlimited_count": False,
+    "input_backend": RecordingBackend.name,
+}
+
+
+def build_plan(scenario, clicks, seed):
+    """根据场景生成运行参数，区域在屏幕上横向排列"""
+    settings = dict(SCENARIOS[scenario])
+    area_count = settings.pop("areas")
+    areas = [(i * 20, 100, i * 20 + 15, 130) for i in range(area_count)]
+    config = dict(BASE_CONFIG, **settings)
+    config["max_total_clicks"] = clicks
+    config["seed"] = seed
+    return RunPlan.from_config(config, areas)
+
+
+def percentiles_ms(values_ns):
+    """返回 p50/p99/max（毫秒）"""
+    if len(values_ns) == 0:
+        return {"p50": 0.0, "p99": 0.0, "max": 0.0}
+    p50, p99 = np.percentile(values_ns, [50, 99]) / 1_000_000
+    return {
+        "p50": round(float(p50), 4),
+        "p99": round(float(p99), 4),
+        "max": round(float(np.max(values_ns)) / 1_000_000, 4),
+    }
+
+
+def run_scenario(scenario, clicks, seed, precise_wait_ns=PRECISE_WAIT_NS):
+    """运行一个场景并返回统计结果"""
+    plan = build_plan(scenario, clicks, seed)
+    backend = RecordingBackend(record=True)
+    engine = ClickEngine(plan, backend, scheduler=DeadlineScheduler(precise_wait_ns=precise_wait_ns))
+
+    cpu_begin = time.process_time()
+    wall_begin = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine.run()
+    wall = time.perf_counter() - wall_begin
+    cpu = time.process_time() - cpu_begin
+
+    # 相同种子重新生成点击计划，得到每次点击之后计划的等待时间
+    times = np.frombuffer(backend.times, dtype=np.int64)
+    count = len(times)
+    expected = ClickSchedule(plan)
+    delays = np.array([expected.next_event()[2] for _ in range(count)])
+
+    # 间隔误差：实际相邻点击间隔 - 计划间隔
+    actual_ns = np.diff(times)
+    planned_ns = (delays[:-1] * 1_000_000_000).astype(np.int64)
+    error_ns = np.abs(actual_ns - planned_ns)
+    planned_total = float(delays[:-1].sum())
+
+    return {
+        "areas": len(plan.areas),
+        "precise_wait_ms": precise_wait_ns / 1_000_000,
+        "clicks": count,
+        "elapsed_s": round(wall, 4),
+        "clicks_per_sec": round(count / wall, 2) if wall else 0.0,
+        "planned_clicks_per_sec": round((count - 1) / planned_total, 2) if planned_total else 0.0,
+        "interval_error_ms": percentiles_ms(error_ns),
+        "cpu_us_per_click": round(cpu / count * 1_000_000, 2) if count else 0.0,
+    }
+
+
+def run_stop_latency(trials, seed):
+    """在运行中的随机时刻请求停止，返回从请求停止到点击线程结束的延迟统计"""
+    rng = np.random.default_rng(seed)
+    config = dict(BASE_CONFIG, **STOP_SCENARIO)
+    config["count_limit"] = False
+    config["unlimited_count"] = True
+    config["seed"] = seed
+    plan = RunPlan.from_config(config, [(0, 100, 15, 130), (20, 100, 35, 130)])
+    latencies = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(trials):
+            engine = ClickEngine(plan, RecordingBackend(record=False))
+            engine.start()
+            time.sleep(rng.uniform(0.05, 0.3))
+            engine.stop()
+            engine.join()
+            latencies.append(engine.stop_latency_ns)
+    return {"trials": trials, "stop_latency_ms": percentiles_ms(np.array(latencies))}
+
+
+def main(argv=None):
+    """基准测试入口"""
+    parser = argparse.ArgumentParser(description="点击引擎基准测试")
+    parser.add_argument("--clicks", type=int, default=2000, help="每个场景的点击次数")
+    parser.add_argument("--scenario", choices=list(SCENARIOS), action="append",
+                        help="只运行指定场景（可重复），默认运行全部")
+    parser.add_argument("--precise-wait-ms", type=float, action="append",
+                        help=f"截止时间前短等待的窗口（毫秒，可重复），默认 {PRECISE_WAIT_NS / 1_000_000:g}")
+    parser.add_argument("--stop-trials", type=int, default=20, help="停止延迟测试的次数（0 表示不测试）")
+    parser.add_argument("--seed", type=int, default=12345, help="随机种子")
+    parser.add_argument("--output", help="将结果保存为 JSON 文件")
+    args = parser.parse_args(argv)
+
+    results = {
+        "created_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "clicks": args.clicks,
+        "seed": args.seed,
+        "scenarios": {},
+    }
+    windows = args.precise_wait_ms or [PRECISE_WAIT_NS / 1_000_000]
+    for scenario in args.scenario or SCENARIOS:
+        for window in windows:
+            # 对比多个窗口时结果按 "场景@窗口" 保存
+            name = scenario if len(windows) == 1 else f"{scenario}@{window:g}ms"
+            result = run_scenario(scenario, args.clicks, args.seed, int(window * 1_000_000))
+            results["scenarios"][name] = result
+            error = result["interval_error_ms"]
+            print(
+                f"{name:<12} {result['clicks_per_sec']:>9.1f} 次/秒 "
+                f"(计划 {result['planned_clicks_per_sec']:.1f})  "
+                f"间隔误差 p50 {error['p50']:.3f}ms p99 {error['p99']:.3f}ms max {error['max']:.3f}ms  "
+                f"CPU {result['cpu_us_per_click']:.1f}us/次",
+                file=sys.stderr,
+            )
+    if args.stop_trials:
+        result = run_stop_latency(args.stop_trials, args.seed)
+        results["stop"] = result
+        latency = result["stop_latency_ms"]
+        print(
+            f"停止延迟 ({result['trials']} 次)  p50 {latency['p50']:.3f}ms "
+            f"p99 {latency['p99']:.3f}ms max {latency['max']:.3f}ms",
+            file=sys.stderr,
+        )
+
+    output = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
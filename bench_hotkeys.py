@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+全局快捷键基准测试
+用 XTest 模拟按下紧急停止快捷键，统计从按键到监听回调、以及到点击线程实际结束的延迟
+（需要 X11 显示，可在 Xvfb 中运行）
+
+用法: python bench_hotkeys.py [--trials 20] [--key Escape] [--output bench.json]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+from click_engine import RunPlan, ClickEngine
+from global_hotkeys import HotkeyListener, parse_hotkey
+from input_backends import RecordingBackend
+
+# 点击线程在数秒的区域/循环间隔中等待时按下快捷键
+ENGINE_CONFIG = {
+    "min_area_interval": "1", "max_area_interval": "3",
+    "min_time": "5", "max_time": "8",
+    "min_clicks": "1", "max_clicks": "3",
+    "min_click_interval": "0.1", "max_click_interval": "0.3",
+    "input_backend": RecordingBackend.name,
+}
+
+
+def percentiles_ms(values_ns):
+    """返回 p50/p99/max（毫秒）"""
+    p50, p99 = np.percentile(values_ns, [50, 99]) / 1_000_000
+    return {"p50": round(float(p50), 4), "p99": round(float(p99), 4),
+            "max": round(float(np.max(values_ns)) / 1_000_000, 4)}
+
+
+def press(display, keycodes, xtest, X):
+    """用 XTest 按下并松开组合键（keycodes 最后一个为主键）"""
+    for keycode in keycodes:
+        xtest.fake_input(display, X.KeyPress, keycode)
+    for keycode in reversed(keycodes):
+        xtest.fake_input(display, X.KeyRelease, keycode)
+    display.sync()
+
+
+def main(argv=None):
+    """基准测试入口"""
+    parser = argparse.ArgumentParser(description="全局快捷键基准测试")
+    parser.add_argument("--trials", type=int, default=20, help="测试次数")
+    parser.add_argument("--key", default="Escape", help="测试的组合键（如 Escape、Ctrl+Alt+1）")
+    parser.add_argument("--output", help="将结果保存为 JSON 文件")
+    args = parser.parse_args(argv)
+
+    from Xlib import X, XK, display
+    from Xlib.ext import xtest
+
+    # 组合键对应的键码（修饰键 + 主键）
+    sender = display.Display()
+    mask, name = parse_hotkey(args.key)
+    modifier_keycodes = []
+    for index, keycodes in enumerate(sender.get_modifier_mapping()):
+        if mask & (1 << index):
+            modifier_keycodes.append(next(keycode for keycode in keycodes if keycode))
+    keycodes = modifier_keycodes + [sender.keysym_to_keycode(XK.string_to_keysym(name))]
+
+    fired = threading.Event()
+    fired_ns = [0]
+    engine_holder = [None]
+
+    def on_hotkey(action):
+        fired_ns[0] = time.monotonic_ns()
+        engine = engine_holder[0]
+        if engine is not None:
+            engine.stop()
+        fired.set()
+
+    listener = HotkeyListener({"stop": args.key}, on_hotkey)
+    listener.start()
+    time.sleep(0.2)  # 等监听上下文生效
+
+    config = dict(ENGINE_CONFIG, unlimited_duration=True, unlimited_count=True)
+    plan = RunPlan.from_config(config, [(0, 100, 15, 130), (20, 100, 35, 130)])
+    callback_ns = []
+    stop_ns = []
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(args.trials):
+                engine = ClickEngine(plan, RecordingBackend(record=False))
+                engine_holder[0] = engine
+                engine.start()
+                time.sleep(0.1)
+                fired.clear()
+                begin = time.monotonic_ns()
+                press(sender, keycodes, xtest, X)
+                if not fired.wait(2.0):
+                    raise RuntimeError("没有收到快捷键事件")
+                engine.join()
+                callback_ns.append(fired_ns[0] - begin)
+                stop_ns.append(fired_ns[0] - begin + engine.stop_latency_ns)
+                engine_holder[0] = None
+    finally:
+        listener.stop()
+        sender.close()
+
+    results = {
+        "created_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "key": args.key,
+        "trials": args.trials,
+        "callback_ms": percentiles_ms(callback_ns),
+        "engine_stopped_ms": percentiles_ms(stop_ns),
+    }
+    print(
+        f"按键到回调 p50 {results['callback_ms']['p50']:.3f}ms max {results['callback_ms']['max']:.3f}ms  "
+        f"按键到点击线程结束 p50 {results['engine_stopped_ms']['p50']:.3f}ms "
+        f"max {results['engine_stopped_ms']['max']:.3f}ms",
+        file=sys.stderr,
+    )
+
+    output = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+宏文件基准测试
+生成不同时长的合成录制（固定点击频率），统计文件大小、写入和读取耗时、
+内存映射打开和按时间定位的耗时，
+并用空后端回放一小段，统计相对截止时间的延迟（不需要显示器）
+
+用法: python bench_macro.py [--hours 1 24] [--rate 10] [--replay 500] [--output bench.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+from input_backends import RecordingBackend
+from macro import MacroWriter, MacroPlayer, MacroReader, load_macro, event_dtype
+
+
+def synthetic_events(count, rate, rng):
+    """生成 count 个事件：平均每秒 rate 次点击，时间间隔服从指数分布"""
+    events = np.zeros(count, dtype=event_dtype())
+    events["t"] = np.cumsum(rng.exponential(1_000_000_000 / rate, size=count)).astype(np.int64)
+    events["x"] = rng.integers(0, 1920, size=count)
+    events["y"] = rng.integers(0, 1080, size=count)
+    events["button"] = 1
+    return events
+
+
+def write_events(path, events):
+    """用录制时的写入器逐个写入事件，返回耗时（秒）"""
+    begin = time.perf_counter()
+    writer = MacroWriter(path)
+    start_ns = writer.start_ns
+    for t, x, y, button in zip(events["t"].tolist(), events["x"].tolist(),
+                               events["y"].tolist(), events["button"].tolist()):
+        writer.add(start_ns + t, x, y, button)
+    writer.close()
+    return time.perf_counter() - begin
+
+
+def run_hours(hours, rate, rng):
+    """生成 hours 小时的录制并返回文件大小和读写耗时"""
+    count = int(hours * 3600 * rate)
+    events = synthetic_events(count, rate, rng)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.macro")
+        write_s = write_events(path, events)
+        size = os.path.getsize(path)
+        begin = time.perf_counter()
+        loaded = load_macro(path)
+        load_ms = (time.perf_counter() - begin) * 1000
+        assert len(loaded) == count and np.array_equal(loaded["t"], events["t"])
+        del loaded
+
+        # 内存映射打开（不读取事件）和按时间定位到中间
+        begin = time.perf_counter()
+        reader = MacroReader(path)
+        open_ms = (time.perf_counter() - begin) * 1000
+        middle = int(events["t"][count // 2]) if count else 0
+        begin = time.perf_counter()
+        index = reader.find_time(middle)
+        seek_ms = (time.perf_counter() - begin) * 1000
+        assert not count or events["t"][index] == middle
+        reader.close()
+    return {
+        "hours": hours,
+        "events": count,
+        "file_mb": round(size / 1_000_000, 3),
+        "record_us_per_event": round(write_s / max(count, 1) * 1_000_000, 3),
+        "load_ms": round(load_ms, 3),
+        "mmap_open_ms": round(open_ms, 3),
+        "seek_ms": round(seek_ms, 3),
+    }
+
+
+def run_replay(count, rng):
+    """用空后端回放 count 个间隔约 2ms 的事件，返回延迟统计"""
+    events = synthetic_events(count, 500, rng)
+    backend = RecordingBackend(record=False)
+    player = MacroPlayer(events, backend)
+    player.run()
+    return {
+        "events": count,
+        "lateness_ms": player.metrics.lateness.percentiles_ms(),
+        "max_lateness_ms": player.metrics.lateness.max / 1_000_000,
+    }
+
+
+def main(argv=None):
+    """基准测试入口"""
+    parser = argparse.ArgumentParser(description="宏文件基准测试")
+    parser.add_argument("--hours", type=float, nargs="+", default=[1, 24], help="录制时长（小时）")
+    parser.add_argument("--rate", type=float, default=10, help="平均每秒点击次数")
+    parser.add_argument("--replay", type=int, default=500, help="回放测试的事件数（0 表示不测试）")
+    parser.add_argument("--seed", type=int, default=12345, help="随机种子")
+    parser.add_argument("--output", help="将结果保存为 JSON 文件")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    results = {
+        "created_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "rate": args.rate,
+        "files": [],
+    }
+    for hours in args.hours:
+        result = run_hours(hours, args.rate, rng)
+        results["files"].append(result)
+        print(
+            f"{hours:g} 小时 {result['events']} 次点击  文件 {result['file_mb']:.2f}MB  "
+            f"录制 {result['record_us_per_event']:.2f}us/次  读取 {result['load_ms']:.2f}ms  "
+            f"映射 {result['mmap_open_ms']:.3f}ms  定位 {result['seek_ms']:.3f}ms",
+            file=sys.stderr,
+        )
+    if args.replay:
+        result = run_replay(args.replay, rng)
+        results["replay"] = result
+        lateness = result["lateness_ms"]
+        print(
+            f"回放 {result['events']} 次点击  延迟 p50 {lateness['p50']:.3f}ms "
+            f"p99 {lateness['p99']:.3f}ms max {result['max_lateness_ms']:.3f}ms",
+            file=sys.stderr,
+        )
+
+    output = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+区域选择器绘制基准测试
+在常见分辨率的画布上模拟拖动选择，统计每次鼠标移动的绘制耗时，
+对比旧的"删除后重建"方式和现在的"更新坐标"方式（需要图形显示环境，可在 Xvfb 下运行）
+
+用法: python bench_selector.py [--events 300] [--output selector.json]
+"""
+
+import argparse
+import json
+import sys
+import time
+import tkinter as tk
+
+from auto_clicker import AreaSelector
+
+# 常见分辨率
+RESOLUTIONS = [(1920, 1080), (2560, 1440), (3840, 2160)]
+
+
+class MotionEvent:
+    """模拟的鼠标事件"""
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+def legacy_update(canvas, start_x, start_y, x, y):
+    """旧的绘制方式：每次移动都删除并重新创建选择框"""
+    canvas.delete("selection")
+    canvas.create_rectangle(start_x, start_y, x, y, outline="red", width=4, tags="selection")
+    canvas.create_rectangle(start_x, start_y, x, y, outline="white", width=2, tags="selection")
+    info_x = (start_x + x) // 2
+    info_y = min(start_y, y) - 10
+    if info_y < 20:
+        info_y = max(start_y, y) + 20
+    canvas.create_rectangle(
+        info_x - 80, info_y - 10, info_x + 80, info_y + 10,
+        fill="black", outline="yellow", width=1, tags="selection"
+    )
+    canvas.create_text(
+        info_x, info_y, text=f"区域大小: {abs(x - start_x)} × {abs(y - start_y)} 像素",
+        fill="yellow", font=("Arial", 10, "bold"), tags="selection"
+    )
+
+
+def drag_path(width, height, events):
+    """从左上到右下的拖动轨迹"""
+    for i in range(events):
+        yield MotionEvent(100 + (width - 200) * i // events, 100 + (height - 200) * i // events)
+
+
+def frame_stats_ms(samples):
+    """返回平均值、p95 和最大值（毫秒）"""
+    samples = sorted(samples)
+    return {
+        "mean": round(sum(samples) / len(samples) * 1000, 4),
+        "p95": round(samples[int(len(samples) * 0.95)] * 1000, 4),
+        "max": round(samples[-1] * 1000, 4),
+    }
+
+
+def bench_resolution(root, width, height, events):
+    """在一种分辨率下分别测试两种绘制方式"""
+    results = {}
+    for mode in ("legacy", "retained"):
+        selector = AreaSelector(lambda areas: None)
+        selector.root = tk.Toplevel(root)
+        selector.root.geometry(f"{width}x{height}+0+0")
+        # 与真实截图同尺寸的背景图，重绘时同样需要合成
+        background = tk.PhotoImage(width=width, height=height)
+        selector.create_canvas(width, height, background)
+        selector.root.update()
+        selector.start_selection(MotionEvent(100, 100))
+
+        samples = []
+        for event in drag_path(width, height, events):
+            begin = time.perf_counter()
+            if mode == "legacy":
+                legacy_update(selector.canvas, selector.start_x, selector.start_y, event.x, event.y)
+            else:
+                # 每次都立即绘制：取消 update_selection 安排的定时绘制，
+                # 否则每次都会留下一个定时器，关闭选择器后在已销毁的画布上触发
+                selector.update_selection(event)
+                selector.canvas.after_cancel(selector.render_after_id)
+                selector.render_selection()
+            selector.canvas.update_idletasks()
+            samples.append(time.perf_counter() - begin)
+
+        selector.close_selector()
+        results[mode] = frame_stats_ms(samples)
+    return results
+
+
+def main(argv=None):
+    """基准测试入口"""
+    parser = argparse.ArgumentParser(description="区域选择器绘制基准测试")
+    parser.add_argument("--events", type=int, default=300, help="每种分辨率模拟的鼠标移动次数")
+    parser.add_argument("--output", help="将结果保存为 JSON 文件")
+    args = parser.parse_args(argv)
+
+    root = tk.Tk()
+    root.withdraw()
+    results = {}
+    for width, height in RESOLUTIONS:
+        name = f"{width}x{height}"
+        results[name] = bench_resolution(root, width, height, args.events)
+        legacy, retained = results[name]["legacy"], results[name]["retained"]
+        print(
+            f"{name:<10} 删除重建 平均 {legacy['mean']:.3f}ms p95 {legacy['p95']:.3f}ms  "
+            f"更新坐标 平均 {retained['mean']:.3f}ms p95 {retained['p95']:.3f}ms",
+            file=sys.stderr,
+        )
+    root.destroy()
+
+    output = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+模板匹配基准测试
+在合成的界面截图中查找模板，统计每次定位的耗时和定位正确率
+（不需要显示器，截图和模板由随机色块和噪声生成）
+
+用法: python bench_template.py [--trials 50] [--output bench.json]
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+from template_match import TemplateMatcher, MAX_SEARCH_PIXELS, PYRAMID_LEVELS
+
+# 基准场景：搜索区域尺寸 (宽, 高) 与模板尺寸 (宽, 高)
+SCENARIOS = {
+    "button_small": {"region": (400, 300), "template": (64, 32)},
+    "button_wide": {"region": (800, 600), "template": (160, 48)},
+    "icon_1080p": {"region": (1920, 1080), "template": (48, 48)},
+}
+
+
+def synthetic_screen(width, height, rng):
+    """生成类似界面的截图：纯色背景上的随机色块"""
+    screen = np.empty((height, width, 3), dtype=np.uint8)
+    screen[:] = rng.integers(200, 256, size=3)
+    for _ in range(width * height // 4000):
+        w = int(rng.integers(10, 120))
+        h = int(rng.integers(8, 60))
+        x = int(rng.integers(0, width - w))
+        y = int(rng.integers(0, height - h))
+        screen[y:y + h, x:x + w] = rng.integers(0, 256, size=3)
+    return screen
+
+
+def synthetic_icon(width, height, rng):
+    """生成模板图像（按钮/图标）：渐变底色上的几个色块"""
+    gradient = np.linspace(0, 60, width, dtype=np.float32)
+    icon = np.empty((height, width, 3), dtype=np.float32)
+    icon[:] = rng.integers(0, 196, size=3)
+    icon += gradient[None, :, None]
+    for _ in range(4):
+        w = int(rng.integers(2, max(3, width // 2)))
+        h = int(rng.integers(2, max(3, height // 2)))
+        x = int(rng.integers(0, width - w))
+        y = int(rng.integers(0, height - h))
+        icon[y:y + h, x:x + w] = rng.integers(0, 256, size=3)
+    return icon.astype(np.uint8)
+
+
+def add_noise(image, rng):
+    """添加少量噪声（模拟抗锯齿、压缩等造成的细微差异）"""
+    noise = rng.integers(-6, 7, size=image.shape)
+    return np.clip(image.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+
+
+def run_scenario(scenario, trials, seed, levels):
+    """运行一个场景并返回统计结果"""
+    settings = SCENARIOS[scenario]
+    width, height = settings["region"]
+    template_width, template_height = settings["template"]
+    rng = np.random.default_rng(seed)
+    background = synthetic_screen(width, height, rng)
+
+    build_ns = []
+    locate_ns = []
+    hits = 0
+    for _ in range(trials):
+        # 模板放在截图中的随机位置，匹配器创建一次（金字塔缓存）后定位
+        template = synthetic_icon(template_width, template_height, rng)
+        x = int(rng.integers(0, width - template_width + 1))
+        y = int(rng.integers(0, height - template_height + 1))
+        screen = background.copy()
+        screen[y:y + template_height, x:x + template_width] = template
+        screen = add_noise(screen, rng)
+
+        begin = time.perf_counter_ns()
+        matcher = TemplateMatcher(template, threshold=0.0, levels=levels)
+        build_ns.append(time.perf_counter_ns() - begin)
+
+        begin = time.perf_counter_ns()
+        found = matcher.locate(screen)
+        locate_ns.append(time.perf_counter_ns() - begin)
+        if found is not None and found[:2] == (x, y):
+            hits += 1
+
+    locate_ms = np.array(locate_ns) / 1_000_000
+    return {
+        "region": [width, height],
+        "template": [template_width, template_height],
+        "levels": matcher.levels,
+        # 搜索范围是否在建议的大小以内（超出时运行中会打印警告）
+        "within_supported_size": width * height <= MAX_SEARCH_PIXELS,
+        "trials": trials,
+        "hit_rate": round(hits / trials, 4),
+        "build_ms": round(float(np.median(build_ns)) / 1_000_000, 4),
+        "locate_ms": {
+            "p50": round(float(np.percentile(locate_ms, 50)), 4),
+            "p95": round(float(np.percentile(locate_ms, 95)), 4),
+            "max": round(float(locate_ms.max()), 4),
+        },
+    }
+
+
+def main(argv=None):
+    """基准测试入口"""
+    parser = argparse.ArgumentParser(description="模板匹配基准测试")
+    parser.add_argument("--trials", type=int, default=50, help="每个场景的定位次数")
+    parser.add_argument("--scenario", choices=list(SCENARIOS), action="append",
+                        help="只运行指定场景（可重复），默认运行全部")
+    parser.add_argument("--levels", type=int, default=PYRAMID_LEVELS,
+                        help="金字塔层数（1 表示不缩小，直接在原图上全图搜索）")
+    parser.add_argument("--seed", type=int, default=12345, help="随机种子")
+    parser.add_argument("--output", help="将结果保存为 JSON 文件")
+    args = parser.parse_args(argv)
+
+    results = {
+        "created_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "trials": args.trials,
+        "seed": args.seed,
+        "scenarios": {},
+    }
+    for scenario in args.scenario or SCENARIOS:
+        result = run_scenario(scenario, args.trials, args.seed, args.levels)
+        results["scenarios"][scenario] = result
+        locate = result["locate_ms"]
+        print(
+            f"{scenario:<14} 区域 {result['region'][0]}x{result['region'][1]} "
+            f"模板 {result['template'][0]}x{result['template'][1]} ({result['levels']}层)  "
+            f"定位 p50 {locate['p50']:.2f}ms p95 {locate['p95']:.2f}ms max {locate['max']:.2f}ms  "
+            f"正确率 {result['hit_rate'] * 100:.0f}%"
+            f"{'' if result['within_supported_size'] else '  (超出建议的搜索范围)'}",
+            file=sys.stderr,
+        )
+
+    output = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+区域变化检测
+只截取区域本身，缩小为小的灰度网格后与参考帧比较，判断区域内容是否发生变化
+"""
+
+import numpy as np
+
+from template_match import shrink
+
+# 比较用灰度网格的最大边长（区域按块平均缩小到不超过该尺寸）
+GRID_SIZE = 32
+
+# 网格单元灰度差超过该值（0-255）才算变化，过滤噪声和抗锯齿的细微差异
+CELL_TOLERANCE = 12
+
+
+class ChangeDetector:
+    """单个区域的变化检测器
+
+    第一次检测时记录参考帧，之后每次检测截取区域并与参考帧比较，发生变化的网格单元
+    比例达到阈值时返回 True，并清除参考帧（下一次等待重新记录）。
+    capture 只截取这个区域本身（不与其他区域共用），每次检测截取一帧。
+    """
+
+    def __init__(self, rect, threshold, capture):
+        self.rect = rect
+        self.threshold = threshold
+        self.capture = capture
+        x1, y1, x2, y2 = rect
+        self.factor = max(1, -(-max(x2 - x1 + 1, y2 - y1 + 1) // GRID_SIZE))
+        self.reference = None
+
+    def fingerprint(self):
+        """截取区域的新一帧，并缩小为灰度网格"""
+        self.capture.tick()
+        return shrink(np.asarray(self.capture.grab(self.rect))[..., :3], self.factor)
+
+    def changed_fraction(self, current):
+        """与参考帧相比发生变化的网格单元比例"""
+        return float(np.count_nonzero(np.abs(current - self.reference) > CELL_TOLERANCE)) / current.size
+
+    def poll(self):
+        """检测一次，区域内容已变化时返回 True"""
+        current = self.fingerprint()
+        if self.reference is None:
+            self.reference = current
+            return False
+        if self.changed_fraction(current) >= self.threshold:
+            self.reference = None
+            return True
+        return False
+
+    def reset(self):
+        """放弃当前的等待（下一次检测重新记录参考帧）"""
+        self.reference = None
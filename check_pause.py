@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+暂停/继续检查
+用虚拟时钟运行点击引擎，在一次等待中暂停，并在点击线程醒来之前就继续，
+检查被打断的间隔正好顺延暂停的时长（只等剩余的时间），其余间隔与计划完全相同。
+不需要显示器，几乎不耗时；全部通过时返回 0，否则返回 1
+
+用法: python check_pause.py [--seed 12345]
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+
+import numpy as np
+
+from click_engine import RunPlan, ClickEngine, ClickSchedule
+from simulator import SimulatedBackend, VirtualClock, VirtualScheduler
+
+# 在第几次点击之后的等待中暂停
+PAUSE_WAIT = 5
+
+# 暂停的时长（纳秒）：短于和长于剩余的等待时间各一次
+PAUSE_NS = (500_000, 300_000_000)
+
+# 单区域、只点击少量次数（单区域时每次点击之后正好一次等待）
+CHECK_CONFIG = {
+    "min_area_interval": "0", "max_area_interval": "0",
+    "min_time": "0.005", "max_time": "0.015",
+    "min_clicks": "1", "max_clicks": "3",
+    "min_click_interval": "0.002", "max_click_interval": "0.01",
+    "no_offset_probability": "0.67", "x_offset": "10", "y_offset": "10",
+    "duration_limit": False, "unlimited_duration": False,
+    "count_limit": True, "unlimited_count": False,
+    "max_total_clicks": PAUSE_WAIT * 4,
+    "input_backend": "null",
+}
+
+
+class QuickPauseScheduler(VirtualScheduler):
+    """第 pause_at 次等待进行到一半时暂停，并在点击线程醒来之前就继续"""
+
+    def __init__(self, clock, pause_at, pause_ns):
+        super().__init__(clock=clock)
+        self.engine = None
+        self.pause_at = pause_at
+        self.pause_ns = pause_ns
+        self.calls = 0
+
+    def sleep_until(self, deadline):
+        self.calls += 1
+        if self.calls != self.pause_at:
+            return super().sleep_until(deadline)
+        self.clock.advance((deadline - self.clock.now_ns) // 2)
+        self.engine.pause()
+        self.clock.advance(self.pause_ns)
+        self.engine.resume()
+        # 醒来时等待已被暂停打断，但引擎已回到 running 状态
+        return self.clock.monotonic_ns()
+
+
+def check_quick_pause(pause_ns, seed):
+    """运行一次检查，返回不符合预期的间隔：[(序号, 实际纳秒, 预期纳秒)]"""
+    plan = RunPlan.from_config(dict(CHECK_CONFIG, seed=seed), [(0, 100, 15, 130)])
+    clock = VirtualClock()
+    # 第一次点击之前也有一次（立即返回的）等待
+    scheduler = QuickPauseScheduler(clock, PAUSE_WAIT + 1, pause_ns)
+    backend = SimulatedBackend(clock, len(plan.areas), timeline=True)
+    engine = ClickEngine(plan, backend, scheduler=scheduler, clock=clock)
+    backend.status = engine.status
+    scheduler.engine = engine
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine.run()
+
+    # 虚拟时钟上的间隔与计划没有误差
+    actual = np.diff(np.frombuffer(backend.timeline[0], dtype=np.int64))
+    schedule = ClickSchedule(plan)
+    expected = np.array([int(schedule.next_event()[2] * 1_000_000_000) for _ in range(len(actual))])
+    expected[PAUSE_WAIT - 1] += pause_ns
+    return [(int(i), int(actual[i]), int(expected[i])) for i in np.flatnonzero(actual != expected)]
+
+
+def main(argv=None):
+    """检查入口"""
+    parser = argparse.ArgumentParser(description="暂停/继续检查")
+    parser.add_argument("--seed", type=int, default=12345, help="随机种子")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for pause_ns in PAUSE_NS:
+        mismatched = check_quick_pause(pause_ns, args.seed)
+        failed = failed or bool(mismatched)
+        print(
+            f"快速暂停检查 (暂停 {pause_ns / 1_000_000:g}ms)  {'失败' if mismatched else '通过'}"
+            + "".join(
+                f"  第{index}个间隔 {actual / 1_000_000:.3f}ms（应为 {expected / 1_000_000:.3f}ms）"
+                for index, actual, expected in mismatched
+            )
+        )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,999 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+点击引擎
+运行参数的编译与点击循环所需的数据结构（不依赖图形界面）
+"""
+
+import os
+import threading
+import time
+
+from engine_stats import EngineMetrics
+from input_backends import BACKENDS, DEFAULT_BACKEND
+
+# 每次预采样的点击事件数量
+SCHEDULE_BLOCK_SIZE = 4096
+
+# 截止时间前改用短等待（忙等）的时间窗口（纳秒）
+# 窗口越大定时越准但越占 CPU，可用 bench_engine --precise-wait-ms 对比不同窗口
+PRECISE_WAIT_NS = 500_000
+
+# 落后超过该值（纳秒）时放弃追赶，从当前时间重新计时
+MAX_CATCH_UP_NS = 1_000_000_000
+
+# 默认模板匹配阈值（与 template_match.DEFAULT_THRESHOLD 一致，这里不导入 numpy）
+DEFAULT_TEMPLATE_THRESHOLD = 0.8
+
+# 等待区域变化的默认检测间隔（秒）和触发阈值（变化的网格单元比例）
+DEFAULT_CHANGE_POLL_INTERVAL = 0.01
+DEFAULT_CHANGE_THRESHOLD = 0.05
+
+# 区域的点击顺序：依次轮流、每轮随机顺序、按权重随机选择
+TRAVERSALS = ("sequential", "shuffled", "weighted")
+
+# 区域内点击位置的分布：均匀、以中心为均值的截断高斯、按热力图
+DISTRIBUTIONS = ("uniform", "gaussian", "heatmap")
+
+# 高斯分布的默认标准差（相对区域半宽/半高）
+DEFAULT_GAUSSIAN_SIGMA = 0.33
+
+# 点击引擎的状态：未开始、运行中、已暂停、正在停止（等点击线程退出）、已结束
+ENGINE_STATES = ("idle", "running", "paused", "stopping", "stopped")
+
+# 允许的状态转换
+ENGINE_TRANSITIONS = {
+    "idle": ("running", "stopped"),
+    "running": ("paused", "stopping"),
+    "paused": ("running", "stopping"),
+    "stopping": ("stopped",),
+    "stopped": (),
+}
+
+
+class RunPlan:
+    """一次运行的参数快照
+
+    由 start_clicking 在主线程中编译一次，之后点击线程只读取这里的原生数值，
+    不再访问任何 Tk 变量。创建后不可修改。
+    区域保存为只读的 int32 (N, 4) 数组（见 area_sets），上万个区域也不逐个创建对象。
+    """
+
+    __slots__ = (
+        "areas",
+        "min_area_interval",
+        "max_area_interval",
+        "min_time",
+        "max_time",
+        "min_clicks",
+        "max_clicks",
+        "min_click_interval",
+        "max_click_interval",
+        "no_offset_probability",
+        "x_offset",
+        "y_offset",
+        "duration_limit",
+        "max_total_clicks",
+        "seed",
+        "input_backend",
+        "templates",
+        "template_threshold",
+        "change_areas",
+        "change_poll_interval",
+        "change_threshold",
+        "traversal",
+        "area_weights",
+        "distribution",
+        "gaussian_sigma",
+        "heatmap",
+    )
+
+    def __init__(self, areas, min_area_interval, max_area_interval, min_time, max_time,
+                 min_clicks, max_clicks, min_click_interval, max_click_interval,
+                 no_offset_probability, x_offset, y_offset,
+                 duration_limit=None, max_total_clicks=None, seed=None,
+                 input_backend=DEFAULT_BACKEND, templates=None,
+                 template_threshold=DEFAULT_TEMPLATE_THRESHOLD, change_areas=None,
+                 change_poll_interval=DEFAULT_CHANGE_POLL_INTERVAL,
+                 change_threshold=DEFAULT_CHANGE_THRESHOLD, traversal="sequential",
+                 area_weights=None, distribution="uniform",
+                 gaussian_sigma=DEFAULT_GAUSSIAN_SIGMA, heatmap=None):
+        from area_sets import as_area_array
+
+        areas = as_area_array(areas)
+        values = {
+            "areas": areas,
+            "min_area_interval": float(min_area_interval),
+            "max_area_interval": float(max_area_interval),
+            "min_time": float(min_time),
+            "max_time": float(max_time),
+            "min_clicks": int(min_clicks),
+            "max_clicks": int(max_clicks),
+            "min_click_interval": float(min_click_interval),
+            "max_click_interval": float(max_click_interval),
+            "no_offset_probability": float(no_offset_probability),
+            "x_offset": int(x_offset),
+            "y_offset": int(y_offset),
+            # 时长限制（秒），None 表示不限制
+            "duration_limit": None if duration_limit is None else float(duration_limit),
+            # 总点击次数限制，None 表示不限制
+            "max_total_clicks": None if max_total_clicks is None else int(max_total_clicks),
+            # 随机种子，None 表示每次运行随机
+            "seed": None if seed is None else int(seed),
+            # 点击后端名称
+            "input_backend": str(input_backend),
+            # 每个区域的模板图像路径，None 表示固定区域；设置了模板的区域坐标为搜索范围
+            "templates": tuple(templates) if templates else (None,) * len(areas),
+            # 模板匹配阈值（归一化互相关）
+            "template_threshold": float(template_threshold),
+            # 每个区域是否等待区域内容变化后才点击
+            "change_areas": tuple(bool(v) for v in change_areas) if change_areas else (False,) * len(areas),
+            # 等待变化时的检测间隔（秒）
+            "change_poll_interval": float(change_poll_interval),
+            # 发生变化的网格单元比例达到该值时触发点击
+            "change_threshold": float(change_threshold),
+            # 区域的点击顺序（TRAVERSALS 之一）
+            "traversal": str(traversal),
+            # 按权重随机选择区域时各区域的权重（None 表示相同权重）
+            "area_weights": None if area_weights is None else tuple(float(v) for v in area_weights),
+            # 区域内点击位置的分布（DISTRIBUTIONS 之一）
+            "distribution": str(distribution),
+            # 高斯分布的标准差（相对区域半宽/半高）
+            "gaussian_sigma": float(gaussian_sigma),
+            # 热力图图像路径（distribution 为 heatmap 时使用）
+            "heatmap": heatmap,
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("RunPlan 创建后不可修改")
+
+    def __delattr__(self, name):
+        raise AttributeError("RunPlan 创建后不可修改")
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"RunPlan({fields})"
+
+    @classmethod
+    def from_config(cls, config, areas, templates=None):
+        """根据配置字典（与保存的配置文件格式相同）编译运行参数
+
+        templates 为每个区域的模板图像路径（可选，None 表示固定区域）。
+        参数无效时抛出 ValueError，错误信息可直接展示给用户。
+        """
+        # 验证点击后端
+        input_backend = config.get("input_backend") or DEFAULT_BACKEND
+        if input_backend not in BACKENDS:
+            raise ValueError(f"未知的点击后端: {input_backend}")
+
+        # 验证时间间隔
+        min_time = float(config["min_time"])
+        max_time = float(config["max_time"])
+        if min_time <= 0 or max_time <= 0 or min_time > max_time:
+            raise ValueError("时间间隔设置无效")
+
+        # 验证点击次数
+        min_clicks = int(config["min_clicks"])
+        max_clicks = int(config["max_clicks"])
+        if min_clicks <= 0 or max_clicks <= 0 or min_clicks > max_clicks:
+            raise ValueError("点击次数设置无效")
+
+        # 验证连续点击间隔（下限取决于点击后端）
+        min_click_interval = float(config["min_click_interval"])
+        max_click_interval = float(config["max_click_interval"])
+        interval_floor = BACKENDS[input_backend].min_click_interval
+        if min_click_interval < interval_floor:
+            raise ValueError(
+                f"连续点击最小间隔不能小于{interval_floor:g}秒({interval_floor * 1000:g}ms)"
+            )
+        if max_click_interval > 0.5:
+            raise ValueError("连续点击最大间隔不能大于0.5秒(500ms)")
+        if min_click_interval > max_click_interval:
+            raise ValueError("连续点击最小间隔不能大于最大间隔")
+
+        # 验证位置偏差
+        x_offset = int(config["x_offset"])
+        y_offset = int(config["y_offset"])
+        if x_offset < 0 or y_offset < 0:
+            raise ValueError("位置偏差不能为负数")
+
+        # 验证无偏差概率设置
+        no_offset_prob = float(config["no_offset_probability"])
+        if no_offset_prob < 0 or no_offset_prob > 1:
+            raise ValueError("无偏差概率必须在0.0-1.0之间")
+
+        # 验证点击区域（转换为 int32 数组，之后的校验都按数组进行）
+        from area_sets import as_area_array
+
+        areas = as_area_array(areas)
+        if len(areas) == 0:
+            raise ValueError("请先选择点击区域")
+
+        # 验证区域间隔（单区域时不会用到区域间隔）
+        min_area_interval = 0.0
+        max_area_interval = 0.0
+        if len(areas) > 1:
+            min_area_interval = float(config["min_area_interval"])
+            max_area_interval = float(config["max_area_interval"])
+            if min_area_interval < 0 or max_area_interval < 0:
+                raise ValueError("区域间隔不能为负数")
+            if min_area_interval > max_area_interval:
+                raise ValueError("区域间隔最小值不能大于最大值")
+
+        # 验证模板图像
+        if templates is not None:
+            templates = tuple(path or None for path in templates)
+            if len(templates) != len(areas):
+                raise ValueError("模板图像数量与区域数量不一致")
+            for path in templates:
+                if path is not None and not os.path.isfile(path):
+                    raise ValueError(f"模板图像不存在: {path}")
+        template_threshold = float(config.get("template_threshold", DEFAULT_TEMPLATE_THRESHOLD))
+        if template_threshold <= 0 or template_threshold > 1:
+            raise ValueError("模板匹配阈值必须在0.0-1.0之间")
+
+        # 验证等待变化的区域（区域编号从1开始，如 "1,3"）
+        change_areas = [False] * len(areas)
+        for number in str(config.get("change_areas") or "").replace("，", ",").split(","):
+            number = number.strip()
+            if not number:
+                continue
+            index = int(number) - 1
+            if index < 0 or index >= len(areas):
+                raise ValueError(f"等待变化的区域编号无效: {number}")
+            change_areas[index] = True
+        change_poll_interval = float(config.get("change_poll_interval", DEFAULT_CHANGE_POLL_INTERVAL))
+        if change_poll_interval <= 0 or change_poll_interval > 1:
+            raise ValueError("变化检测间隔必须大于0且不超过1秒")
+        change_threshold = float(config.get("change_threshold", DEFAULT_CHANGE_THRESHOLD))
+        if change_threshold <= 0 or change_threshold > 1:
+            raise ValueError("变化阈值必须在0.0-1.0之间")
+
+        # 验证点击顺序和区域权重（如 "3,1,1"，留空表示相同权重）
+        traversal = config.get("area_order") or "sequential"
+        if traversal not in TRAVERSALS:
+            raise ValueError(f"未知的点击顺序: {traversal}")
+        area_weights = None
+        weights_text = str(config.get("area_weights") or "").replace("，", ",").strip()
+        if weights_text:
+            area_weights = [float(v) for v in weights_text.split(",")]
+            if len(area_weights) != len(areas):
+                raise ValueError("区域权重数量与区域数量不一致")
+            if any(v < 0 for v in area_weights) or sum(area_weights) <= 0:
+                raise ValueError("区域权重不能为负数，且至少有一个大于0")
+
+        # 验证点击位置分布
+        distribution = config.get("click_distribution") or "uniform"
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"未知的点击位置分布: {distribution}")
+        gaussian_sigma = float(config.get("gaussian_sigma", DEFAULT_GAUSSIAN_SIGMA))
+        if gaussian_sigma <= 0 or gaussian_sigma > 2:
+            raise ValueError("高斯分布标准差必须大于0且不超过2")
+        heatmap = None
+        if distribution == "heatmap":
+            heatmap = config.get("heatmap_image") or None
+            if heatmap is None:
+                raise ValueError("请选择热力图图像")
+            if not os.path.isfile(heatmap):
+                raise ValueError(f"热力图图像不存在: {heatmap}")
+
+        # 验证时长限制设置
+        duration_limit = None
+        if config.get("duration_limit"):
+            duration = float(config["duration"])
+            if duration <= 0:
+                raise ValueError("运行时长必须大于0")
+            duration_limit = duration * 60  # 转换为秒
+
+        # 验证次数限制设置
+        max_total_clicks = None
+        if config.get("count_limit"):
+            max_total_clicks = int(config["max_total_clicks"])
+            if max_total_clicks <= 0:
+                raise ValueError("总点击次数必须大于0")
+
+        # 验证随机种子（可选，留空表示随机）
+        seed = config.get("seed")
+        if seed in (None, ""):
+            seed = None
+        else:
+            seed = int(seed)
+            if seed < 0:
+                raise ValueError("随机种子不能为负数")
+
+        # 确保至少有一个限制条件或者选择了无限选项
+        if not config.get("unlimited_duration") and not config.get("duration_limit") and \
+           not config.get("unlimited_count") and not config.get("count_limit"):
+            raise ValueError("请至少选择一种运行模式（时长限制、次数限制或无限模式）")
+
+        return cls(
+            areas=areas,
+            min_area_interval=min_area_interval,
+            max_area_interval=max_area_interval,
+            min_time=min_time,
+            max_time=max_time,
+            min_clicks=min_clicks,
+            max_clicks=max_clicks,
+            min_click_interval=min_click_interval,
+            max_click_interval=max_click_interval,
+            no_offset_probability=no_offset_prob,
+            x_offset=x_offset,
+            y_offset=y_offset,
+            duration_limit=duration_limit,
+            max_total_clicks=max_total_clicks,
+            seed=seed,
+            input_backend=input_backend,
+            templates=templates,
+            template_threshold=template_threshold,
+            change_areas=change_areas,
+            change_poll_interval=change_poll_interval,
+            change_threshold=change_threshold,
+            traversal=traversal,
+            area_weights=area_weights,
+            distribution=distribution,
+            gaussian_sigma=gaussian_sigma,
+            heatmap=heatmap,
+        )
+
+
+class RunStatus:
+    """点击引擎发布给界面的运行状态，点击频率再高也不会向 Tk 事件队列投递任何回调
+
+    所有字段都在引擎锁内写入，界面通过 ClickEngine.snapshot() 一次读取一致的快照：
+    - click_count、current_area_index 由执行 step() 的线程写入（点击线程，或多任务调度线程）
+    - finished 由 ClickEngine.finish() 写入（点击循环结束时在点击线程或调度线程中调用；
+      调度器的 remove_job()/stop() 在调用者线程中结束没有在点击的任务），
+      还没有开始运行就被 stop() 时由调用 stop() 的线程（如界面线程）写入
+    """
+
+    __slots__ = ("click_count", "current_area_index", "finished")
+
+    def __init__(self):
+        self.click_count = 0  # 本次运行的总点击次数
+        self.current_area_index = 0  # 当前点击区域索引
+        self.finished = False  # 点击循环已结束（被停止、达到限制或出错）
+
+
+class ClickSchedule:
+    """预采样的点击计划
+
+    使用带种子的 numpy.random.Generator 按块生成后续点击事件，每个事件包含：
+    点击坐标 x/y、区域索引 area、是否为本次区域点击的最后一击 last，
+    以及点击后的等待时间 delay（连续点击间隔；最后一击则为区域间隔或循环间隔）。
+    点击线程只需依次读取事件，相同的种子会得到完全相同的点击序列。
+    areas 可以替换运行参数中的区域（模板区域按模板范围采样，点击时再加上匹配位置）。
+
+    一轮循环固定为区域数量次区域点击事件，区域的顺序由 plan.traversal 决定
+    （依次、每轮随机排列、按权重随机选择），区域选择和点击位置都按块批量采样，
+    区域数量再多也不会拖慢点击循环。
+    """
+
+    def __init__(self, plan, seed=None, block_size=SCHEDULE_BLOCK_SIZE, areas=None):
+        import numpy as np
+        from area_sampling import AliasTable, load_heatmap
+
+        self.plan = plan
+        self.block_size = block_size
+        self.rng = np.random.default_rng(plan.seed if seed is None else seed)
+        self.areas = np.array(plan.areas if areas is None else areas, dtype=np.int64).reshape(-1, 4)
+        self.visit_index = 0  # 已生成的区域点击事件数（用于计算在一轮中的位置）
+        self.alias = None
+        if plan.traversal == "weighted":
+            weights = np.ones(len(self.areas)) if plan.area_weights is None else plan.area_weights
+            self.alias = AliasTable(weights)
+        self.heatmap = load_heatmap(plan.heatmap) if plan.distribution == "heatmap" else None
+        self.order = None  # 每轮随机顺序时，最后一轮的区域排列
+        self.order_cycle = -1  # self.order 对应的轮次
+        self.events = []
+        self.position = 0
+
+    def next_event(self):
+        """返回下一个点击事件 (x, y, delay, area, last)"""
+        if self.position >= len(self.events):
+            self.events = self.sample_block()
+            self.position = 0
+        event = self.events[self.position]
+        self.position += 1
+        return event
+
+    def peek_event(self):
+        """返回下一个点击事件，但不移动读取位置"""
+        if self.position >= len(self.events):
+            self.events = self.sample_block()
+            self.position = 0
+        return self.events[self.position]
+
+    def sample_block(self):
+        """批量采样一块点击事件"""
+        columns = self.sample_columns()
+        return list(zip(
+            columns["x"].tolist(),
+            columns["y"].tolist(),
+            columns["delay"].tolist(),
+            columns["area"].tolist(),
+            columns["last"].tolist(),
+        ))
+
+    def sample_columns(self):
+        """批量采样一块点击事件，以列数组形式返回"""
+        import numpy as np
+        from area_sampling import sample_points, bounded_offsets
+
+        plan = self.plan
+        rng = self.rng
+        area_total = len(self.areas)
+
+        # 按平均连续点击次数估算本块需要的区域点击事件数
+        mean_clicks = (plan.min_clicks + plan.max_clicks) / 2
+        visit_count = max(1, int(np.ceil(self.block_size / mean_clicks)))
+
+        # 每个区域点击事件：在一轮中的位置、区域索引、连续点击次数、基础点击位置
+        visit = self.visit_index + np.arange(visit_count)
+        slot = visit % area_total
+        area = self.sample_areas(visit)
+        self.visit_index += visit_count
+        x1, y1, x2, y2 = self.areas[area].T
+        clicks = rng.integers(plan.min_clicks, plan.max_clicks + 1, size=visit_count)
+        base_x, base_y = sample_points(
+            rng, x1, y1, x2, y2, plan.distribution, plan.gaussian_sigma, self.heatmap
+        )
+
+        # 区域点击事件结束后的等待：一轮中的最后一次为循环间隔，其余为区域间隔
+        visit_delay = np.where(
+            slot < area_total - 1,
+            rng.uniform(plan.min_area_interval, plan.max_area_interval, size=visit_count),
+            rng.uniform(plan.min_time, plan.max_time, size=visit_count),
+        )
+
+        # 展开为逐次点击
+        total = int(clicks.sum())
+        visit = np.repeat(np.arange(visit_count), clicks)
+        starts = np.cumsum(clicks) - clicks
+        step = np.arange(total) - starts[visit]
+        last = step == clicks[visit] - 1
+
+        # 第一次点击总是在基础位置，之后按无偏差概率决定是否添加随机偏差
+        # （偏差只在区域内的范围中采样，不会截断堆积到区域边缘）
+        use_offset = (step > 0) & (rng.random(total) >= plan.no_offset_probability)
+        base_x = base_x[visit]
+        base_y = base_y[visit]
+        offset_x = bounded_offsets(rng, base_x, x1[visit], x2[visit], plan.x_offset)
+        offset_y = bounded_offsets(rng, base_y, y1[visit], y2[visit], plan.y_offset)
+        x = np.where(use_offset, base_x + offset_x, base_x)
+        y = np.where(use_offset, base_y + offset_y, base_y)
+
+        # 连续点击间隔，最后一击替换为区域/循环间隔
+        delay = rng.uniform(plan.min_click_interval, plan.max_click_interval, size=total)
+        delay[last] = visit_delay
+
+        return {
+            "x": x,
+            "y": y,
+            "delay": delay,
+            "area": area[visit],
+            "last": last,
+        }
+
+    def sample_areas(self, visit):
+        """第 visit 次区域点击事件（数组）对应的区域索引"""
+        import numpy as np
+
+        area_total = len(self.areas)
+        traversal = self.plan.traversal
+        if traversal == "weighted":
+            return self.alias.sample(self.rng, len(visit))
+        if traversal == "shuffled" and area_total > 1:
+            # 每轮一个随机排列（随机数排序），跨块的那一轮沿用上一块的排列
+            cycle = visit // area_total
+            first = int(cycle[0])
+            last = int(cycle[-1])
+            new_first = first + 1 if first == self.order_cycle else first
+            orders = self.rng.random((last - new_first + 1, area_total)).argsort(axis=1)
+            if new_first != first:
+                orders = np.vstack([self.order[None, :], orders])
+            self.order = orders[-1]
+            self.order_cycle = last
+            return orders[cycle - first, visit % area_total]
+        return visit % area_total
+
+
+class DeadlineScheduler:
+    """基于绝对截止时间的等待器
+
+    每次等待都从上一个截止时间（而不是当前时间）累加，点击本身和界面调度的耗时
+    不会累积到后续间隔上。先粗略休眠到截止时间前的一小段，再用短等待精确收尾，
+    并统计每个事件相对截止时间的延迟。
+    粗略休眠在 interrupt 事件上等待，请求停止时立即醒来；等待也不会超过 limit_ns。
+    """
+
+    def __init__(self, precise_wait_ns=PRECISE_WAIT_NS, max_catch_up_ns=MAX_CATCH_UP_NS, clock=time):
+        self.precise_wait_ns = precise_wait_ns
+        self.max_catch_up_ns = max_catch_up_ns
+        self.clock = clock  # 提供 monotonic_ns() 和 sleep()，默认为 time 模块
+        self.interrupt = None  # threading.Event，被设置时立即结束等待
+        self.limit_ns = None  # 等待不超过这个时刻（时长限制），None 表示不限
+        self.deadline_ns = None
+        self.event_count = 0
+        self.total_lateness_ns = 0
+        self.max_lateness_ns = 0
+        self.last_lateness_ns = 0
+
+    def start(self):
+        """以当前时间作为第一个截止时间"""
+        self.deadline_ns = self.clock.monotonic_ns()
+        self.event_count = 0
+        self.total_lateness_ns = 0
+        self.max_lateness_ns = 0
+        self.last_lateness_ns = 0
+
+    def resync(self):
+        """以当前时间作为新的截止时间（在不定时长的等待之后调用，之后的间隔从现在开始计算）"""
+        self.deadline_ns = self.clock.monotonic_ns()
+
+    def wait(self, delay):
+        """等待到上一个截止时间之后 delay 秒，返回本次延迟（纳秒）；没有等到截止时间时返回 None"""
+        if self.deadline_ns is None:
+            self.start()
+        lateness = self.wait_until(self.deadline_ns + int(delay * 1_000_000_000))
+
+        # 落后太多（如系统休眠）时不再补点，从当前时间重新计时
+        if lateness is not None and lateness > self.max_catch_up_ns:
+            self.deadline_ns += lateness
+        return lateness
+
+    def wait_until(self, deadline, record=True):
+        """等待到绝对截止时间 deadline（clock.monotonic_ns 纳秒），返回本次延迟（纳秒）
+
+        被 interrupt 中断或截止时间超过 limit_ns 时提前返回 None（不计入延迟统计）。
+        record 为 False 时本次延迟也不计入统计（如区域变化检测之间的等待）。
+        """
+        self.deadline_ns = deadline
+        target = deadline if self.limit_ns is None else min(deadline, self.limit_ns)
+        now = self.sleep_until(target)
+        if now < deadline:
+            return None
+        lateness = now - deadline
+        if not record:
+            return lateness
+        self.event_count += 1
+        self.total_lateness_ns += lateness
+        self.last_lateness_ns = lateness
+        if lateness > self.max_lateness_ns:
+            self.max_lateness_ns = lateness
+        return lateness
+
+    def sleep_until(self, deadline):
+        """休眠到截止时间，返回醒来的时刻（纳秒）；interrupt 被设置时提前返回"""
+        monotonic_ns = self.clock.monotonic_ns
+        sleep = self.clock.sleep
+        interrupt = self.interrupt
+
+        # 粗略休眠
+        remaining = deadline - monotonic_ns()
+        if remaining > self.precise_wait_ns:
+            timeout = (remaining - self.precise_wait_ns) / 1_000_000_000
+            if interrupt is None:
+                sleep(timeout)
+            elif interrupt.wait(timeout):
+                return monotonic_ns()
+
+        # 精确收尾
+        now = monotonic_ns()
+        while now < deadline:
+            if interrupt is not None and interrupt.is_set():
+                break
+            sleep(0)
+            now = monotonic_ns()
+        return now
+
+    def stats(self):
+        """返回延迟统计（毫秒）"""
+        mean = self.total_lateness_ns / self.event_count if self.event_count else 0
+        return {
+            "events": self.event_count,
+            "mean_lateness_ms": mean / 1_000_000,
+            "max_lateness_ms": self.max_lateness_ns / 1_000_000,
+            "last_lateness_ms": self.last_lateness_ns / 1_000_000,
+        }
+
+
+def create_screen_watchers(plan):
+    """根据运行参数创建截屏相关的对象，返回 (截屏方式列表, 模板定位器, 各区域的变化检测器)
+
+    只截取需要像素的区域，普通点击区域不截屏：模板区域的搜索范围共用一个截屏方式
+    （每轮循环截取一次），每个等待变化的区域各用一个只截取区域本身的截屏方式（每次检测截取一次）。
+    没有模板区域和等待变化的区域时不截屏，也不导入相关模块。
+    """
+    detectors = [None] * len(plan.areas)
+    captures = []
+    if not any(plan.templates) and not any(plan.change_areas):
+        return captures, None, detectors
+
+    from screen_capture import create_capture
+
+    areas = [tuple(area) for area in plan.areas.tolist()]
+    locator = None
+    try:
+        # 设置了模板图像的区域在每轮循环前重新定位
+        if any(plan.templates):
+            from template_match import TargetLocator
+            capture = create_capture([area for area, path in zip(areas, plan.templates) if path is not None])
+            captures.append(capture)
+            locator = TargetLocator(plan, capture)
+
+        # 等待变化的区域只截取区域本身（模板区域为整个搜索范围）
+        if any(plan.change_areas):
+            from change_detect import ChangeDetector
+            for index, (area, enabled) in enumerate(zip(areas, plan.change_areas)):
+                if enabled:
+                    capture = create_capture([area])
+                    captures.append(capture)
+                    detectors[index] = ChangeDetector(area, plan.change_threshold, capture)
+    except Exception:
+        for capture in captures:
+            capture.close()
+        raise
+    return captures, locator, detectors
+
+
+class ClickEngine:
+    """点击引擎
+
+    按运行参数执行点击循环：一轮循环依次点击所有区域，区域之间等待区域间隔，
+    一轮结束后等待循环间隔，直到被停止或达到时长/次数限制。
+    点击循环由 step() 逐个事件推进，点击线程（clicking_loop）只负责在两次 step() 之间等待；
+    多任务调度器的任务（job_scheduler.ClickJob）使用同一个 step()，由调度线程等待。
+    不依赖任何图形界面，界面和无界面模式都通过它运行。
+    """
+
+    def __init__(self, plan, backend, scheduler=None, clock=time):
+        self.plan = plan
+        self.backend = backend
+        self.clock = clock  # 提供 time()、monotonic_ns() 和 sleep()，模拟运行时为虚拟时钟
+        self.captures, self.locator, self.detectors = create_screen_watchers(plan)
+        areas = None if self.locator is None else self.locator.schedule_areas()
+        self.schedule = ClickSchedule(plan, areas=areas)
+        self.scheduler = scheduler or DeadlineScheduler(clock=clock)
+        # 所有等待都在该事件上进行，stop()/pause() 设置它后立即醒来
+        self.stop_event = threading.Event()
+        self.scheduler.interrupt = self.stop_event
+        self.status = RunStatus()
+        self.metrics = EngineMetrics()  # 点击耗时、定时延迟、循环时长、模板匹配耗时直方图
+        # 状态、计数和暂停时长都在这个锁内修改；暂停的点击线程在它上面等待继续
+        self.lock = threading.Condition(threading.Lock())
+        self.state = "idle"
+        self.start_time = None  # 开始时间
+        self.start_ns = None  # 开始时刻（clock.monotonic_ns）
+        self.end_ns = None  # 点击循环结束的时刻
+        self.paused_at_ns = None  # 本次暂停的开始时刻
+        self.paused_total_ns = 0  # 累计暂停时长（不计入运行时长）
+        self.pending_shift_ns = 0  # 还没有加到截止时间上的暂停时长（由点击线程处理）
+        self.stop_requested_ns = None  # 请求停止的时刻（clock.monotonic_ns）
+        self.stop_latency_ns = None  # 从请求停止到点击循环实际结束的时间
+        self.thread = None
+        # 逐个事件推进点击循环的状态（只由执行 step() 的线程读写）
+        self.cycle_begin_ns = None  # 本轮循环开始的时刻
+        self.cycle_start = True  # 下一个事件是否为一轮循环的开始
+        self.visit_start = True  # 下一个事件是否为一次区域点击的开始
+        self.visit_slot = 0  # 当前区域点击在本轮中的位置（一轮为区域数量次）
+        self.offsets = None  # 本轮每个区域的坐标偏移（None 表示没有模板区域）
+        self.change_wait_begin_ns = None  # 开始等待区域变化的时刻（不在等待时为 None）
+
+    @property
+    def is_running(self):
+        """点击循环是否应该继续（暂停中也算，点击线程会在等待处停住）"""
+        state = self.state
+        return state == "running" or state == "paused"
+
+    def set_state(self, state):
+        """切换状态（调用时需持有锁），不允许的转换抛出 RuntimeError"""
+        if state not in ENGINE_TRANSITIONS[self.state]:
+            raise RuntimeError(f"点击引擎不能从 {self.state} 状态转换为 {state}")
+        self.state = state
+
+    def start(self):
+        """在后台线程中运行点击循环"""
+        self.prepare()
+        self.thread = threading.Thread(target=self.clicking_loop, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        """在当前线程中运行点击循环，直到结束"""
+        self.prepare()
+        self.clicking_loop()
+
+    def prepare(self):
+        """开始运行：进入 running 状态，第一个事件的截止时间为现在，并把时长限制设为等待的上限"""
+        with self.lock:
+            self.set_state("running")
+            self.stop_event.clear()
+            self.start_time = self.clock.time()
+            self.scheduler.start()
+            self.start_ns = self.scheduler.deadline_ns
+            duration_limit = self.plan.duration_limit
+            self.scheduler.limit_ns = None if duration_limit is None else (
+                self.start_ns + int(duration_limit * 1_000_000_000)
+            )
+
+    def stop(self):
+        """请求停止点击（正在进行的等待和暂停会立即结束），可以重复调用"""
+        with self.lock:
+            if self.state == "running" or self.state == "paused":
+                self.stop_requested_ns = self.clock.monotonic_ns()
+                self.set_state("stopping")
+            elif self.state == "idle":
+                self.set_state("stopped")
+                self.status.finished = True
+            self.stop_event.set()
+            self.lock.notify_all()
+
+    def pause(self):
+        """暂停点击（只能在 running 状态），剩余的时长和次数保持不变"""
+        with self.lock:
+            self.set_state("paused")
+            self.paused_at_ns = self.clock.monotonic_ns()
+            self.stop_event.set()
+
+    def resume(self):
+        """继续点击（只能在 paused 状态），被打断的等待只等剩余的时间"""
+        with self.lock:
+            self.set_state("running")
+            paused_ns = self.clock.monotonic_ns() - self.paused_at_ns
+            self.paused_at_ns = None
+            self.paused_total_ns += paused_ns
+            self.pending_shift_ns += paused_ns
+            # 时长限制只由这里修改，点击线程只读取
+            if self.scheduler.limit_ns is not None:
+                self.scheduler.limit_ns += paused_ns
+            self.stop_event.clear()
+            self.lock.notify_all()
+
+    def end_run(self):
+        """达到限制，结束运行（点击线程调用，不记录停止用时）"""
+        with self.lock:
+            if self.state == "running" or self.state == "paused":
+                self.set_state("stopping")
+
+    def finish(self):
+        """点击循环结束：进入 stopped 状态"""
+        with self.lock:
+            if self.state == "running" or self.state == "paused":
+                self.set_state("stopping")
+            self.set_state("stopped")
+            self.end_ns = self.clock.monotonic_ns()
+            if self.stop_requested_ns is not None:
+                self.stop_latency_ns = self.end_ns - self.stop_requested_ns
+            self.status.finished = True
+            self.lock.notify_all()
+
+    def join(self, timeout=None):
+        """等待后台线程结束，超时返回 False"""
+        if self.thread is not None:
+            self.thread.join(timeout)
+            return not self.thread.is_alive()
+        return True
+
+    def snapshot(self):
+        """一致的运行状态快照：状态、点击次数、当前区域、运行时长和剩余的时长/次数
+
+        运行时长不含暂停的时间；没有对应限制时剩余量为 None。
+        """
+        plan = self.plan
+        with self.lock:
+            state = self.state
+            click_count = self.status.click_count
+            area_index = self.status.current_area_index
+            if self.start_ns is None:
+                elapsed_ns = 0
+            else:
+                if state == "paused":
+                    now = self.paused_at_ns
+                elif self.end_ns is not None:
+                    now = self.end_ns
+                else:
+                    now = self.clock.monotonic_ns()
+                elapsed_ns = now - self.start_ns - self.paused_total_ns
+        elapsed = elapsed_ns / 1_000_000_000
+        return {
+            "state": state,
+            "click_count": click_count,
+            "current_area_index": area_index,
+            "elapsed": elapsed,
+            "remaining_duration": None if plan.duration_limit is None else max(0.0, plan.duration_limit - elapsed),
+            "remaining_clicks": None if plan.max_total_clicks is None else max(0, plan.max_total_clicks - click_count),
+        }
+
+    def wait_while_paused(self):
+        """暂停时阻塞到继续或停止，返回是否继续运行；继续后顺延被暂停的截止时间"""
+        with self.lock:
+            while self.state == "paused":
+                self.lock.wait()
+            running = self.state == "running"
+        if running:
+            self.apply_pause_shift()
+        return running
+
+    def apply_pause_shift(self):
+        """把暂停的时长加到当前截止时间上（不能与 step() 同时调用）"""
+        with self.lock:
+            shift = self.pending_shift_ns
+            self.pending_shift_ns = 0
+        if shift and self.scheduler.deadline_ns is not None:
+            self.scheduler.deadline_ns += shift
+
+    def duration_reached(self):
+        """是否已到达时长限制（不含暂停的时间）"""
+        limit_ns = self.scheduler.limit_ns
+        return limit_ns is not None and self.clock.monotonic_ns() >= limit_ns
+
+    def wait_until(self, deadline):
+        """等待到下一个事件的截止时间，返回是否继续运行（被停止或到达时长限制时返回 False）
+
+        暂停时在这里停住；被暂停打断的等待顺延暂停的时长，继续后只等剩余的时间
+        （暂停和继续都在点击线程醒来之前完成时也是如此）。等待区域变化时的检测间隔不计入定时统计。
+        """
+        scheduler = self.scheduler
+        record = self.change_wait_begin_ns is None
+        lateness = scheduler.wait_until(deadline, record)
+        while True:
+            state = self.state
+            if state == "paused":
+                if not self.wait_while_paused():
+                    return False
+            elif state != "running":
+                return False
+            elif self.pending_shift_ns:
+                # 暂停后很快继续，醒来时已经回到 running 状态：同样先顺延截止时间
+                self.apply_pause_shift()
+            elif lateness is not None:
+                return True
+            elif self.duration_reached():
+                self.end_run()
+                return False
+            # 截止时间之后才暂停的，顺延后的截止时间也已经过了，不再等待
+            if lateness is not None and scheduler.deadline_ns <= self.clock.monotonic_ns():
+                return True
+            lateness = scheduler.wait_until(scheduler.deadline_ns, record)
+
+    def clicking_loop(self):
+        """点击循环：等待到截止时间，执行一个事件，直到被停止或达到限制"""
+        try:
+            deadline = self.scheduler.deadline_ns
+            while self.wait_until(deadline):
+                deadline = self.step()
+                if deadline is None:
+                    break
+        except Exception as e:
+            print(f"点击过程中发生错误: {e}")
+        finally:
+            self.finish()
+            self.release()
+            stats = self.scheduler.stats()
+            print(
+                f"定时统计: {stats['events']} 次等待, "
+                f"平均延迟 {stats['mean_lateness_ms']:.2f}ms, 最大延迟 {stats['max_lateness_ms']:.2f}ms"
+            )
+            if self.stop_latency_ns is not None:
+                print(f"停止用时: {self.stop_latency_ns / 1_000_000:.2f}ms")
+            for capture in self.captures:
+                stats = capture.stats()
+                print(
+                    f"截屏统计({stats['capture']} {stats['region']}): {stats['frames']} 帧, "
+                    f"平均 {stats['mean_capture_ms']:.2f}ms/帧, "
+                    f"实际 {stats['achieved_rate']:.1f} 帧/秒, 最高 {stats['max_rate']:.1f} 帧/秒"
+                )
+
+    def release(self):
+        """释放点击后端和截屏"""
+        self.backend.close()
+        for capture in self.captures:
+            capture.close()
+
+    def stats_dict(self):
+        """本次运行的统计（直方图和截屏统计），可保存为 JSON"""
+        stats = self.metrics.to_dict()
+        if self.stop_latency_ns is not None:
+            stats["stop_latency_ms"] = self.stop_latency_ns / 1_000_000
+        if self.captures:
+            stats["captures"] = [capture.stats() for capture in self.captures]
+        return stats
+
+    def step(self):
+        """执行下一个事件，返回再下一个事件的截止时间（clock.monotonic_ns 纳秒）；运行结束时返回 None
+
+        事件为一次点击（本轮未找到模板的区域整个跳过），或等待变化的区域的一次检测。
+        点击之后的截止时间从本次的截止时间（而不是当前时间）累加，并且不超过时长限制；
+        到达时长或次数限制时结束运行。调用者负责等待到返回的截止时间再调用下一次。
+        """
+        plan = self.plan
+        scheduler = self.scheduler
+        monotonic_ns = self.clock.monotonic_ns
+        now = monotonic_ns()
+
+        # 检查时长限制
+        if self.duration_reached():
+            self.end_run()
+            return None
+
+        # 落后太多（如系统休眠）时不再补点，从当前时间重新计时
+        if now - scheduler.deadline_ns > scheduler.max_catch_up_ns:
+            scheduler.deadline_ns = now
+
+        # 一轮循环开始：记录上一轮的时长，定位模板区域
+        if self.cycle_start:
+            self.cycle_start = False
+            self.begin_cycle(now)
+
+        # 一次区域点击开始：更新当前区域，等待区域内容变化
+        if self.visit_start:
+            area_index = self.schedule.peek_event()[3]
+            with self.lock:
+                self.status.current_area_index = area_index
+            detector = self.detectors[area_index]
+            if detector is not None:
+                if self.change_wait_begin_ns is None:
+                    self.change_wait_begin_ns = now
+                if not detector.poll():
+                    return self.next_deadline(monotonic_ns() + int(plan.change_poll_interval * 1_000_000_000))
+                # 等待时长不确定，立即点击，之后的间隔从检测到变化的时刻开始计算
+                scheduler.resync()
+                self.metrics.change_wait.record(scheduler.deadline_ns - self.change_wait_begin_ns)
+                self.change_wait_begin_ns = None
+            self.visit_start = False
+
+        # 点击位置、连续点击次数和间隔都已由预采样点击计划生成，这里只依次读取事件
+        click_x, click_y, delay, area, last = self.schedule.next_event()
+        offset = (0, 0) if self.offsets is None else self.offsets[area]
+        if offset is None:
+            # 本轮未找到模板：跳过该区域的点击，只保留之后的区域/循环间隔
+            while not last:
+                _, _, delay, _, last = self.schedule.next_event()
+        else:
+            # 执行点击（模板区域的点击位置相对于本轮匹配到的位置），记录点击耗时和相对计划时间的延迟
+            click_begin = monotonic_ns()
+            self.backend.click(click_x + offset[0], click_y + offset[1])
+            self.metrics.click_time.record(monotonic_ns() - click_begin)
+            self.metrics.lateness.record(click_begin - scheduler.deadline_ns)
+            with self.lock:
+                self.status.click_count += 1
+                click_count = self.status.click_count
+
+            # 检查次数限制（在每次点击后）
+            if plan.max_total_clicks is not None and click_count >= plan.max_total_clicks:
+                self.end_run()
+                return None
+
+        # 本区域的最后一击之后为区域间隔（一轮中的最后一个区域为循环间隔），否则为连续点击间隔
+        if last:
+            self.visit_start = True
+            self.visit_slot += 1
+            if self.visit_slot == len(plan.areas):
+                self.visit_slot = 0
+                self.cycle_start = True
+        return self.next_deadline(scheduler.deadline_ns + int(delay * 1_000_000_000))
+
+    def next_deadline(self, deadline):
+        """把下一个事件的截止时间（不超过时长限制）记为当前截止时间并返回"""
+        limit_ns = self.scheduler.limit_ns
+        if limit_ns is not None and deadline > limit_ns:
+            deadline = limit_ns
+        self.scheduler.deadline_ns = deadline
+        return deadline
+
+    def begin_cycle(self, now):
+        """一轮循环开始：记录上一轮循环的实际时长，定位模板区域"""
+        if self.cycle_begin_ns is not None:
+            self.metrics.cycle_time.record(now - self.cycle_begin_ns)
+        self.cycle_begin_ns = now
+        self.offsets = self.locate_targets()
+
+    def locate_targets(self):
+        """返回本轮每个区域的坐标偏移（没有模板区域时返回 None），并记录模板匹配耗时"""
+        if self.locator is None:
+            return None
+        match_begin = self.clock.monotonic_ns()
+        offsets = self.locator.locate()
+        self.metrics.match_time.record(self.clock.monotonic_ns() - match_begin)
+        return offsets
@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+命令行模式
+不创建图形界面，直接使用保存的配置文件运行点击引擎
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from config_store import ConfigStore, CONFIG_DIR
+
+# 时长后缀对应的分钟数
+DURATION_UNITS = {"s": 1 / 60, "m": 1, "h": 60}
+
+
+def parse_areas(text):
+    """解析区域参数 "x1,y1,x2,y2;x1,y1,x2,y2:模板.png;..."
+
+    区域后加 ":模板图像" 表示在该区域内查找模板并点击找到的位置。
+    返回 (区域列表, 模板路径列表)，没有模板的区域对应 None。
+    """
+    areas = []
+    templates = []
+    for part in text.split(";"):
+        part = part.strip()
+        if not part:
+            continue
+        part, _, template = part.partition(":")
+        templates.append(template.strip() or None)
+        values = [v.strip() for v in part.split(",")]
+        if len(values) != 4:
+            raise ValueError(f"区域格式错误: {part}（应为 x1,y1,x2,y2）")
+        x1, y1, x2, y2 = (int(v) for v in values)
+        # 确保坐标正确（左上角和右下角）
+        areas.append((min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)))
+    return areas, templates
+
+
+def parse_duration(text):
+    """解析时长参数（如 30s、10m、2h，不带单位时按分钟），返回分钟数"""
+    text = text.strip().lower()
+    unit = DURATION_UNITS["m"]
+    if text and text[-1] in DURATION_UNITS:
+        unit = DURATION_UNITS[text[-1]]
+        text = text[:-1]
+    minutes = float(text) * unit
+    if minutes <= 0:
+        raise ValueError("运行时长必须大于0")
+    return minutes
+
+
+def load_run_areas(args):
+    """按 --areas / --areas-file / --grid 得到区域和模板列表（后两者没有模板）"""
+    if args.areas is not None:
+        return parse_areas(args.areas)
+
+    from area_sets import grid_areas, load_areas
+
+    if args.areas_file is not None:
+        return load_areas(args.areas_file), None
+    bounds, _ = parse_areas(args.grid)
+    if len(bounds) != 1:
+        raise ValueError("--grid 只能指定一个外框")
+    return grid_areas(bounds[0], args.rows, args.columns, args.padding), None
+
+
+def add_area_arguments(parser):
+    """添加 --areas / --areas-file / --grid（三选一）和网格参数"""
+    area_group = parser.add_mutually_exclusive_group(required=True)
+    area_group.add_argument("--areas",
+                            help='点击区域，如 "100,100,200,200;300,300,400,400"，'
+                                 '区域后加 ":模板.png" 表示在该区域内查找模板图像')
+    area_group.add_argument("--areas-file", help="从 CSV（每行 x1,y1,x2,y2）或 JSON 文件读取大量区域")
+    area_group.add_argument("--grid", metavar="X1,Y1,X2,Y2",
+                            help="把外框均分为网格区域（配合 --rows/--columns/--padding）")
+    parser.add_argument("--rows", type=int, default=1, help="网格行数")
+    parser.add_argument("--columns", type=int, default=1, help="网格列数")
+    parser.add_argument("--padding", type=int, default=0, help="网格单元格四周留出的像素")
+
+
+def apply_limit_overrides(config, args):
+    """用 --duration / --count / --seed 覆盖配置中的设置"""
+    if args.duration is not None:
+        config["duration_limit"] = True
+        config["unlimited_duration"] = False
+        config["duration"] = parse_duration(args.duration)
+    if args.count is not None:
+        config["count_limit"] = True
+        config["unlimited_count"] = False
+        config["max_total_clicks"] = args.count
+    if args.seed is not None:
+        config["seed"] = args.seed
+
+
+def load_config_file(path):
+    """读取配置文件，path 也可以是 configs 目录下的配置名称"""
+    if not os.path.exists(path):
+        store = ConfigStore(CONFIG_DIR)
+        if store.exists(path):
+            return store.load(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def build_parser():
+    """创建命令行参数解析器"""
+    parser = argparse.ArgumentParser(
+        prog="auto_clicker.py",
+        description="自动点击器命令行模式（不启动图形界面）"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="使用保存的配置运行点击")
+    run_parser.add_argument("--config", required=True, help="配置文件路径或 configs 目录下的配置名称")
+    add_area_arguments(run_parser)
+    run_parser.add_argument("--duration", help="运行时长（如 30s、10m、2h），覆盖配置中的时长限制")
+    run_parser.add_argument("--count", type=int, help="总点击次数限制，覆盖配置中的次数限制")
+    run_parser.add_argument("--backend", help="点击后端（pyautogui / xtest / null）")
+    run_parser.add_argument("--seed", type=int, help="随机种子，相同种子得到相同的点击序列")
+    run_parser.add_argument("--threshold", type=float, help="模板匹配阈值（0-1，默认0.8）")
+    run_parser.add_argument("--wait-change", metavar="AREAS",
+                            help='等区域内容变化后才点击的区域编号，如 "1,3"，覆盖配置')
+    run_parser.add_argument("--stats", help="结束时将点击耗时/定时延迟/循环时长直方图保存为 JSON 文件")
+    run_parser.set_defaults(handler=command_run)
+
+    simulate_parser = commands.add_parser("simulate", help="用虚拟时钟模拟运行（不点击、不等待），估算点击次数和分布")
+    simulate_parser.add_argument("--config", required=True, help="配置文件路径或 configs 目录下的配置名称")
+    add_area_arguments(simulate_parser)
+    simulate_parser.add_argument("--duration", help="运行时长（如 30s、10m、2h），覆盖配置中的时长限制")
+    simulate_parser.add_argument("--count", type=int, help="总点击次数限制，覆盖配置中的次数限制")
+    simulate_parser.add_argument("--seed", type=int, help="随机种子，相同种子得到相同的点击序列")
+    simulate_parser.add_argument("--click-cost", type=float, default=0.0,
+                                 help="每次点击的耗时（毫秒），模拟实际后端的开销，默认0")
+    simulate_parser.add_argument("--timeline", help="将每次点击的时间、坐标和区域保存为 CSV 文件")
+    simulate_parser.add_argument("--output", help="将运行摘要保存为 JSON 文件")
+    simulate_parser.set_defaults(handler=command_simulate)
+
+    jobs_parser = commands.add_parser("jobs", help="同时运行多个配置（共用一个调度线程）")
+    jobs_parser.add_argument("--job", action="append", required=True, metavar="CONFIG@AREAS",
+                             help='任务，如 "test2@100,100,200,200;300,300,400,400"（可重复）')
+    jobs_parser.add_argument("--backend", help="所有任务使用的点击后端，覆盖各配置")
+    jobs_parser.set_defaults(handler=command_jobs)
+
+    record_parser = commands.add_parser("record", help="录制鼠标点击（Linux X11），按 Ctrl+C 结束")
+    record_parser.add_argument("--output", required=True, help="宏文件路径（如 macro.macro）")
+    record_parser.add_argument("--duration", help="录制时长（如 30s、10m、2h），默认直到按 Ctrl+C")
+    record_parser.set_defaults(handler=command_record)
+
+    replay_parser = commands.add_parser("replay", help="回放录制的宏")
+    replay_parser.add_argument("macro", help="宏文件路径")
+    replay_parser.add_argument("--speed", type=float, default=1.0, help="回放速度倍数（2 表示两倍速，默认1）")
+    replay_parser.add_argument("--repeat", type=int, default=1, help="回放次数（0 表示一直重复，默认1）")
+    replay_parser.add_argument("--config", help="使用该配置的偏差设置（无偏差概率、X/Y偏移量）和点击后端")
+    replay_parser.add_argument("--backend", help="点击后端（pyautogui / xtest / null），覆盖配置")
+    replay_parser.add_argument("--seed", type=int, help="随机种子（偏移）")
+    replay_parser.add_argument("--start-event", type=int, help="从第几个事件开始（从0开始，用于中断后继续）")
+    replay_parser.add_argument("--start-time", help="从录制中的这个时间开始（如 90s、30m、2h）")
+    replay_parser.add_argument("--stats", help="结束时将点击耗时/定时延迟直方图保存为 JSON 文件")
+    replay_parser.set_defaults(handler=command_replay)
+
+    configs_parser = commands.add_parser("configs", help="列出、导入、导出保存的配置")
+    configs_commands = configs_parser.add_subparsers(dest="configs_command", required=True)
+
+    list_parser = configs_commands.add_parser("list", help="列出配置名称")
+    list_parser.add_argument("--prefix", default="", help="只列出以此开头的配置")
+    list_parser.add_argument("--limit", type=int, help="最多列出的数量")
+    list_parser.set_defaults(handler=command_configs_list)
+
+    import_parser = configs_commands.add_parser("import", help="导入配置文件（*.json）")
+    import_parser.add_argument("files", nargs="+", help="配置文件路径")
+    import_parser.add_argument("--overwrite", action="store_true", help="覆盖同名配置")
+    import_parser.set_defaults(handler=command_configs_import)
+
+    export_parser = configs_commands.add_parser("export", help="把配置导出到目录")
+    export_parser.add_argument("names", nargs="*", help="配置名称（不指定时按 --prefix 导出）")
+    export_parser.add_argument("--prefix", help="导出所有以此开头的配置")
+    export_parser.add_argument("--to", required=True, dest="target", help="导出目录")
+    export_parser.set_defaults(handler=command_configs_export)
+
+    return parser
+
+
+def command_configs_list(args):
+    """configs list 命令"""
+    store = ConfigStore(CONFIG_DIR)
+    for name in store.names(args.prefix, args.limit):
+        print(name)
+    return 0
+
+
+def command_configs_import(args):
+    """configs import 命令"""
+    store = ConfigStore(CONFIG_DIR)
+    try:
+        imported = store.import_files(args.files, overwrite=args.overwrite)
+    except (OSError, ValueError) as e:
+        print(f"导入配置失败: {e}", file=sys.stderr)
+        return 2
+    print(f"已导入 {len(imported)} 个配置，跳过 {len(args.files) - len(imported)} 个同名配置")
+    return 0
+
+
+def command_configs_export(args):
+    """configs export 命令"""
+    store = ConfigStore(CONFIG_DIR)
+    names = list(args.names)
+    if args.prefix is not None:
+        names.extend(store.names(args.prefix))
+    if not names:
+        print("请指定要导出的配置名称或 --prefix", file=sys.stderr)
+        return 2
+    try:
+        exported = store.export_files(names, args.target)
+    except OSError as e:
+        print(f"导出配置失败: {e}", file=sys.stderr)
+        return 2
+    print(f"已导出 {len(exported)} 个配置到 {args.target}")
+    return 0
+
+
+def command_run(args):
+    """run 命令：按配置运行点击引擎，直到达到限制或按 Ctrl+C"""
+    from click_engine import RunPlan, ClickEngine
+    from input_backends import create_backend
+
+    try:
+        config = load_config_file(args.config)
+        areas, templates = load_run_areas(args)
+
+        # 命令行参数覆盖配置
+        apply_limit_overrides(config, args)
+        if args.backend is not None:
+            config["input_backend"] = args.backend
+        if args.threshold is not None:
+            config["template_threshold"] = args.threshold
+        if args.wait_change is not None:
+            config["change_areas"] = args.wait_change
+
+        plan = RunPlan.from_config(config, areas, templates)
+        backend = create_backend(plan.input_backend)
+        try:
+            engine = ClickEngine(plan, backend)
+        except Exception:
+            # 模板图像无法加载、截屏不可用等，点击后端（如 X 显示连接）不再使用
+            backend.close()
+            raise
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"参数设置有误: {e}", file=sys.stderr)
+        return 2
+
+    print(f"开始点击: {len(plan.areas)} 个区域, 后端 {plan.input_backend}（按 Ctrl+C 停止）")
+    try:
+        engine.run()
+    except KeyboardInterrupt:
+        engine.stop()
+        print("程序被用户中断")
+    print(f"总点击次数: {engine.status.click_count}")
+    if args.stats:
+        with open(args.stats, 'w', encoding='utf-8') as f:
+            json.dump(engine.stats_dict(), f, ensure_ascii=False, indent=2)
+        print(f"统计已保存: {args.stats}")
+    return 0
+
+
+def command_simulate(args):
+    """simulate 命令：用虚拟时钟运行点击引擎，打印运行摘要"""
+    from click_engine import RunPlan
+    from simulator import Simulation
+
+    try:
+        config = load_config_file(args.config)
+        areas, templates = load_run_areas(args)
+        apply_limit_overrides(config, args)
+        plan = RunPlan.from_config(config, areas, templates)
+        simulation = Simulation(plan, args.click_cost / 1000, timeline=args.timeline is not None)
+    except (OSError, ValueError) as e:
+        print(f"参数设置有误: {e}", file=sys.stderr)
+        return 2
+
+    summary = simulation.run()
+    reasons = {"count": "达到次数限制", "duration": "达到时长限制", "error": "发生错误"}
+    print(
+        f"模拟结束（{reasons[summary['stop_reason']]}）: 虚拟时间 {summary['end_seconds']:.1f} 秒, "
+        f"点击 {summary['clicks']} 次, 循环 {summary['cycles']} 轮, 耗时 {summary['wall_seconds']:.2f} 秒"
+    )
+    if summary["clicks"]:
+        interval = summary["click_interval_ms"]
+        print(
+            f"每小时 {summary['clicks_per_hour']:.0f} 次, 最后一次点击在 {summary['last_click_seconds']:.1f} 秒, "
+            f"点击间隔 p50 {interval['p50']:.1f}ms p99 {interval['p99']:.1f}ms"
+        )
+    area_clicks = summary["area_clicks"]
+    if len(area_clicks) <= 20:
+        print("各区域点击次数: " + ", ".join(
+            f"区域{index + 1} {count}" for index, count in enumerate(area_clicks)
+        ))
+    else:
+        print(
+            f"各区域点击次数: {len(area_clicks)} 个区域, "
+            f"最少 {summary['area_clicks_min']} 次, 最多 {summary['area_clicks_max']} 次"
+        )
+
+    if args.timeline:
+        simulation.write_timeline(args.timeline)
+        print(f"时间线已保存: {args.timeline}")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"摘要已保存: {args.output}")
+    return 0
+
+
+def command_record(args):
+    """record 命令：录制鼠标点击，直到达到时长或按 Ctrl+C"""
+    from macro import MacroRecorder
+
+    try:
+        duration = parse_duration(args.duration) * 60 if args.duration is not None else None
+        recorder = MacroRecorder(args.output)
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"无法开始录制: {e}", file=sys.stderr)
+        return 2
+
+    recorder.start()
+    print(f"开始录制鼠标点击: {args.output}（按 Ctrl+C 结束）")
+    deadline = None if duration is None else time.monotonic() + duration
+    try:
+        while deadline is None or time.monotonic() < deadline:
+            time.sleep(0.2)
+    except KeyboardInterrupt:
+        pass
+    try:
+        count = recorder.stop()
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(f"录制结束: {count} 次点击")
+    return 0
+
+
+def command_replay(args):
+    """replay 命令：回放宏，直到结束或按 Ctrl+C"""
+    from click_engine import RunPlan
+    from input_backends import create_backend, DEFAULT_BACKEND
+    from macro import MacroPlayer, MacroReader
+
+    try:
+        # 内存映射，按块读取，文件再大也不会一次载入
+        events = MacroReader(args.macro)
+        start_event = args.start_event or 0
+        if args.start_time is not None:
+            start_event = events.find_time(int(parse_duration(args.start_time) * 60 * 1_000_000_000))
+        offsets = {}
+        backend_name = DEFAULT_BACKEND
+        if args.config is not None:
+            # 偏差设置按配置编译（与随机点击使用相同的校验）
+            plan = RunPlan.from_config(load_config_file(args.config), [(0, 0, 0, 0)])
+            offsets = {
+                "x_offset": plan.x_offset,
+                "y_offset": plan.y_offset,
+                "no_offset_probability": plan.no_offset_probability,
+            }
+            backend_name = plan.input_backend
+        if args.backend is not None:
+            backend_name = args.backend
+        if args.repeat < 0:
+            raise ValueError("回放次数不能为负数")
+        backend = create_backend(backend_name)
+        player = MacroPlayer(events, backend, speed=args.speed, repeat=args.repeat or None,
+                             seed=args.seed, start_event=start_event, **offsets)
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"参数设置有误: {e}", file=sys.stderr)
+        return 2
+
+    print(
+        f"开始回放: {len(events)} 次点击（从第 {start_event} 个开始）, "
+        f"{args.speed:g} 倍速, 后端 {backend_name}（按 Ctrl+C 停止）"
+    )
+    try:
+        player.run()
+    except KeyboardInterrupt:
+        player.stop()
+        print("程序被用户中断")
+    print(f"总点击次数: {player.status.click_count}")
+    if player.position:
+        print(f"回放到第 {player.position} 个事件，继续回放请加参数: --start-event {player.position}")
+    events.close()
+    if args.stats:
+        with open(args.stats, 'w', encoding='utf-8') as f:
+            json.dump(player.stats_dict(), f, ensure_ascii=False, indent=2)
+        print(f"统计已保存: {args.stats}")
+    return 0
+
+
+def command_jobs(args):
+    """jobs 命令：同时运行多个任务，直到全部结束或按 Ctrl+C"""
+    from click_engine import RunPlan
+    from input_backends import create_backend
+    from job_scheduler import JobScheduler
+
+    tasks = []
+    try:
+        for spec in args.job:
+            config_path, sep, areas_text = spec.partition("@")
+            if not sep:
+                raise ValueError(f"任务格式错误: {spec}（应为 配置@区域）")
+            config = load_config_file(config_path)
+            if args.backend is not None:
+                config["input_backend"] = args.backend
+            plan = RunPlan.from_config(config, *parse_areas(areas_text))
+            tasks.append((os.path.splitext(os.path.basename(config_path))[0], plan))
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"参数设置有误: {e}", file=sys.stderr)
+        return 2
+
+    # 每个任务的点击后端创建后立即交给任务，任务结束或被停止时由任务关闭
+    scheduler = JobScheduler()
+    jobs = []
+    try:
+        for name, plan in tasks:
+            backend = create_backend(plan.input_backend)
+            try:
+                jobs.append(scheduler.add_job(name, plan, backend))
+            except Exception:
+                # 模板图像无法加载、截屏不可用等，没有交给任务的后端在这里关闭
+                backend.close()
+                raise
+    except (OSError, ValueError, RuntimeError) as e:
+        # 已经开始的任务也停止
+        scheduler.stop()
+        print(f"参数设置有误: {e}", file=sys.stderr)
+        return 2
+    print(f"开始运行 {len(jobs)} 个任务（按 Ctrl+C 停止）")
+    try:
+        while not all(job.status.finished for job in jobs):
+            time.sleep(0.2)
+    except KeyboardInterrupt:
+        print("程序被用户中断")
+    scheduler.stop()
+    for job in jobs:
+        print(f"任务 #{job.job_id} {job.name}: 总点击次数 {job.status.click_count}")
+    return 0
+
+
+def main(argv=None):
+    """命令行入口"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+配置存储
+configs 目录中每个配置一个 JSON 文件（格式不变，可以直接手动编辑和复制），
+在内存中维护按名称排序的索引：目录没有变化时不重新扫描，配置文件没有变化时不重新解析
+"""
+
+import bisect
+import json
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+
+# 默认配置文件目录
+CONFIG_DIR = "configs"
+
+# 配置文件扩展名
+CONFIG_SUFFIX = ".json"
+
+# 记录最后使用的配置名称的文件
+LAST_USED_FILE = "last_used.txt"
+
+# 配置名称中不允许的字符
+INVALID_NAME_CHARS = '/\\:*?"<>|'
+
+# 修改时间距离扫描时刻太近时不信任缓存（部分文件系统的时间戳精度较低，
+# 同一时间戳内的后续修改无法通过修改时间发现）
+RACY_WINDOW_NS = 2_000_000_000
+
+
+def atomic_write_text(path, text):
+    """原子地写入文本文件：先写临时文件并 fsync，再重命名覆盖目标文件
+
+    写入过程中程序崩溃或断电时，目标文件要么是旧内容，要么是完整的新内容。
+    临时文件以 "." 开头、".tmp" 结尾，不会被当作配置文件。
+    """
+    directory = os.path.dirname(path) or "."
+    fd, temp_path = tempfile.mkstemp(prefix="." + os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+    # 同步目录，确保重命名本身也已写入磁盘（Windows 不支持打开目录）
+    if hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def check_name(name):
+    """检查配置名称，无效时抛出 ValueError"""
+    if not name or not name.strip():
+        raise ValueError("配置名称不能为空")
+    if any(char in name for char in INVALID_NAME_CHARS):
+        raise ValueError("配置名称不能包含特殊字符")
+
+
+class ConfigStore:
+    """配置存储
+
+    - names(prefix) 在排序的名称列表上二分查找，与配置总数基本无关
+    - 目录的修改时间不变时（没有新增/删除/重命名文件）不重新扫描目录
+    - load() 只解析被选中的配置，并按文件修改时间缓存解析结果
+    - 可以同时被界面线程和后台写入线程使用（索引和缓存的修改加锁）
+    """
+
+    def __init__(self, config_dir=CONFIG_DIR):
+        self.config_dir = config_dir
+        self.lock = threading.RLock()
+        self.names_sorted = []  # 排序的配置名称
+        self.dir_mtime_ns = None  # 扫描时目录的修改时间（None 表示需要重新扫描）
+        self.cache = {}  # 配置名称 -> (文件修改时间, 配置字典)
+
+    def path(self, name):
+        """配置名称对应的文件路径"""
+        return os.path.join(self.config_dir, name + CONFIG_SUFFIX)
+
+    def refresh(self):
+        """目录有变化时重新扫描配置文件"""
+        with self.lock:
+            self.refresh_locked()
+
+    def refresh_locked(self):
+        try:
+            mtime = os.stat(self.config_dir).st_mtime_ns
+        except FileNotFoundError:
+            os.makedirs(self.config_dir)
+            mtime = os.stat(self.config_dir).st_mtime_ns
+        if mtime == self.dir_mtime_ns:
+            return
+
+        with os.scandir(self.config_dir) as entries:
+            names = [
+                entry.name[:-len(CONFIG_SUFFIX)] for entry in entries
+                if entry.name.endswith(CONFIG_SUFFIX) and entry.is_file()
+            ]
+        names.sort()
+        self.names_sorted = names
+        # 已删除的配置不再缓存
+        if len(self.cache) > len(names):
+            existing = set(names)
+            self.cache = {name: value for name, value in self.cache.items() if name in existing}
+        self.dir_mtime_ns = None if time.time_ns() - mtime < RACY_WINDOW_NS else mtime
+
+    def names(self, prefix="", limit=None):
+        """返回以 prefix 开头的配置名称（按名称排序），最多 limit 个"""
+        with self.lock:
+            self.refresh_locked()
+            names = self.names_sorted
+            start = bisect.bisect_left(names, prefix)
+            end = bisect.bisect_left(names, prefix + "\U0010ffff") if prefix else len(names)
+            if limit is not None:
+                end = min(end, start + limit)
+            return names[start:end]
+
+    def count(self):
+        """配置总数"""
+        with self.lock:
+            self.refresh_locked()
+            return len(self.names_sorted)
+
+    def exists(self, name):
+        """配置是否存在"""
+        return os.path.isfile(self.path(name))
+
+    def load(self, name):
+        """读取配置（返回副本，修改它不影响缓存），不存在时抛出 FileNotFoundError"""
+        path = self.path(name)
+        mtime = os.stat(path).st_mtime_ns
+        cached = self.cache.get(name)
+        if cached is None or cached[0] != mtime or time.time_ns() - mtime < RACY_WINDOW_NS:
+            with open(path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+            cached = (mtime, config)
+            with self.lock:
+                self.cache[name] = cached
+        return dict(cached[1])
+
+    def save(self, name, config):
+        """保存配置（原子写入）"""
+        check_name(name)
+        os.makedirs(self.config_dir, exist_ok=True)
+        atomic_write_text(self.path(name), json.dumps(config, ensure_ascii=False, indent=2))
+        with self.lock:
+            self.cache.pop(name, None)
+            self.add_name(name)
+
+    def delete(self, name):
+        """删除配置，不存在时抛出 FileNotFoundError"""
+        os.remove(self.path(name))
+        with self.lock:
+            self.cache.pop(name, None)
+            index = bisect.bisect_left(self.names_sorted, name)
+            if index < len(self.names_sorted) and self.names_sorted[index] == name:
+                del self.names_sorted[index]
+
+    def add_name(self, name):
+        """把新名称插入排序列表（不重新扫描目录，调用时需持有锁）"""
+        index = bisect.bisect_left(self.names_sorted, name)
+        if index == len(self.names_sorted) or self.names_sorted[index] != name:
+            self.names_sorted.insert(index, name)
+
+    def import_files(self, paths, overwrite=False):
+        """导入配置文件（*.json），返回导入的配置名称；已存在的配置默认跳过"""
+        imported = []
+        for path in paths:
+            name = os.path.splitext(os.path.basename(path))[0]
+            check_name(name)
+            if not overwrite and self.exists(name):
+                continue
+            # 先解析一遍，确认是有效的配置文件
+            with open(path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+            if not isinstance(config, dict):
+                raise ValueError(f"不是有效的配置文件: {path}")
+            self.save(name, config)
+            imported.append(name)
+        return imported
+
+    def export_files(self, names, target_dir):
+        """把配置导出到目录（与 configs 目录中的格式相同），返回导出的文件路径"""
+        os.makedirs(target_dir, exist_ok=True)
+        exported = []
+        for name in names:
+            target = os.path.join(target_dir, name + CONFIG_SUFFIX)
+            shutil.copyfile(self.path(name), target)
+            exported.append(target)
+        return exported
+
+    def get_last_used(self):
+        """最后使用的配置名称（没有时返回 None）"""
+        try:
+            with open(os.path.join(self.config_dir, LAST_USED_FILE), 'r', encoding='utf-8') as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def set_last_used(self, name):
+        """记录最后使用的配置名称"""
+        os.makedirs(self.config_dir, exist_ok=True)
+        atomic_write_text(os.path.join(self.config_dir, LAST_USED_FILE), name)
+
+
+class ConfigWorker:
+    """后台配置读写线程
+
+    界面线程只提交请求，文件读写都在后台线程中进行，网络目录等慢速磁盘不会卡住界面。
+    同一目标（同名配置、最后使用的配置）还没开始执行的请求会被新请求替换，
+    连续多次保存只写入最后一次。每个请求完成后把 (类型, 名称, 结果, 错误) 放入
+    results 队列，由界面定时器取出处理。
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.results = queue.Queue()
+        self.pending = {}  # (类型, 名称) -> 待执行的函数，按提交顺序执行
+        self.condition = threading.Condition()
+        self.busy = False  # 后台线程正在执行请求
+        self.closed = False
+        self.coalesced = 0  # 被后续请求替换掉的请求数
+        self.thread = threading.Thread(target=self.worker_loop, daemon=True)
+        self.thread.start()
+
+    def submit(self, key, function):
+        """提交请求；同一 key 还没执行的请求会被替换"""
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("配置读写线程已关闭")
+            if key in self.pending:
+                # 替换旧请求，并移动到队尾（保持最新提交的顺序）
+                del self.pending[key]
+                self.coalesced += 1
+            self.pending[key] = function
+            self.condition.notify()
+
+    def save(self, name, config):
+        """保存配置（config 会被复制，提交后可以继续修改）"""
+        check_name(name)
+        config = dict(config)
+        self.submit(("save", name), lambda: self.store.save(name, config))
+
+    def set_last_used(self, name):
+        """记录最后使用的配置名称"""
+        self.submit(("last_used", None), lambda: self.store.set_last_used(name))
+
+    def load_last_used(self):
+        """读取最后使用的配置，结果为 (名称, 配置)；没有时为 None"""
+        def load():
+            name = self.store.get_last_used()
+            if name and self.store.exists(name):
+                return name, self.store.load(name)
+            return None
+
+        self.submit(("load_last_used", None), load)
+
+    def idle(self):
+        """没有待执行和正在执行的请求"""
+        with self.condition:
+            return not self.pending and not self.busy
+
+    def worker_loop(self):
+        """依次执行请求"""
+        while True:
+            with self.condition:
+                while not self.pending and not self.closed:
+                    self.condition.wait()
+                if not self.pending:
+                    return
+                key = next(iter(self.pending))
+                function = self.pending.pop(key)
+                self.busy = True
+
+            try:
+                result, error = function(), None
+            except Exception as e:
+                result, error = None, e
+
+            with self.condition:
+                self.busy = False
+                self.condition.notify_all()
+            self.results.put((key[0], key[1], result, error))
+
+    def flush(self, timeout=None):
+        """等待所有请求执行完毕，超时返回 False"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.condition:
+            while self.pending or self.busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.condition.wait(remaining)
+        return True
+
+    def close(self, timeout=None):
+        """执行完剩余请求后结束后台线程"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join(timeout)
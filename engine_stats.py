@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+点击引擎运行统计
+固定大小的对数分桶直方图，用于记录点击耗时、定时延迟和循环时长
+"""
+
+from array import array
+
+# 每个2的幂区间再细分的桶数（相对误差约 1/8）
+SUB_BUCKET_BITS = 3
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+# 最大记录值约为 2^41 纳秒（约36分钟），更大的值计入最后一个桶
+MAX_EXPONENT = 41
+BUCKET_COUNT = (MAX_EXPONENT + 1) * SUB_BUCKETS
+
+
+def bucket_index(value):
+    """值（纳秒，整数）所在的桶序号"""
+    if value < SUB_BUCKETS:
+        return max(value, 0)
+    exponent = value.bit_length() - 1
+    if exponent > MAX_EXPONENT:
+        return BUCKET_COUNT - 1
+    sub = (value >> (exponent - SUB_BUCKET_BITS)) & (SUB_BUCKETS - 1)
+    return exponent * SUB_BUCKETS + sub
+
+
+def bucket_bounds(index):
+    """桶序号对应的取值范围 [下限, 上限)"""
+    if index < SUB_BUCKETS:
+        return index, index + 1
+    exponent, sub = divmod(index, SUB_BUCKETS)
+    shift = exponent - SUB_BUCKET_BITS
+    return (SUB_BUCKETS + sub) << shift, (SUB_BUCKETS + sub + 1) << shift
+
+
+class LogHistogram:
+    """对数分桶直方图（纳秒）
+
+    桶数量固定，记录一次只是一次数组自增，长时间运行也不会增长内存。
+    只由点击线程写入，界面线程读取到的可能是稍旧的值，但不会出错。
+    """
+
+    def __init__(self):
+        self.counts = array("Q", bytes(8 * BUCKET_COUNT))
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, value):
+        """记录一个值（纳秒）"""
+        value = int(value)
+        self.counts[bucket_index(value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q):
+        """返回第 q 百分位的近似值（纳秒，取所在桶的中点）"""
+        count = self.count
+        if count == 0:
+            return 0
+        target = max(1, count * q / 100)
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            if bucket:
+                seen += bucket
+                if seen >= target:
+                    low, high = bucket_bounds(index)
+                    return min((low + high) // 2, self.max)
+        return self.max
+
+    def percentiles_ms(self, quantiles=(50, 95, 99)):
+        """返回各百分位（毫秒）"""
+        return {f"p{q}": self.percentile(q) / 1_000_000 for q in quantiles}
+
+    def to_dict(self):
+        """导出为可保存成 JSON 的字典"""
+        buckets = []
+        for index, bucket in enumerate(self.counts):
+            if bucket:
+                low, high = bucket_bounds(index)
+                buckets.append([low, high, bucket])
+        summary = self.percentiles_ms()
+        summary.update({
+            "count": self.count,
+            "mean": self.total / self.count / 1_000_000 if self.count else 0.0,
+            "max": self.max / 1_000_000,
+        })
+        return {
+            "unit": "ms",
+            "summary": summary,
+            # 非空桶：[下限ns, 上限ns, 次数]
+            "buckets_ns": buckets,
+        }
+
+
+class EngineMetrics:
+    """一次运行的计时统计"""
+
+    def __init__(self):
+        self.click_time = LogHistogram()  # 每次调用点击后端的耗时
+        self.lateness = LogHistogram()  # 每次点击相对计划时间的延迟
+        self.cycle_time = LogHistogram()  # 每轮循环的实际时长（含循环间隔）
+        self.match_time = LogHistogram()  # 每轮循环前定位模板区域的耗时
+        self.change_wait = LogHistogram()  # 等待区域内容变化的时长
+
+    def to_dict(self):
+        return {
+            "click_time": self.click_time.to_dict(),
+            "lateness": self.lateness.to_dict(),
+            "cycle_time": self.cycle_time.to_dict(),
+            "match_time": self.match_time.to_dict(),
+            "change_wait": self.change_wait.to_dict(),
+        }
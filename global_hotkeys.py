@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+全局快捷键
+窗口没有焦点时（点击运行中焦点总在其他程序上）也能响应的快捷键。
+用 X11 XRecord 扩展（xrecord.XRecordListener）在后台线程中监听所有按键（只旁听，不拦截按键，其他程序照常收到），
+按下绑定的组合键时直接在监听线程中调用回调，不经过 Tk 事件循环
+"""
+
+import os
+
+from xrecord import XRecordListener
+
+# 快捷键设置文件（在配置目录中，每行 "动作 = 组合键"，# 开头为注释）
+HOTKEY_FILE = "hotkeys.txt"
+
+# 默认绑定：紧急停止、暂停/继续
+DEFAULT_HOTKEYS = {
+    "stop": "Escape",
+    "pause": "F9",
+}
+
+# 切换配置的动作前缀（如 "profile:test2 = Ctrl+Alt+1"）
+PROFILE_ACTION_PREFIX = "profile:"
+
+# 修饰键名称 -> X11 修饰键掩码（ShiftMask、ControlMask、Mod1Mask、Mod4Mask）
+MODIFIER_MASKS = {
+    "shift": 1 << 0,
+    "ctrl": 1 << 2,
+    "control": 1 << 2,
+    "alt": 1 << 3,
+    "super": 1 << 6,
+    "win": 1 << 6,
+}
+
+# 参与匹配的修饰键（忽略 CapsLock、NumLock 等锁定键）
+MODIFIER_MASK_ALL = (1 << 0) | (1 << 2) | (1 << 3) | (1 << 6)
+
+
+def parse_hotkey(text):
+    """解析组合键（如 "Ctrl+Alt+1"、"F9"、"Escape"），返回 (修饰键掩码, 按键名称)"""
+    parts = [part.strip() for part in text.split("+")]
+    if not parts or not parts[-1]:
+        raise ValueError(f"快捷键格式错误: {text}")
+    mask = 0
+    for part in parts[:-1]:
+        try:
+            mask |= MODIFIER_MASKS[part.lower()]
+        except KeyError:
+            raise ValueError(f"未知的修饰键: {part}")
+    return mask, parts[-1]
+
+
+def check_action(action):
+    """检查动作名称，无效时抛出 ValueError"""
+    if action in DEFAULT_HOTKEYS:
+        return
+    if action.startswith(PROFILE_ACTION_PREFIX) and action[len(PROFILE_ACTION_PREFIX):].strip():
+        return
+    raise ValueError(f"未知的快捷键动作: {action}")
+
+
+def load_hotkeys(config_dir):
+    """读取快捷键设置，返回 动作 -> 组合键；文件不存在时使用默认绑定
+
+    文件中的设置覆盖默认绑定，组合键留空表示取消该动作的绑定。
+    """
+    hotkeys = dict(DEFAULT_HOTKEYS)
+    path = os.path.join(config_dir, HOTKEY_FILE)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        return hotkeys
+
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        action, separator, key = line.partition("=")
+        if not separator:
+            raise ValueError(f"{HOTKEY_FILE} 第{number}行格式错误（应为 动作 = 组合键）")
+        action = action.strip()
+        key = key.strip()
+        check_action(action)
+        if key:
+            parse_hotkey(key)
+            hotkeys[action] = key
+        else:
+            hotkeys.pop(action, None)
+    return hotkeys
+
+
+class HotkeyListener:
+    """全局快捷键监听器（X11 XRecord 扩展，仅 Linux）
+
+    hotkeys 为 动作 -> 组合键，按下组合键时在监听线程中调用 on_hotkey(动作)，
+    回调应尽快返回（如只设置事件、放入队列）。按住按键的自动重复只触发一次。
+    """
+
+    def __init__(self, hotkeys, on_hotkey, display_name=None):
+        self.on_hotkey = on_hotkey
+        self.listener = XRecordListener(
+            "KeyPress", "KeyRelease", self.on_event, display_name, feature="全局快捷键"
+        )
+        X = self.listener.X
+        control_display = self.listener.control_display
+
+        # (修饰键掩码, 键码) -> 动作；一个按键名称可能对应多个键码
+        self.bindings = {}
+        try:
+            from Xlib import XK
+            for action, text in hotkeys.items():
+                mask, name = parse_hotkey(text)
+                keysym = XK.string_to_keysym(name)
+                if keysym == X.NoSymbol:
+                    raise ValueError(f"未知的按键: {name}")
+                keycodes = {keycode for keycode, _ in control_display.keysym_to_keycodes(keysym)}
+                if not keycodes:
+                    raise ValueError(f"键盘上没有这个按键: {name}")
+                for keycode in keycodes:
+                    self.bindings[(mask, keycode)] = action
+        except ValueError:
+            self.listener.close()
+            raise
+
+        # 修饰键的键码 -> 掩码：按下/松开时自行维护修饰键状态
+        # （XRecord 截获的设备事件中 state 字段不一定可靠）
+        self.modifier_keycodes = {}
+        for index, keycodes in enumerate(control_display.get_modifier_mapping()):
+            mask = 1 << index
+            if mask & MODIFIER_MASK_ALL:
+                for keycode in keycodes:
+                    if keycode:
+                        self.modifier_keycodes[keycode] = mask
+        self.key_press = X.KeyPress
+        self.key_release = X.KeyRelease
+        self.modifiers = 0  # 当前按住的修饰键
+        self.pressed = set()  # 正在按住的键码（过滤自动重复）
+
+    @property
+    def error(self):
+        """监听线程中发生的错误"""
+        return self.listener.error
+
+    def start(self):
+        """在后台线程中开始监听"""
+        self.listener.start()
+
+    def on_event(self, event, now):
+        """按键事件：维护修饰键状态，匹配绑定的组合键"""
+        keycode = event.detail
+        modifier = self.modifier_keycodes.get(keycode, 0)
+        if event.type == self.key_release:
+            self.pressed.discard(keycode)
+            self.modifiers &= ~modifier
+            return
+        if event.type != self.key_press or keycode in self.pressed:
+            return
+        self.pressed.add(keycode)
+        if modifier:
+            self.modifiers |= modifier
+            return
+        action = self.bindings.get((self.modifiers, keycode))
+        if action is not None:
+            try:
+                self.on_hotkey(action)
+            except Exception as e:
+                print(f"快捷键 {action} 处理出错: {e}")
+
+    def stop(self):
+        """停止监听"""
+        self.listener.stop()
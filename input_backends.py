@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+鼠标输入后端
+点击引擎通过统一的 InputBackend 接口发送点击，可选择不同的实现
+"""
+
+import time
+from array import array
+
+# X11 按键编号对应的 pyautogui 按键名称
+PYAUTOGUI_BUTTONS = {1: "left", 2: "middle", 3: "right"}
+
+
+class InputBackend:
+    """鼠标输入后端接口"""
+
+    # 后端名称（保存在配置文件中）
+    name = ""
+    # 该后端可以稳定支持的连续点击最小间隔（秒）
+    min_click_interval = 0.0
+
+    def click(self, x, y, button=1):
+        """在屏幕坐标 (x, y) 处单击鼠标按键（1 左键，2 中键，3 右键）"""
+        raise NotImplementedError
+
+    def close(self):
+        """释放后端占用的资源"""
+
+
+class PyAutoGUIBackend(InputBackend):
+    """pyautogui 后端（默认，跨平台）
+
+    每次点击都会经过 pyautogui 的 PAUSE 延迟和移动后点击流程，速度较慢。
+    """
+
+    name = "pyautogui"
+    min_click_interval = 0.05
+
+    def __init__(self):
+        import pyautogui
+
+        # 禁用pyautogui的安全机制（小心使用）
+        pyautogui.FAILSAFE = False
+        self._click = pyautogui.click
+
+    def click(self, x, y, button=1):
+        if button == 1:
+            self._click(x, y)
+        else:
+            self._click(x, y, button=PYAUTOGUI_BUTTONS[button])
+
+
+class XTestBackend(InputBackend):
+    """X11 XTest 后端（仅 Linux）
+
+    直接通过 XTest 扩展发送移动、按下和抬起事件，三个请求一次性发送（一次 flush），
+    没有 pyautogui 的额外延迟。
+    """
+
+    name = "xtest"
+    min_click_interval = 0.001
+
+    def __init__(self, display_name=None):
+        try:
+            from Xlib import X, display
+            from Xlib.ext import xtest
+        except ImportError:
+            raise RuntimeError("XTest 后端需要安装 python-xlib")
+
+        self._X = X
+        self._fake_input = xtest.fake_input
+        try:
+            self.display = display.Display(display_name)
+        except Exception as e:
+            raise RuntimeError(f"无法连接X11显示: {e}")
+        if not self.display.has_extension("XTEST"):
+            self.display.close()
+            raise RuntimeError("X服务器不支持XTest扩展")
+
+    def click(self, x, y, button=1):
+        X = self._X
+        fake_input = self._fake_input
+        fake_input(self.display, X.MotionNotify, x=int(x), y=int(y))
+        fake_input(self.display, X.ButtonPress, button)
+        fake_input(self.display, X.ButtonRelease, button)
+        self.display.flush()
+
+    def close(self):
+        self.display.close()
+
+
+class RecordingBackend(InputBackend):
+    """空后端：不发送真实点击，只记录点击时间和坐标（用于测试和基准）
+
+    record=False 时不记录（界面和命令行选择的空后端），长时间运行也不会占用越来越多的内存。
+    """
+
+    name = "null"
+    min_click_interval = 0.0
+
+    def __init__(self, record=True):
+        self.record = record
+        self.times = array("q")  # time.monotonic_ns() 时间戳
+        self.xs = array("i")
+        self.ys = array("i")
+
+    def click(self, x, y, button=1):
+        if self.record:
+            self.times.append(time.monotonic_ns())
+            self.xs.append(x)
+            self.ys.append(y)
+
+    def clear(self):
+        """清空已记录的点击"""
+        del self.times[:]
+        del self.xs[:]
+        del self.ys[:]
+
+
+# 可用的后端（名称 -> 类）
+BACKENDS = {
+    PyAutoGUIBackend.name: PyAutoGUIBackend,
+    XTestBackend.name: XTestBackend,
+    RecordingBackend.name: RecordingBackend,
+}
+
+DEFAULT_BACKEND = PyAutoGUIBackend.name
+
+
+def create_backend(name, record=False):
+    """按名称创建输入后端，失败时抛出 RuntimeError
+
+    空后端默认不记录点击，record=True 时记录（测试和基准用）。
+    """
+    try:
+        backend_class = BACKENDS[name]
+    except KeyError:
+        raise RuntimeError(f"未知的点击后端: {name}")
+    if backend_class is RecordingBackend:
+        return RecordingBackend(record=record)
+    return backend_class()
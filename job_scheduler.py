@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多任务调度器
+多个独立的点击任务（各自的配置、区域和限制）共用一个调度线程，
+按下一次点击的截止时间用最小堆排序，依次执行
+"""
+
+import heapq
+import itertools
+import threading
+
+from click_engine import ClickEngine, DeadlineScheduler, PRECISE_WAIT_NS
+
+
+class ClickJob(ClickEngine):
+    """调度器中的一个点击任务
+
+    与点击引擎使用同一个 step()（包括模板定位、等待区域变化、时长/次数限制和暂停），
+    只是不使用自己的点击线程，由调度线程等待到截止时间后调用 step()。
+    """
+
+    def __init__(self, job_id, name, plan, backend):
+        super().__init__(plan, backend)
+        self.job_id = job_id
+        self.name = name
+        self.removed = False
+        self.heap_entry = None  # 堆中有效条目的序号，None 表示不在堆中（暂停或正在点击）
+
+    def finish(self):
+        """任务结束（达到限制、出错或被移除），释放点击后端和截屏"""
+        if not self.status.finished:
+            super().finish()
+            self.release()
+
+
+class JobScheduler:
+    """多任务点击调度器
+
+    所有任务的下一次点击按截止时间放在一个最小堆中，由单个调度线程依次执行，
+    因此不同任务的点击不会重叠。任务可以在运行中随时添加、移除、暂停和继续。
+    堆中的条目不直接删除：任务移除或暂停时只清除它的 heap_entry，过期的条目在弹出时跳过。
+    """
+
+    def __init__(self, precise_wait_ns=PRECISE_WAIT_NS):
+        # 调度线程在它上面等待截止时间，wake() 设置 interrupt 后立即醒来
+        self.waiter = DeadlineScheduler(precise_wait_ns=precise_wait_ns)
+        self.waiter.interrupt = threading.Event()
+        self.heap = []  # (截止时间, 序号, 任务)
+        self.jobs = {}  # 任务编号 -> 任务（含已结束的任务，直到被移除）
+        self.condition = threading.Condition()
+        self.sequence = itertools.count()
+        self.next_job_id = 1
+        self.current_job = None  # 调度线程正在执行点击的任务
+        self.is_running = False
+        self.thread = None
+
+    def add_job(self, name, plan, backend):
+        """添加任务并立即开始执行，返回任务对象"""
+        with self.condition:
+            job = ClickJob(self.next_job_id, name, plan, backend)
+            self.next_job_id += 1
+            job.prepare()
+            self.jobs[job.job_id] = job
+            self.push(job, job.scheduler.deadline_ns)
+            self.start()
+            # 唤醒调度线程，新任务可能比当前等待的任务更早
+            self.wake()
+        return job
+
+    def remove_job(self, job_id):
+        """移除任务（正在运行的任务会被停止）"""
+        with self.condition:
+            job = self.jobs.pop(job_id, None)
+            if job is None:
+                return
+            # 堆中的条目在弹出时跳过（延迟删除）
+            job.removed = True
+            job.heap_entry = None
+            job.stop()
+            self.wake()
+            # 正在点击的任务由调度线程在点击结束后释放
+            if job is not self.current_job:
+                job.finish()
+
+    def pause_job(self, job_id):
+        """暂停任务（只能暂停运行中的任务），剩余的时长和次数保持不变"""
+        with self.condition:
+            job = self.jobs[job_id]
+            job.pause()
+            # 暂停的任务不在堆中，继续时重新加入
+            job.heap_entry = None
+            self.wake()
+
+    def resume_job(self, job_id):
+        """继续暂停的任务，截止时间顺延暂停的时长"""
+        with self.condition:
+            job = self.jobs[job_id]
+            job.resume()
+            # 正在点击的任务由调度线程在点击结束后放回堆中
+            if job is not self.current_job:
+                job.apply_pause_shift()
+                self.push(job, job.scheduler.deadline_ns)
+                self.wake()
+
+    def wake(self):
+        """唤醒调度线程重新检查堆顶（调用时需持有锁）"""
+        self.condition.notify()
+        self.waiter.interrupt.set()
+
+    def push(self, job, deadline):
+        """把任务的下一次截止时间加入堆中（调用时需持有锁），之前的条目失效"""
+        job.heap_entry = next(self.sequence)
+        heapq.heappush(self.heap, (deadline, job.heap_entry, job))
+
+    def job_list(self):
+        """按编号顺序返回所有任务"""
+        with self.condition:
+            return [self.jobs[job_id] for job_id in sorted(self.jobs)]
+
+    def start(self):
+        """启动调度线程（已启动时不做任何事）"""
+        with self.condition:
+            if self.is_running:
+                return
+            self.is_running = True
+            self.thread = threading.Thread(target=self.scheduler_loop, daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        """停止调度线程并结束所有任务"""
+        with self.condition:
+            self.is_running = False
+            self.heap.clear()
+            self.wake()
+            for job in self.jobs.values():
+                job.heap_entry = None
+                job.stop()
+                if job is not self.current_job:
+                    job.finish()
+            thread = self.thread
+        # 等待调度线程退出，避免之后重新启动时新旧线程同时运行
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def scheduler_loop(self):
+        """调度循环：等待堆顶任务的截止时间，执行它的一次点击，再放回堆中"""
+        heap = self.heap
+        condition = self.condition
+        waiter = self.waiter
+        while True:
+            with condition:
+                while self.is_running:
+                    if heap and heap[0][1] != heap[0][2].heap_entry:
+                        heapq.heappop(heap)
+                        continue
+                    if not heap:
+                        condition.wait()
+                        continue
+                    break
+                if not self.is_running:
+                    return
+                deadline = heap[0][0]
+                waiter.interrupt.clear()
+
+            # 在锁外等待到堆顶任务的截止时间（粗略休眠后精确收尾），
+            # 添加、移除、暂停、继续任务或停止调度器时立即醒来，重新检查堆顶
+            if waiter.sleep_until(deadline) < deadline:
+                continue
+
+            with condition:
+                if not self.is_running:
+                    return
+                if not heap or heap[0][0] != deadline or heap[0][1] != heap[0][2].heap_entry:
+                    continue
+                _, _, job = heapq.heappop(heap)
+                job.heap_entry = None
+                self.current_job = job
+
+            try:
+                next_deadline = job.step()
+            except Exception as e:
+                print(f"任务 {job.name} 点击过程中发生错误: {e}")
+                next_deadline = None
+
+            with condition:
+                self.current_job = None
+                if next_deadline is None or job.removed or not self.is_running or not job.is_running:
+                    job.finish()
+                elif job.state == "running":
+                    # 点击期间暂停后又继续的，截止时间同样顺延暂停的时长
+                    job.apply_pause_shift()
+                    self.push(job, job.scheduler.deadline_ns)
+                # 点击期间被暂停的任务不放回堆中，由 resume_job() 重新加入
@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+宏录制与回放
+录制真实的鼠标点击（time.monotonic_ns 时间戳），保存为紧凑的二进制文件，
+回放时按绝对截止时间重现每次点击，可以调整速度并按偏差设置添加随机偏移
+
+文件格式：32 字节文件头 + 连续的定长事件记录（小端序，字段见 EVENT_FIELDS）
+- 文件头：魔数、格式版本、每条记录的字节数、录制开始时间（Unix 纳秒）
+- 事件：相对录制开始的时间 t（纳秒）、屏幕坐标 x/y、按键 button（1 左键，2 中键，3 右键）
+录制时按块追加写入，程序中途退出也只会丢失最后一块；文件末尾不完整的记录在读取时忽略。
+
+很长的宏（上千万次点击）用 MacroReader 以内存映射方式按块读取，内存占用与文件长度无关。
+"""
+
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+
+from click_engine import DeadlineScheduler, RunStatus, MAX_CATCH_UP_NS, SCHEDULE_BLOCK_SIZE
+from engine_stats import EngineMetrics
+from xrecord import XRecordListener
+
+# 宏文件扩展名
+MACRO_SUFFIX = ".macro"
+
+# 文件头：魔数、格式版本、每条记录的字节数、录制开始时间（Unix 纳秒），补齐到 32 字节
+MACRO_MAGIC = b"ACMACRO\0"
+MACRO_VERSION = 1
+HEADER = struct.Struct("<8sHHq12x")
+
+# 事件记录的字段（numpy 结构化类型的字段描述，17 字节/条，一小时每秒 10 次点击约 600KB）
+EVENT_FIELDS = [("t", "<i8"), ("x", "<i4"), ("y", "<i4"), ("button", "u1")]
+
+# 录制时每攒够这么多事件追加写入一次
+RECORD_BLOCK_SIZE = 256
+
+# 录制的鼠标按键（4/5 等为滚轮，不录制）
+RECORD_BUTTONS = (1, 2, 3)
+
+# 回放时后台线程预先读取的块数
+PREFETCH_CHUNKS = 2
+
+
+def event_dtype():
+    """事件记录的 numpy 结构化类型"""
+    import numpy as np
+
+    return np.dtype(EVENT_FIELDS)
+
+
+def read_header(f):
+    """读取并检查文件头，返回 (记录字节数, 录制开始时间)，格式不对时抛出 ValueError"""
+    data = f.read(HEADER.size)
+    if len(data) < HEADER.size:
+        raise ValueError("不是有效的宏文件（文件头不完整）")
+    magic, version, record_size, created_ns = HEADER.unpack(data)
+    if magic != MACRO_MAGIC:
+        raise ValueError("不是有效的宏文件")
+    if version != MACRO_VERSION or record_size != event_dtype().itemsize:
+        raise ValueError(f"不支持的宏文件版本: {version}")
+    return record_size, created_ns
+
+
+def load_macro(path):
+    """读取整个宏文件，返回事件数组（numpy 结构化数组，按时间排序）"""
+    import numpy as np
+
+    with open(path, 'rb') as f:
+        record_size, _ = read_header(f)
+        count = (os.fstat(f.fileno()).st_size - HEADER.size) // record_size
+        return np.fromfile(f, dtype=event_dtype(), count=count)
+
+
+class MacroReader:
+    """以内存映射方式读取宏文件
+
+    打开文件只读取文件头，事件在回放时由 chunks() 按块读取：后台线程提前复制下一块
+    （缺页读盘发生在后台线程，不影响回放线程的定时），复制后立即释放这段映射的页面，
+    因此内存占用只有预读的几块，与文件长度无关。
+    """
+
+    def __init__(self, path):
+        import numpy as np
+
+        self.path = path
+        with open(path, 'rb') as f:
+            record_size, self.created_ns = read_header(f)
+            self.count = (os.fstat(f.fileno()).st_size - HEADER.size) // record_size
+            # 空文件无法映射
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.count else None
+        self.record_size = record_size
+        self.events = (
+            np.frombuffer(self.map, dtype=event_dtype(), count=self.count, offset=HEADER.size)
+            if self.count else np.zeros(0, dtype=event_dtype())
+        )
+
+    def __len__(self):
+        return self.count
+
+    def time_at(self, index):
+        """第 index 个事件的时间（纳秒，相对录制开始）"""
+        return int(self.events["t"][index])
+
+    def duration_ns(self):
+        """最后一个事件的时间（纳秒）"""
+        return self.time_at(self.count - 1) if self.count else 0
+
+    def find_time(self, t):
+        """第一个时间不早于 t（纳秒）的事件序号
+
+        手写二分查找：numpy.searchsorted 会先把不连续的字段复制成连续数组（读完整个文件），
+        这里只访问约 log2(事件数) 条记录。
+        """
+        times = self.events["t"]
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if times[middle] < t:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def release(self, begin, end):
+        """释放事件 [begin, end) 占用的映射页面（之后再访问会重新从文件读取）"""
+        if self.map is None or not hasattr(mmap, "MADV_DONTNEED"):
+            return
+        start = HEADER.size + begin * self.record_size
+        start -= start % mmap.PAGESIZE
+        stop = HEADER.size + end * self.record_size
+        self.map.madvise(mmap.MADV_DONTNEED, start, stop - start)
+
+    def chunks(self, start=0, chunk_size=SCHEDULE_BLOCK_SIZE):
+        """从第 start 个事件开始按块返回事件（每块是独立的数组副本）
+
+        后台线程最多提前读取 PREFETCH_CHUNKS 块；生成器被关闭时后台线程随之结束。
+        """
+        chunks = queue.Queue(PREFETCH_CHUNKS)
+        stopped = threading.Event()
+
+        def put(chunk):
+            # 队列满时等待回放线程取走，生成器已关闭时返回 False
+            while not stopped.is_set():
+                try:
+                    chunks.put(chunk, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def prefetch():
+            for begin in range(start, self.count, chunk_size):
+                end = min(begin + chunk_size, self.count)
+                chunk = self.events[begin:end].copy()
+                self.release(begin, end)
+                if not put(chunk):
+                    return
+            put(None)
+
+        thread = threading.Thread(target=prefetch, daemon=True)
+        thread.start()
+        try:
+            while True:
+                chunk = chunks.get()
+                if chunk is None:
+                    return
+                yield chunk
+        finally:
+            stopped.set()
+            thread.join()
+
+    def close(self):
+        """关闭内存映射（之前 chunks() 返回的块是副本，仍然可以使用）"""
+        if self.map is not None:
+            self.events = None
+            self.map.close()
+            self.map = None
+
+
+class MacroWriter:
+    """宏文件写入器：事件先放入定长缓冲区，攒满一块再追加写入文件"""
+
+    def __init__(self, path, block_size=RECORD_BLOCK_SIZE):
+        import numpy as np
+
+        self.path = path
+        self.buffer = np.zeros(block_size, dtype=event_dtype())
+        self.size = 0  # 缓冲区中的事件数
+        self.count = 0  # 已写入（含缓冲区中）的事件总数
+        self.start_ns = time.monotonic_ns()  # 事件时间从这里开始计算
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MACRO_MAGIC, MACRO_VERSION, self.buffer.itemsize, time.time_ns()))
+
+    def add(self, timestamp_ns, x, y, button=1):
+        """添加一个事件（timestamp_ns 为 time.monotonic_ns 时间戳）"""
+        self.buffer[self.size] = (timestamp_ns - self.start_ns, x, y, button)
+        self.size += 1
+        self.count += 1
+        if self.size == len(self.buffer):
+            self.flush()
+
+    def flush(self):
+        """把缓冲区中的事件写入文件"""
+        if self.size:
+            self.file.write(self.buffer[:self.size].tobytes())
+            self.size = 0
+        self.file.flush()
+
+    def close(self):
+        """写入剩余事件并关闭文件"""
+        if not self.file.closed:
+            self.flush()
+            os.fsync(self.file.fileno())
+            self.file.close()
+
+
+class MacroRecorder:
+    """鼠标点击录制器（X11 XRecord 扩展，仅 Linux）
+
+    XRecord 在服务器端截获所有客户端的按键按下事件，不影响正常操作。
+    录制在后台线程中进行，每个事件到达时用 time.monotonic_ns 记录时间。
+    """
+
+    def __init__(self, path, display_name=None):
+        self.listener = XRecordListener(
+            "ButtonPress", "ButtonPress", self.on_event, display_name, feature="录制"
+        )
+        self.button_press = self.listener.X.ButtonPress
+        try:
+            self.writer = MacroWriter(path)
+        except OSError:
+            self.listener.close()
+            raise
+
+    @property
+    def count(self):
+        """已录制的事件数"""
+        return self.writer.count
+
+    def start(self):
+        """在后台线程中开始录制"""
+        self.listener.start()
+
+    def on_event(self, event, now):
+        """按键按下事件：记录点击的位置、按键和到达时间"""
+        if event.type == self.button_press and event.detail in RECORD_BUTTONS:
+            self.writer.add(now, event.root_x, event.root_y, event.detail)
+
+    def stop(self):
+        """停止录制并关闭文件，返回录制的事件数"""
+        self.listener.stop()
+        self.writer.close()
+        if self.listener.error is not None:
+            raise RuntimeError(f"录制失败: {self.listener.error}")
+        return self.writer.count
+
+
+class MacroPlayer:
+    """宏回放引擎
+
+    每个事件的截止时间是 开始时间 + t / speed（绝对时间，不累积误差），
+    事件按块预先计算截止时间和偏移后的坐标，回放线程只需依次等待和点击。
+    偏移与随机点击相同：按无偏差概率决定是否偏移，偏移量在 ±x_offset/±y_offset 内均匀取值。
+    repeat 为回放次数（None 表示一直重复），每次重复紧接上一次的最后一个事件开始。
+    events 可以是事件数组或 MacroReader（按块流式读取）；start_event 为第一次回放的起始事件序号，
+    中断后从 position 处继续即可接上（第一个事件立即执行）。
+    与点击引擎相同，所有等待都在 stop_event 上进行，事件之间的间隔再长 stop() 也会立即生效。
+    """
+
+    def __init__(self, events, backend, speed=1.0, x_offset=0, y_offset=0,
+                 no_offset_probability=1.0, repeat=1, seed=None, scheduler=None,
+                 block_size=SCHEDULE_BLOCK_SIZE, start_event=0):
+        import numpy as np
+
+        if speed <= 0:
+            raise ValueError("回放速度必须大于0")
+        if repeat is not None and repeat < 1:
+            raise ValueError("回放次数必须大于0")
+        if x_offset < 0 or y_offset < 0:
+            raise ValueError("偏移量不能为负数")
+        if not 0 <= start_event <= len(events):
+            raise ValueError(f"起始事件序号超出范围（共 {len(events)} 个事件）")
+        self.events = events
+        self.backend = backend
+        self.speed = float(speed)
+        self.x_offset = int(x_offset)
+        self.y_offset = int(y_offset)
+        self.no_offset_probability = float(no_offset_probability)
+        self.repeat = repeat
+        self.block_size = block_size
+        self.position = start_event  # 下一个要回放的事件序号
+        self.rng = np.random.default_rng(seed)
+        self.scheduler = scheduler or DeadlineScheduler()
+        # 所有等待都在该事件上进行，stop() 设置它后立即醒来
+        self.stop_event = threading.Event()
+        self.scheduler.interrupt = self.stop_event
+        self.status = RunStatus()
+        self.metrics = EngineMetrics()  # 点击耗时、相对计划时间的延迟
+        self.is_running = False
+        self.start_time = None
+        self.stop_requested_ns = None  # 请求停止的时刻（time.monotonic_ns）
+        self.stop_latency_ns = None  # 从请求停止到回放循环实际结束的时间
+        self.thread = None
+
+    def start(self):
+        """在后台线程中回放"""
+        self.prepare()
+        self.thread = threading.Thread(target=self.replay_loop, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        """在当前线程中回放，直到结束"""
+        self.prepare()
+        self.replay_loop()
+
+    def prepare(self):
+        """开始回放"""
+        self.is_running = True
+        self.stop_event.clear()
+        self.stop_requested_ns = None
+        self.stop_latency_ns = None
+        self.start_time = time.time()
+
+    def stop(self):
+        """请求停止回放（正在进行的等待会立即结束），可以重复调用"""
+        if self.is_running and self.stop_requested_ns is None:
+            self.stop_requested_ns = time.monotonic_ns()
+        self.is_running = False
+        self.stop_event.set()
+
+    def join(self, timeout=None):
+        """等待后台线程结束，超时返回 False"""
+        if self.thread is not None:
+            self.thread.join(timeout)
+            return not self.thread.is_alive()
+        return True
+
+    def scaled(self, t):
+        """录制时间 t（纳秒）按回放速度换算后的时间"""
+        return t if self.speed == 1.0 else int(t / self.speed)
+
+    def time_at(self, index):
+        """第 index 个事件的录制时间（纳秒）"""
+        if isinstance(self.events, MacroReader):
+            return self.events.time_at(index)
+        return int(self.events["t"][index])
+
+    def iter_blocks(self, start):
+        """从第 start 个事件开始按块返回事件"""
+        if isinstance(self.events, MacroReader):
+            return self.events.chunks(start, self.block_size)
+        events = self.events
+        return (events[begin:begin + self.block_size] for begin in range(start, len(events), self.block_size))
+
+    def prepare_block(self, block, base_ns):
+        """计算一块事件的截止时间和点击坐标，返回 [(截止时间, x, y, 按键), ...]"""
+        import numpy as np
+
+        t = block["t"]
+        if self.speed != 1.0:
+            t = (t / self.speed).astype(np.int64)
+        deadline = base_ns + t
+
+        x = block["x"].astype(np.int64)
+        y = block["y"].astype(np.int64)
+        if self.x_offset or self.y_offset:
+            count = len(block)
+            use_offset = self.rng.random(count) >= self.no_offset_probability
+            x += np.where(use_offset, self.rng.integers(-self.x_offset, self.x_offset + 1, size=count), 0)
+            y += np.where(use_offset, self.rng.integers(-self.y_offset, self.y_offset + 1, size=count), 0)
+        return list(zip(deadline.tolist(), x.tolist(), y.tolist(), block["button"].tolist()))
+
+    def replay_loop(self):
+        """回放循环"""
+        scheduler = self.scheduler
+        status = self.status
+        click = self.backend.click
+        click_time = self.metrics.click_time
+        lateness = self.metrics.lateness
+        monotonic_ns = time.monotonic_ns
+        total = len(self.events)
+        scheduler.start()
+        # 从中间开始时，起始事件在开始后立即执行
+        base_ns = scheduler.deadline_ns
+        if self.position < total:
+            base_ns -= self.scaled(self.time_at(self.position))
+        shift_ns = 0  # 落后太多时整体顺延的时间
+        loop = 0
+        try:
+            while self.is_running and total and (self.repeat is None or loop < self.repeat):
+                blocks = self.iter_blocks(self.position)
+                try:
+                    for block in blocks:
+                        for deadline, x, y, button in self.prepare_block(block, base_ns):
+                            if not self.is_running:
+                                return
+                            late = scheduler.wait_until(deadline + shift_ns)
+                            if late is None:
+                                # 等待被 stop() 打断
+                                return
+                            if late > MAX_CATCH_UP_NS:
+                                # 落后太多（如系统休眠）时整体顺延，之后的事件保持原来的间隔
+                                shift_ns += late
+                            click_begin = monotonic_ns()
+                            click(x, y, button)
+                            click_time.record(monotonic_ns() - click_begin)
+                            lateness.record(late)
+                            status.click_count += 1
+                            self.position += 1
+                finally:
+                    blocks.close()
+                loop += 1
+                # 下一次重复从本次的最后一个事件开始计时
+                self.position = 0
+                base_ns = scheduler.deadline_ns
+                shift_ns = 0
+        except Exception as e:
+            print(f"回放过程中发生错误: {e}")
+        finally:
+            self.is_running = False
+            if self.stop_requested_ns is not None:
+                self.stop_latency_ns = time.monotonic_ns() - self.stop_requested_ns
+            status.finished = True
+            self.backend.close()
+            stats = scheduler.stats()
+            print(
+                f"定时统计: {stats['events']} 次点击, "
+                f"平均延迟 {stats['mean_lateness_ms']:.2f}ms, 最大延迟 {stats['max_lateness_ms']:.2f}ms"
+            )
+            if self.stop_latency_ns is not None:
+                print(f"停止用时: {self.stop_latency_ns / 1_000_000:.2f}ms")
+
+    def stats_dict(self):
+        """本次回放的统计（直方图和停止用时），可保存为 JSON"""
+        stats = self.metrics.to_dict()
+        if self.stop_latency_ns is not None:
+            stats["stop_latency_ms"] = self.stop_latency_ns / 1_000_000
+        return stats
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+屏幕截取
+创建时给定需要截取的区域，每次 tick() 只截取这些区域的外接矩形（限制在屏幕范围内）一次，
+同一帧内的使用者通过 grab() 取得各自区域的 numpy 视图（高 × 宽 × 3，RGB，不复制）。
+模板定位的所有搜索范围共用一个截屏对象，每个等待变化的区域各用一个只截取区域本身的截屏对象
+"""
+
+import ctypes
+import ctypes.util
+import os
+import sys
+import time
+
+
+def bounding_rect(rects):
+    """多个矩形 (x1, y1, x2, y2)（含右下角）的外接矩形"""
+    rects = list(rects)
+    if not rects:
+        raise ValueError("没有需要截取的区域")
+    return (
+        min(rect[0] for rect in rects),
+        min(rect[1] for rect in rects),
+        max(rect[2] for rect in rects),
+        max(rect[3] for rect in rects),
+    )
+
+
+class ScreenCapture:
+    """截屏方式基类"""
+
+    name = "base"
+
+    def __init__(self, rects):
+        self.left, self.top, self.right, self.bottom = bounding_rect(rects)
+        self.frame = None  # 最近一帧（外接矩形范围内的 RGB 数组）
+        self.frame_count = 0
+        self.total_capture_ns = 0
+        self.max_capture_ns = 0
+        self.first_tick_ns = None
+        self.last_tick_ns = None
+
+    def tick(self):
+        """截取新的一帧"""
+        begin = time.monotonic_ns()
+        self.frame = self.capture_frame()
+        end = time.monotonic_ns()
+        elapsed = end - begin
+        self.frame_count += 1
+        self.total_capture_ns += elapsed
+        if elapsed > self.max_capture_ns:
+            self.max_capture_ns = elapsed
+        if self.first_tick_ns is None:
+            self.first_tick_ns = begin
+        self.last_tick_ns = end
+
+    def clip_to_screen(self, width, height):
+        """把外接矩形限制在屏幕范围内，完全在屏幕外时抛出 RuntimeError"""
+        self.left = max(self.left, 0)
+        self.top = max(self.top, 0)
+        self.right = min(self.right, width - 1)
+        self.bottom = min(self.bottom, height - 1)
+        if self.right < self.left or self.bottom < self.top:
+            raise RuntimeError("截屏区域不在屏幕范围内")
+
+    def clip(self, rect):
+        """矩形 (x1, y1, x2, y2) 与截屏范围的交集（完全在范围外时右下角小于左上角）"""
+        x1, y1, x2, y2 = rect
+        return max(x1, self.left), max(y1, self.top), min(x2, self.right), min(y2, self.bottom)
+
+    def grab(self, rect):
+        """返回最近一帧中矩形区域 (x1, y1, x2, y2)（含右下角）的视图，还没有截取过时先截取一帧
+
+        部分超出截屏范围（屏幕）的区域只返回范围内的部分（左上角见 clip()），完全超出时返回空数组。
+        """
+        if self.frame is None:
+            self.tick()
+        x1, y1, x2, y2 = self.clip(rect)
+        return self.frame[
+            y1 - self.top:max(y2 - self.top + 1, 0),
+            x1 - self.left:max(x2 - self.left + 1, 0),
+        ]
+
+    def capture_frame(self):
+        """截取外接矩形，返回 RGB 数组"""
+        raise NotImplementedError
+
+    def stats(self):
+        """截屏统计：帧数、每帧耗时（毫秒）、实际和最高可达的帧率"""
+        count = self.frame_count
+        mean_ns = self.total_capture_ns / count if count else 0
+        span_ns = (self.last_tick_ns - self.first_tick_ns) if count > 1 else 0
+        return {
+            "capture": self.name,
+            "region": [self.left, self.top, self.right, self.bottom],
+            "frames": count,
+            "mean_capture_ms": mean_ns / 1_000_000,
+            "max_capture_ms": self.max_capture_ns / 1_000_000,
+            # 截屏本身允许的最高帧率
+            "max_rate": 1_000_000_000 / mean_ns if mean_ns else 0.0,
+            # 运行期间实际达到的帧率
+            "achieved_rate": (count - 1) * 1_000_000_000 / span_ns if span_ns else 0.0,
+        }
+
+    def close(self):
+        """释放资源"""
+
+
+class PyAutoGUICapture(ScreenCapture):
+    """使用 pyautogui（PIL）截屏，所有平台可用"""
+
+    name = "pyautogui"
+
+    def __init__(self, rects):
+        super().__init__(rects)
+        # Linux 上通常使用 MIT-SHM，只有退回 pyautogui 时才导入它
+        import numpy as np
+        try:
+            import pyautogui
+        except ImportError:
+            raise RuntimeError("截屏需要安装 pyautogui")
+
+        self.np = np
+        self.pyautogui = pyautogui
+        self.clip_to_screen(*pyautogui.size())
+
+    def capture_frame(self):
+        width = self.right - self.left + 1
+        height = self.bottom - self.top + 1
+        image = self.pyautogui.screenshot(region=(self.left, self.top, width, height))
+        return self.np.asarray(image.convert('RGB'))
+
+
+class XShmSegmentInfo(ctypes.Structure):
+    _fields_ = [
+        ("shmseg", ctypes.c_ulong),
+        ("shmid", ctypes.c_int),
+        ("shmaddr", ctypes.c_void_p),
+        ("readOnly", ctypes.c_int),
+    ]
+
+
+class XImage(ctypes.Structure):
+    # 只声明用到的前几个字段（结构体由 Xlib 分配，这里只通过指针读取）
+    _fields_ = [
+        ("width", ctypes.c_int),
+        ("height", ctypes.c_int),
+        ("xoffset", ctypes.c_int),
+        ("format", ctypes.c_int),
+        ("data", ctypes.c_void_p),
+        ("byte_order", ctypes.c_int),
+        ("bitmap_unit", ctypes.c_int),
+        ("bitmap_bit_order", ctypes.c_int),
+        ("bitmap_pad", ctypes.c_int),
+        ("depth", ctypes.c_int),
+        ("bytes_per_line", ctypes.c_int),
+        ("bits_per_pixel", ctypes.c_int),
+        ("red_mask", ctypes.c_ulong),
+        ("green_mask", ctypes.c_ulong),
+        ("blue_mask", ctypes.c_ulong),
+    ]
+
+
+# X11 / System V 共享内存常量
+Z_PIXMAP = 2
+ALL_PLANES = ctypes.c_ulong(-1).value
+IPC_PRIVATE = 0
+IPC_CREAT = 0o1000
+IPC_RMID = 0
+
+X_ERROR_HANDLER = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p)
+
+
+def load_library(name):
+    """按名称加载动态库，找不到时抛出 RuntimeError"""
+    path = ctypes.util.find_library(name)
+    if path is None:
+        raise RuntimeError(f"找不到 lib{name}")
+    return ctypes.CDLL(path)
+
+
+class XShmCapture(ScreenCapture):
+    """X11 MIT-SHM 截屏（Linux）
+
+    X 服务器把外接矩形的像素直接写入与本进程共享的内存，numpy 数组就是这块内存的视图，
+    每帧既不经过套接字传输图像，也不分配新的缓冲区。需要本地 X 服务器（含 Xvfb）。
+    """
+
+    name = "xshm"
+
+    def __init__(self, rects):
+        super().__init__(rects)
+        import numpy as np
+
+        self.display = None
+        self.image = None
+        self.pixels = None
+        self.shminfo = XShmSegmentInfo()
+        self.attached = False
+
+        x11 = load_library("X11")
+        xext = load_library("Xext")
+        libc = ctypes.CDLL(None, use_errno=True)
+        self.x11, self.xext, self.libc = x11, xext, libc
+
+        x11.XOpenDisplay.restype = ctypes.c_void_p
+        x11.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        x11.XDefaultScreen.argtypes = [ctypes.c_void_p]
+        x11.XRootWindow.restype = ctypes.c_ulong
+        x11.XRootWindow.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XDefaultVisual.restype = ctypes.c_void_p
+        x11.XDefaultVisual.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XDefaultDepth.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XDisplayWidth.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XDisplayHeight.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XSync.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        x11.XFree.argtypes = [ctypes.c_void_p]
+        x11.XCloseDisplay.argtypes = [ctypes.c_void_p]
+        x11.XSetErrorHandler.restype = ctypes.c_void_p
+        x11.XSetErrorHandler.argtypes = [ctypes.c_void_p]
+        xext.XShmQueryExtension.argtypes = [ctypes.c_void_p]
+        xext.XShmCreateImage.restype = ctypes.POINTER(XImage)
+        xext.XShmCreateImage.argtypes = [
+            ctypes.c_void_p, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_void_p,
+            ctypes.POINTER(XShmSegmentInfo), ctypes.c_uint, ctypes.c_uint,
+        ]
+        xext.XShmAttach.argtypes = [ctypes.c_void_p, ctypes.POINTER(XShmSegmentInfo)]
+        xext.XShmDetach.argtypes = [ctypes.c_void_p, ctypes.POINTER(XShmSegmentInfo)]
+        xext.XShmGetImage.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(XImage), ctypes.c_int, ctypes.c_int, ctypes.c_ulong,
+        ]
+        libc.shmget.argtypes = [ctypes.c_int, ctypes.c_size_t, ctypes.c_int]
+        libc.shmat.restype = ctypes.c_void_p
+        libc.shmat.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_int]
+        libc.shmdt.argtypes = [ctypes.c_void_p]
+        libc.shmctl.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_void_p]
+
+        try:
+            self.open(np)
+        except Exception:
+            self.close()
+            raise
+
+    def open(self, np):
+        """连接 X 服务器，创建共享内存图像并映射为 numpy 数组"""
+        x11, xext, libc = self.x11, self.xext, self.libc
+
+        self.display = x11.XOpenDisplay(None)
+        if not self.display:
+            raise RuntimeError("无法连接 X 显示服务器（DISPLAY 未设置？）")
+        if not xext.XShmQueryExtension(self.display):
+            raise RuntimeError("X 服务器不支持 MIT-SHM 扩展")
+
+        screen = x11.XDefaultScreen(self.display)
+        self.root = x11.XRootWindow(self.display, screen)
+
+        # 外接矩形限制在屏幕范围内（超出屏幕时 XShmGetImage 会报错）
+        self.clip_to_screen(x11.XDisplayWidth(self.display, screen), x11.XDisplayHeight(self.display, screen))
+        width = self.right - self.left + 1
+        height = self.bottom - self.top + 1
+
+        image = xext.XShmCreateImage(
+            self.display, x11.XDefaultVisual(self.display, screen), x11.XDefaultDepth(self.display, screen),
+            Z_PIXMAP, None, ctypes.byref(self.shminfo), width, height,
+        )
+        if not image:
+            raise RuntimeError("XShmCreateImage 失败")
+        self.image = image
+        if image.contents.bits_per_pixel != 32:
+            raise RuntimeError(f"不支持的屏幕像素格式（{image.contents.bits_per_pixel} 位）")
+
+        # 分配共享内存并映射到本进程
+        size = image.contents.bytes_per_line * height
+        shmid = libc.shmget(IPC_PRIVATE, size, IPC_CREAT | 0o600)
+        if shmid < 0:
+            raise RuntimeError(f"shmget 失败: {os.strerror(ctypes.get_errno())}")
+        self.shminfo.shmid = shmid
+        address = libc.shmat(shmid, None, 0)
+        if address is None or address == ctypes.c_void_p(-1).value:
+            libc.shmctl(shmid, IPC_RMID, None)
+            raise RuntimeError(f"shmat 失败: {os.strerror(ctypes.get_errno())}")
+        self.shminfo.shmaddr = address
+        self.shminfo.readOnly = 0
+        image.contents.data = address
+
+        # 附加到 X 服务器；远程显示等情况下会产生 X 错误，临时替换错误处理函数以免进程退出
+        errors = []
+        handler = X_ERROR_HANDLER(lambda display, event: errors.append(event) or 0)
+        previous = x11.XSetErrorHandler(ctypes.cast(handler, ctypes.c_void_p))
+        try:
+            xext.XShmAttach(self.display, ctypes.byref(self.shminfo))
+            x11.XSync(self.display, 0)
+        finally:
+            x11.XSetErrorHandler(previous)
+        # 双方都已映射后立即标记删除，进程异常退出时共享内存也会被回收
+        libc.shmctl(shmid, IPC_RMID, None)
+        if errors:
+            raise RuntimeError("XShmAttach 失败（MIT-SHM 只能用于本地 X 服务器）")
+        self.attached = True
+
+        # 共享内存的 numpy 视图：每行 bytes_per_line 字节，每像素4字节
+        buffer = (ctypes.c_uint8 * size).from_address(address)
+        pixels = np.frombuffer(buffer, dtype=np.uint8).reshape(height, image.contents.bytes_per_line)
+        pixels = pixels[:, :width * 4].reshape(height, width, 4)
+        # 常见的 TrueColor 格式为 BGRX，反向切片得到 RGB 视图（不复制）
+        if image.contents.red_mask == 0xFF0000:
+            self.pixels = pixels[..., 2::-1]
+        else:
+            self.pixels = pixels[..., :3]
+
+    def capture_frame(self):
+        if not self.xext.XShmGetImage(self.display, self.root, self.image, self.left, self.top, ALL_PLANES):
+            raise RuntimeError("XShmGetImage 失败")
+        return self.pixels
+
+    def close(self):
+        self.frame = None
+        self.pixels = None
+        if self.attached:
+            self.xext.XShmDetach(self.display, ctypes.byref(self.shminfo))
+            self.x11.XSync(self.display, 0)
+            self.attached = False
+        if self.image:
+            # XShm 图像的数据在共享内存中，只释放结构体本身
+            self.x11.XFree(self.image)
+            self.image = None
+        if self.shminfo.shmaddr:
+            self.libc.shmdt(self.shminfo.shmaddr)
+            self.shminfo.shmaddr = None
+        if self.display:
+            self.x11.XCloseDisplay(self.display)
+            self.display = None
+
+
+# 可用的截屏方式
+CAPTURES = {
+    PyAutoGUICapture.name: PyAutoGUICapture,
+    XShmCapture.name: XShmCapture,
+}
+
+
+def create_capture(rects, name=None):
+    """创建截屏方式
+
+    不指定名称时，Linux 上优先使用 MIT-SHM，不可用时退回 pyautogui。
+    """
+    if name is not None:
+        if name not in CAPTURES:
+            raise RuntimeError(f"未知的截屏方式: {name}")
+        return CAPTURES[name](rects)
+
+    if sys.platform.startswith("linux") and os.environ.get("DISPLAY"):
+        try:
+            return XShmCapture(rects)
+        except (OSError, RuntimeError) as e:
+            print(f"MIT-SHM 截屏不可用，改用 pyautogui: {e}")
+    return PyAutoGUICapture(rects)
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+模拟运行
+用虚拟时钟和空后端运行点击引擎（与实际运行相同的 clicking_loop、step 和时长/次数限制检查），
+等待只推进虚拟时间，不实际休眠，
+几秒内就能估算出长时间运行的点击次数、各区域的分布和限制触发的时刻
+"""
+
+import time
+from array import array
+
+from click_engine import ClickEngine, DeadlineScheduler
+from engine_stats import LogHistogram
+from input_backends import InputBackend
+
+
+class VirtualClock:
+    """虚拟时钟：提供与 time 模块相同的 time()、monotonic_ns()、sleep()，从 0 开始计时"""
+
+    def __init__(self):
+        self.now_ns = 0
+
+    def time(self):
+        return self.now_ns / 1_000_000_000
+
+    def monotonic_ns(self):
+        return self.now_ns
+
+    def sleep(self, seconds):
+        self.advance(int(round(seconds * 1_000_000_000)))
+
+    def advance(self, duration_ns):
+        """推进虚拟时间（纳秒）"""
+        if duration_ns > 0:
+            self.now_ns += duration_ns
+
+    def advance_to(self, deadline_ns):
+        """推进到 deadline_ns（已经过了时不变）"""
+        if deadline_ns > self.now_ns:
+            self.now_ns = deadline_ns
+
+
+class VirtualScheduler(DeadlineScheduler):
+    """虚拟时钟上的截止时间等待器：直接跳到截止时间，延迟只来自模拟的点击耗时"""
+
+    def sleep_until(self, deadline):
+        self.clock.advance_to(deadline)
+        return self.clock.monotonic_ns()
+
+
+class SimulatedBackend(InputBackend):
+    """模拟后端：不点击，只统计各区域的点击次数、点击间隔，并可记录时间线
+
+    每次点击让虚拟时钟前进 click_cost_ns，模拟实际后端的点击耗时。
+    """
+
+    name = "simulated"
+
+    def __init__(self, clock, area_count, click_cost_ns=0, timeline=False):
+        self.clock = clock
+        self.click_cost_ns = click_cost_ns
+        self.status = None  # 引擎的运行状态，用于读取当前区域
+        self.area_clicks = [0] * area_count
+        self.interval = LogHistogram()  # 相邻两次点击的间隔
+        self.first_click_ns = None
+        self.last_click_ns = None
+        # 时间线：点击时刻（纳秒）、坐标和区域序号
+        self.timeline = (array("q"), array("i"), array("i"), array("i")) if timeline else None
+
+    def click(self, x, y, button=1):
+        now = self.clock.now_ns
+        area = self.status.current_area_index
+        self.area_clicks[area] += 1
+        if self.last_click_ns is None:
+            self.first_click_ns = now
+        else:
+            self.interval.record(now - self.last_click_ns)
+        self.last_click_ns = now
+        if self.timeline is not None:
+            times, xs, ys, areas = self.timeline
+            times.append(now)
+            xs.append(x)
+            ys.append(y)
+            areas.append(area)
+        self.clock.advance(self.click_cost_ns)
+
+
+class SimulatedEngine(ClickEngine):
+    """统计循环次数的点击引擎（循环本身与 ClickEngine 完全相同）"""
+
+    def __init__(self, plan, backend, clock):
+        super().__init__(plan, backend, scheduler=VirtualScheduler(clock=clock), clock=clock)
+        self.cycle_count = 0
+
+    def begin_cycle(self, now):
+        self.cycle_count += 1
+        super().begin_cycle(now)
+
+
+class Simulation:
+    """用虚拟时钟模拟一次运行
+
+    - click_cost: 每次点击的耗时（秒），模拟实际后端的开销，默认为 0
+    - timeline: 是否记录每次点击的时间线（可用 write_timeline 保存为 CSV）
+    """
+
+    def __init__(self, plan, click_cost=0.0, timeline=False):
+        if any(plan.templates) or any(plan.change_areas):
+            raise ValueError("模拟运行不支持模板图像和等待变化的区域（需要实际截屏）")
+        if plan.duration_limit is None and plan.max_total_clicks is None:
+            raise ValueError("模拟运行需要时长或次数限制")
+        if click_cost < 0:
+            raise ValueError("点击耗时不能为负数")
+        self.plan = plan
+        self.clock = VirtualClock()
+        self.backend = SimulatedBackend(
+            self.clock, len(plan.areas), int(round(click_cost * 1_000_000_000)), timeline
+        )
+        self.engine = SimulatedEngine(plan, self.backend, self.clock)
+        self.backend.status = self.engine.status
+        self.wall_seconds = None
+
+    def run(self):
+        """运行到达到时长或次数限制，返回运行摘要"""
+        begin = time.perf_counter()
+        self.engine.run()
+        self.wall_seconds = time.perf_counter() - begin
+        return self.summary()
+
+    def stop_reason(self):
+        """停止原因：count（次数限制）、duration（时长限制）或 error"""
+        plan = self.plan
+        if plan.max_total_clicks is not None and self.engine.status.click_count >= plan.max_total_clicks:
+            return "count"
+        if plan.duration_limit is not None and self.clock.time() >= plan.duration_limit:
+            return "duration"
+        return "error"
+
+    def summary(self):
+        """运行摘要（可保存为 JSON），时间均为从开始起的虚拟时间（秒）"""
+        backend = self.backend
+        clicks = self.engine.status.click_count
+        end_seconds = self.clock.time()
+        area_clicks = backend.area_clicks
+        interval = backend.interval
+        return {
+            "clicks": clicks,
+            "cycles": self.engine.cycle_count,
+            "stop_reason": self.stop_reason(),
+            "end_seconds": end_seconds,
+            "first_click_seconds": None if backend.first_click_ns is None else backend.first_click_ns / 1_000_000_000,
+            "last_click_seconds": None if backend.last_click_ns is None else backend.last_click_ns / 1_000_000_000,
+            "clicks_per_hour": clicks / end_seconds * 3600 if end_seconds > 0 else None,
+            "duration_limit_seconds": self.plan.duration_limit,
+            "max_total_clicks": self.plan.max_total_clicks,
+            "area_clicks": area_clicks,
+            "area_clicks_min": min(area_clicks),
+            "area_clicks_max": max(area_clicks),
+            "click_interval_ms": dict(
+                interval.percentiles_ms((1, 50, 99)),
+                mean=interval.total / interval.count / 1_000_000 if interval.count else 0,
+                max=interval.max / 1_000_000,
+            ),
+            "cycle_time_ms": self.engine.metrics.cycle_time.percentiles_ms(),
+            "wall_seconds": self.wall_seconds,
+        }
+
+    def write_timeline(self, path):
+        """把时间线保存为 CSV（每行一次点击：秒, x, y, 区域编号（从 1 开始））"""
+        if self.backend.timeline is None:
+            raise ValueError("没有记录时间线")
+        times, xs, ys, areas = self.backend.timeline
+        rows = zip(times.tolist(), xs.tolist(), ys.tolist(), areas.tolist())
+        text = "seconds,x,y,area\n" + "".join(
+            f"{t / 1_000_000_000:.6f},{x},{y},{area + 1}\n" for t, x, y, area in rows
+        )
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
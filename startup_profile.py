@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+启动耗时分析（--profile-startup）
+以 -X importtime 重新启动程序，统计各模块导入耗时和首帧显示时间
+
+导入约定：界面启动时只导入 tkinter 和本程序的轻量模块，pyautogui、PIL、numpy、Xlib
+等较重的模块都在第一次用到时（区域选择、编译运行参数、开始点击、截屏、录制）才在函数内导入，
+新增的导入也应遵守，可用本分析检查首帧之前导入了哪些模块
+"""
+
+import json
+import os
+import sys
+import time
+
+# 子进程通过该环境变量得知需要记录启动时间点，并在首帧显示后退出
+PROFILE_ENV = "AUTOCLICK_PROFILE_STARTUP"
+
+# 子进程输出时间点数据的行前缀
+MARKS_PREFIX = "STARTUP_MARKS "
+
+# 报告中列出的模块数量
+TOP_MODULES = 15
+
+
+def is_profiling():
+    """当前进程是否为启动分析子进程"""
+    return os.environ.get(PROFILE_ENV) == "1"
+
+
+class StartupMarks:
+    """记录启动过程中的时间点（毫秒，相对模块开始加载）"""
+
+    def __init__(self, begin):
+        self.begin = begin
+        self.marks = {}
+
+    def mark(self, name):
+        self.marks[name] = round((time.perf_counter() - self.begin) * 1000, 2)
+
+    def emit(self):
+        """输出时间点数据给父进程"""
+        print(MARKS_PREFIX + json.dumps(self.marks), flush=True)
+
+
+def parse_importtime(text):
+    """解析 -X importtime 输出，返回 [(模块名, 自身耗时ms, 累计耗时ms, 嵌套层级), ...]"""
+    modules = []
+    for line in text.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # 表头
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules.append((name.strip(), int(fields[0]) / 1000, int(fields[1]) / 1000, depth))
+    return modules
+
+
+def profile_startup(script, output=None):
+    """以分析模式启动程序，打印启动耗时报告，可选写入 JSON 文件"""
+    import subprocess
+    import tempfile
+
+    env = dict(os.environ, **{PROFILE_ENV: "1"})
+    marks = {}
+    process_first_frame_ms = None
+
+    # -X importtime 输出到 stderr，写入临时文件，避免管道写满阻塞子进程
+    with tempfile.TemporaryFile(mode="w+", encoding="utf-8") as stderr_file:
+        begin = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, "-X", "importtime", script],
+            stdout=subprocess.PIPE,
+            stderr=stderr_file,
+            env=env,
+            text=True,
+            encoding="utf-8",
+        )
+        for line in process.stdout:
+            if line.startswith(MARKS_PREFIX):
+                process_first_frame_ms = round((time.perf_counter() - begin) * 1000, 2)
+                marks = json.loads(line[len(MARKS_PREFIX):])
+        process.wait()
+        stderr_file.seek(0)
+        stderr = stderr_file.read()
+
+    modules = parse_importtime(stderr)
+    top_level = [m for m in modules if m[3] == 0]
+    top_level.sort(key=lambda m: m[2], reverse=True)
+
+    report = {
+        "process_first_frame_ms": process_first_frame_ms,
+        "marks_ms": marks,
+        "total_import_ms": round(sum(m[2] for m in top_level), 2),
+        "imports_ms": {name: round(cumulative, 2) for name, _, cumulative, _ in top_level},
+    }
+
+    print("启动耗时报告")
+    if process_first_frame_ms is None:
+        print("  未能获得首帧时间（程序启动失败？）")
+        if stderr.strip():
+            print(stderr.strip().splitlines()[-1])
+    else:
+        print(f"  进程启动到首帧: {process_first_frame_ms:.1f}ms")
+    for name, value in marks.items():
+        print(f"  {name}: {value:.1f}ms")
+    print(f"  模块导入合计: {report['total_import_ms']:.1f}ms")
+    for name, _, cumulative, _ in top_level[:TOP_MODULES]:
+        print(f"    {cumulative:8.1f}ms  {name}")
+
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"报告已保存: {output}")
+    return report
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+模板图像匹配
+在搜索区域的截图中查找参考图像的位置（归一化互相关，金字塔由粗到细搜索）
+"""
+
+import numpy as np
+
+# 金字塔层数（每层缩小一半）
+PYRAMID_LEVELS = 3
+
+# 最粗一层的模板边长不小于该值，否则减少层数
+MIN_TEMPLATE_SIZE = 8
+
+# 细化时在上一层结果周围搜索的范围（像素）
+REFINE_RADIUS = 2
+
+# 最粗一层保留的候选位置数量（逐个细化，取最终得分最高的）
+COARSE_CANDIDATES = 3
+
+# 建议的最大搜索范围（像素数，约 800×600）：在这个范围内每轮定位只需几毫秒，
+# 更大的范围（如整个 1080p 屏幕约 20ms）耗时随面积增加，创建时打印警告
+MAX_SEARCH_PIXELS = 800 * 600
+
+# 默认匹配阈值（归一化互相关，-1 到 1）
+DEFAULT_THRESHOLD = 0.8
+
+# 灰度转换权重（ITU-R BT.601）
+GRAY_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def shrink(image, factor):
+    """按 factor×factor 的块取平均缩小，返回 float32 灰度图
+
+    image 为 uint8 的 RGB 数组（高 × 宽 × 3）或灰度数组。先按行、再按列把块内像素
+    累加到整数中（factor 不超过16时用 uint16），最后才转换为浮点数和灰度，
+    全分辨率的数据只被顺序读取一遍。
+    """
+    height = image.shape[0] // factor * factor
+    width = image.shape[1] // factor * factor
+    image = image[:height, :width]
+    if factor > 1:
+        rows = image[0::factor].astype(np.uint16 if factor <= 16 else np.uint32)
+        for dy in range(1, factor):
+            rows += image[dy::factor]
+        blocks = rows.reshape((height // factor, width // factor, factor) + image.shape[2:])
+        image = blocks[:, :, 0].copy()
+        for dx in range(1, factor):
+            image += blocks[:, :, dx]
+    if image.ndim == 3:
+        gray = image.astype(np.float32) @ GRAY_WEIGHTS
+    else:
+        gray = image.astype(np.float32)
+    if factor > 1:
+        gray *= 1.0 / (factor * factor)
+    return gray
+
+
+def phase_average(template, factor):
+    """缩小模板，并对模板相对缩小网格的所有对齐方式取平均
+
+    截图按固定网格缩小，模板在截图中的位置不一定与网格对齐，直接缩小的模板在
+    未对齐时得分会明显下降。对齐方式取平均后的模板对任意位置的得分都比较稳定。
+    """
+    if factor == 1:
+        return shrink(template, 1)
+    height = (template.shape[0] - factor + 1) // factor
+    width = (template.shape[1] - factor + 1) // factor
+    total = np.zeros((height, width), dtype=np.float32)
+    for dy in range(factor):
+        for dx in range(factor):
+            total += shrink(template[dy:dy + height * factor, dx:dx + width * factor], factor)
+    return total / (factor * factor)
+
+
+def window_sums(image, height, width):
+    """每个 height×width 窗口内像素的和与平方和（积分图）"""
+    image = image.astype(np.float64)
+    integral = np.zeros((image.shape[0] + 1, image.shape[1] + 1))
+    integral_sq = np.zeros_like(integral)
+    np.cumsum(np.cumsum(image, axis=0), axis=1, out=integral[1:, 1:])
+    np.cumsum(np.cumsum(image * image, axis=0), axis=1, out=integral_sq[1:, 1:])
+
+    def box(table):
+        return table[height:, width:] - table[:-height, width:] - table[height:, :-width] + table[:-height, :-width]
+
+    return box(integral), box(integral_sq)
+
+
+def normalized_scores(correlation, image, height, width, norm):
+    """互相关（与去均值模板的乘积和）除以窗口和模板的标准差，得到归一化互相关"""
+    sums, sums_sq = window_sums(image, height, width)
+    variance = np.maximum(sums_sq - sums * sums / (height * width), 0)
+    denominator = np.sqrt(variance) * norm
+    return np.where(denominator > 1e-6, correlation / np.maximum(denominator, 1e-6), 0.0)
+
+
+def rgb_array(image):
+    """转换为 uint8 数组，去掉 alpha 通道"""
+    image = np.asarray(image)
+    if image.ndim == 3:
+        image = image[..., :3]
+    return image
+
+
+class TemplateMatcher:
+    """模板匹配器
+
+    模板的灰度金字塔只在创建时计算一次。匹配时只把截图缩小到最粗一层，用 FFT
+    计算整个搜索区域的归一化互相关，取得分最高的几个候选位置，再逐层放大，
+    每层只截取并转换候选位置附近的一小块截图来细化。
+    """
+
+    def __init__(self, template, threshold=DEFAULT_THRESHOLD, levels=PYRAMID_LEVELS):
+        template = rgb_array(template)
+        self.height, self.width = template.shape[:2]
+        self.threshold = threshold
+
+        # 层数受模板尺寸限制
+        levels = max(1, levels)
+        while levels > 1 and min(self.height, self.width) >> (levels - 1) < MIN_TEMPLATE_SIZE:
+            levels -= 1
+        self.levels = levels
+
+        # 每层模板：去均值后的数组及其范数
+        self.pyramid = []
+        for level in range(levels):
+            gray = phase_average(template, 1 << level)
+            centered = gray - gray.mean()
+            norm = float(np.sqrt((centered.astype(np.float64) ** 2).sum()))
+            self.pyramid.append((centered, norm))
+        self.spectra = {}  # (层, 图像尺寸) -> 模板频谱的共轭
+
+    @classmethod
+    def from_file(cls, path, threshold=DEFAULT_THRESHOLD):
+        """从图像文件创建匹配器"""
+        from PIL import Image
+
+        with Image.open(path) as image:
+            return cls(np.asarray(image.convert('RGB')), threshold)
+
+    def locate(self, image):
+        """在图像中查找模板，返回 (x, y, 得分)；得分低于阈值时返回 None
+
+        image 为截图（RGB 或灰度数组），(x, y) 为模板左上角在图像中的位置。
+        """
+        image = rgb_array(image)
+        if image.shape[0] < self.height or image.shape[1] < self.width:
+            return None
+
+        # 最粗一层全图搜索
+        top = self.levels - 1
+        scores = self.score_map(shrink(image, 1 << top), top)
+
+        best = None
+        for y, x in self.candidates(scores, top):
+            score = float(scores[y, x])
+            # 逐层细化
+            for level in range(top - 1, -1, -1):
+                x, y, score = self.refine(image, level, x * 2, y * 2)
+            if best is None or score > best[2]:
+                best = (x, y, score)
+
+        if best is None or best[2] < self.threshold:
+            return None
+        return int(best[0]), int(best[1]), best[2]
+
+    def score_map(self, image, level):
+        """用 FFT 计算所有位置的归一化互相关"""
+        template, norm = self.pyramid[level]
+        height, width = template.shape
+        out_height = image.shape[0] - height + 1
+        out_width = image.shape[1] - width + 1
+
+        # 搜索区域尺寸固定时，模板的频谱只计算一次
+        shape = image.shape
+        key = (level, shape)
+        template_spectrum = self.spectra.get(key)
+        if template_spectrum is None:
+            template_spectrum = np.conj(np.fft.rfft2(template, shape))
+            self.spectra[key] = template_spectrum
+        spectrum = np.fft.rfft2(image) * template_spectrum
+        correlation = np.fft.irfft2(spectrum, shape)[:out_height, :out_width]
+        return normalized_scores(correlation, image, height, width, norm)
+
+    def candidates(self, scores, level):
+        """最粗一层得分最高的几个位置（相邻位置只保留一个）"""
+        if self.levels == 1:
+            return [np.unravel_index(int(np.argmax(scores)), scores.shape)]
+        template, _ = self.pyramid[level]
+        radius_y = max(1, template.shape[0] // 2)
+        radius_x = max(1, template.shape[1] // 2)
+        scores = scores.copy()
+        found = []
+        for _ in range(COARSE_CANDIDATES):
+            y, x = np.unravel_index(int(np.argmax(scores)), scores.shape)
+            found.append((int(y), int(x)))
+            scores[max(0, y - radius_y):y + radius_y + 1, max(0, x - radius_x):x + radius_x + 1] = -np.inf
+        return found
+
+    def refine(self, image, level, x, y):
+        """在第 level 层的 (x, y) 附近重新计算归一化互相关，返回最佳位置和得分"""
+        template, norm = self.pyramid[level]
+        height, width = template.shape
+        factor = 1 << level
+        max_x = image.shape[1] // factor - width
+        max_y = image.shape[0] // factor - height
+        x0, x1 = max(0, min(x, max_x) - REFINE_RADIUS), min(max_x, x + REFINE_RADIUS)
+        y0, y1 = max(0, min(y, max_y) - REFINE_RADIUS), min(max_y, y + REFINE_RADIUS)
+
+        # 只截取并缩小候选位置附近的一小块
+        crop = shrink(
+            image[y0 * factor:(y1 + height) * factor, x0 * factor:(x1 + width) * factor],
+            factor
+        )
+        windows = np.lib.stride_tricks.sliding_window_view(crop, (height, width))
+        correlation = np.einsum('ijkl,kl->ij', windows, template)
+        scores = normalized_scores(correlation, crop, height, width, norm)
+
+        dy, dx = np.unravel_index(int(np.argmax(scores)), scores.shape)
+        return x0 + int(dx), y0 + int(dy), float(scores[dy, dx])
+
+
+class TargetLocator:
+    """模板区域定位
+
+    运行参数中设置了模板图像的区域，其坐标为搜索范围。每轮循环开始前截取各搜索范围
+    并查找模板，返回本轮每个区域的坐标偏移：普通区域为 (0, 0)，找到模板的区域为
+    模板左上角的屏幕坐标，未找到时为 None（本轮跳过该区域）。
+    """
+
+    def __init__(self, plan, capture):
+        self.regions = [tuple(region) for region in plan.areas.tolist()]
+        self.matchers = []
+        for region, path in zip(self.regions, plan.templates):
+            if path is None:
+                self.matchers.append(None)
+                continue
+            matcher = TemplateMatcher.from_file(path, plan.template_threshold)
+            x1, y1, x2, y2 = region
+            if matcher.width > x2 - x1 + 1 or matcher.height > y2 - y1 + 1:
+                raise ValueError(f"模板图像大于搜索区域: {path}")
+            if (x2 - x1 + 1) * (y2 - y1 + 1) > MAX_SEARCH_PIXELS:
+                print(
+                    f"警告: 模板 {path} 的搜索范围 {x2 - x1 + 1}×{y2 - y1 + 1} 超过建议的 "
+                    f"{MAX_SEARCH_PIXELS} 像素（约 800×600），每轮定位会明显变慢，建议缩小搜索范围"
+                )
+            self.matchers.append(matcher)
+        self.capture = capture
+
+    def schedule_areas(self):
+        """点击计划使用的区域：模板区域为以模板左上角为原点的模板范围"""
+        areas = []
+        for region, matcher in zip(self.regions, self.matchers):
+            if matcher is None:
+                areas.append(region)
+            else:
+                areas.append((0, 0, matcher.width - 1, matcher.height - 1))
+        return areas
+
+    def locate(self):
+        """查找所有模板，返回每个区域本轮的坐标偏移"""
+        # 截取一帧，所有模板区域共用
+        self.capture.tick()
+        offsets = []
+        for region, matcher in zip(self.regions, self.matchers):
+            if matcher is None:
+                offsets.append((0, 0))
+                continue
+            # 部分超出屏幕的搜索范围只在屏幕内的部分中查找
+            left, top, _, _ = self.capture.clip(region)
+            found = matcher.locate(self.capture.grab(region))
+            if found is None:
+                offsets.append(None)
+            else:
+                offsets.append((left + found[0], top + found[1]))
+        return offsets
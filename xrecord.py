@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+XRecord 设备事件监听
+用 X11 XRecord 扩展在服务器端截获所有客户端的设备事件（只旁听，不拦截，其他程序照常收到），
+在后台线程中接收并逐个回调。全局快捷键（按键）和宏录制（鼠标点击）共用这里的
+连接、监听上下文、解析和停止流程
+"""
+
+import threading
+import time
+
+
+class XRecordListener:
+    """XRecord 设备事件监听器（仅 Linux）
+
+    截获类型在 first_type 到 last_type 之间的设备事件（Xlib.X 中的事件名称，如 "KeyPress"），
+    每个事件在监听线程中调用 on_event(event, now)，now 为这批数据到达时的 time.monotonic_ns()。
+    回调应尽快返回。feature 为使用者的名称，用于缺少 python-xlib 时的错误信息。
+    """
+
+    def __init__(self, first_type, last_type, on_event, display_name=None, feature="XRecord 监听"):
+        try:
+            from Xlib import X, display
+            from Xlib.ext import record
+            from Xlib.protocol import rq
+        except ImportError:
+            raise RuntimeError(f"{feature}需要 Linux X11 环境并安装 python-xlib")
+
+        self.X = X
+        self._record = record
+        self._event_field = rq.EventField(None)
+        self.on_event = on_event
+        try:
+            # 监听连接会一直阻塞在接收数据上，停止监听需要另一个连接
+            self.record_display = display.Display(display_name)
+            self.control_display = display.Display(display_name)
+        except Exception as e:
+            raise RuntimeError(f"无法连接X11显示: {e}")
+        if not self.record_display.has_extension("RECORD"):
+            self.record_display.close()
+            self.control_display.close()
+            raise RuntimeError("X服务器不支持XRecord扩展")
+
+        self.context = self.control_display.record_create_context(
+            0,
+            [record.AllClients],
+            [{
+                "core_requests": (0, 0),
+                "core_replies": (0, 0),
+                "ext_requests": (0, 0, 0, 0),
+                "ext_replies": (0, 0, 0, 0),
+                "delivered_events": (0, 0),
+                "device_events": (getattr(X, first_type), getattr(X, last_type)),
+                "errors": (0, 0),
+                "client_started": False,
+                "client_died": False,
+            }],
+        )
+        self.thread = None
+        self.error = None  # 监听线程中发生的错误
+
+    def start(self):
+        """在后台线程中开始监听"""
+        self.thread = threading.Thread(target=self.listen_loop, daemon=True)
+        self.thread.start()
+
+    def listen_loop(self):
+        """接收 XRecord 数据，直到 stop() 停用监听上下文"""
+        try:
+            self.record_display.record_enable_context(self.context, self.on_record)
+        except Exception as e:
+            self.error = e
+
+    def on_record(self, reply):
+        """XRecord 回调：逐个解析本批数据中的设备事件"""
+        now = time.monotonic_ns()
+        if reply.category != self._record.FromServer or reply.client_swapped:
+            return
+        data = reply.data
+        while data:
+            event, data = self._event_field.parse_binary_value(data, self.record_display.display, None, None)
+            self.on_event(event, now)
+
+    def stop(self):
+        """停止监听：停用上下文，等待监听线程退出，然后释放上下文并关闭连接"""
+        self.control_display.record_disable_context(self.context)
+        self.control_display.flush()
+        if self.thread is not None:
+            self.thread.join()
+        self.close()
+
+    def close(self):
+        """释放监听上下文并关闭连接（没有开始监听，或监听已停止时调用）"""
+        self.control_display.record_free_context(self.context)
+        self.control_display.close()
+        self.record_display.close()